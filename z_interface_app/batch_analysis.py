@@ -19,6 +19,9 @@ from flask import (
     url_for,
 )
 
+from routes import event_stream_response
+from utils import get_progress_broker
+
 # --- Enums ---
 class AnalysisType(str, enum.Enum):
     FRONTEND_SECURITY = "frontend_security"
@@ -173,6 +176,25 @@ class BatchJobService:
 
     def _generate_id(self): return str(uuid.uuid4())
 
+    def _progress_data(self, job: BatchJob, task: Optional[AnalysisTask] = None) -> Tuple[Dict[str, Any], bool]:
+        # Called with DATA_LOCK held, so build the snapshot directly rather than via get_status_data_for_job_view
+        percent = int(job.completed_tasks / job.total_tasks * 100) if job.total_tasks else 100
+        data = {"job": job.to_dict(), "percent": percent}
+        if task: data["task"] = {"id": task.id, "model": task.model, "app_num": task.app_num,
+                                 "analysis_type": str(task.analysis_type), "status": str(task.status)}
+        return data, job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED, JobStatus.ERROR]
+
+    def _publish_progress(self, job: BatchJob, task: Optional[AnalysisTask] = None):
+        try:
+            data, final = self._progress_data(job, task)
+            get_progress_broker().publish(f"batch/{job.id}", "progress", data, final=final)
+        except Exception as e: self.logger.debug(f"Could not publish progress for job {job.id}: {e}")
+
+    def progress_snapshot(self, job_id: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        with DATA_LOCK:
+            job = BATCH_JOBS.get(job_id)
+            return self._progress_data(job) if job else None
+
     def _parse_app_range(self, range_str: str, max_apps: int = 3) -> List[int]: # Reduced max_apps for faster sync test
         if not range_str: return list(range(1, max_apps + 1))
         apps = set(); parts = range_str.split(',')
@@ -222,13 +244,25 @@ class BatchJobService:
             self.logger.info(f"Created BatchJob '{job.name}' (ID: {job.id}) with {job.total_tasks} tasks. Status: {job.status}")
 
         if job.status == JobStatus.QUEUED:
-            self.logger.info(f"Starting synchronous processing for Job ID: {job_id}")
-            self._execute_job_synchronously(job_id) # Process synchronously
-            self.logger.info(f"Synchronous processing finished for Job ID: {job_id}. Final Status: {job.status}")
+            app = current_app._get_current_object()
+            threading.Thread(target=self._run_job, args=(app, job_id), name=f"batch-{job_id}", daemon=True).start()
+            self.logger.info(f"Started background processing for Job ID: {job_id}")
         return job
 
+    def _run_job(self, app, job_id: str):
+        with app.app_context():
+            try:
+                self._execute_job(job_id)
+                self.logger.info(f"Processing finished for Job ID: {job_id}")
+            except Exception as e:
+                self.logger.error(f"Job {job_id} aborted: {e}", exc_info=True)
+                with DATA_LOCK: self._update_job_status(job_id, JobStatus.ERROR, errors=[{"error": str(e)}])
+
     def get_job(self, job_id: str) -> Optional[BatchJob]:
         with DATA_LOCK: return BATCH_JOBS.get(job_id)
+    def peek_job(self, job_id: str) -> Optional[BatchJob]:
+        # Lock-free lookup (dict.get is atomic) for callers that must not wait on a running job
+        return BATCH_JOBS.get(job_id)
     def get_all_jobs(self) -> List[BatchJob]:
         with DATA_LOCK: return sorted(BATCH_JOBS.values(), key=lambda j: j.created_at, reverse=True)
     def get_job_tasks(self, job_id: str) -> List[AnalysisTask]:
@@ -249,6 +283,7 @@ class BatchJobService:
             if errors: job.errors.extend(errors)
             if old_status != status: 
                 self.logger.info(f"Job {job_id} status updated from {old_status} to {status}")
+            self._publish_progress(job)
         else:
             self.logger.warning(f"Attempt to update status for non-existent job {job_id}")
 
@@ -293,12 +328,14 @@ class BatchJobService:
             else:
                 self.logger.warning(f"Job {task.job_id} for task {task.id} not found during task completion update.")
         # Removed else: self.logger.warning(f"Task {task_id} not found in ANALYSIS_TASKS during status update.") as it's redundant with the check at the beginning of the function.
+        job_for_task = BATCH_JOBS.get(task.job_id)
+        if job_for_task: self._publish_progress(job_for_task, task)
 
 
     def _simulate_analysis(self, task: AnalysisTask):
         self.logger.info(f"SYNC Simulating {task.analysis_type} for {task.model}/app{task.app_num} (Task ID: {task.id})")
         start_time = datetime.datetime.utcnow()
-        self._update_task_status(task.id, TaskStatus.RUNNING, scan_start_time=start_time)
+        with DATA_LOCK: self._update_task_status(task.id, TaskStatus.RUNNING, scan_start_time=start_time)
 
         simulated_duration = random.randint(1, 2) 
         time.sleep(simulated_duration)
@@ -317,15 +354,16 @@ class BatchJobService:
                 med = random.randint(0, (issues_count - high) // 2 if (issues_count - high) > 0 else 0); low = issues_count - high - med
                 details["summary"] = {"total_issues": issues_count, "high": high, "medium": med, "low": low}
                 if high > 0: details["issues"] = [{"severity": "HIGH", "issue_type": "SimVuln", "issue_text": "Critical sim vuln."}]
-        self._update_task_status(task.id, outcome, scan_end_time=end_time, duration_seconds=duration,
-                                 details=details, error=error_obj, issues_count=issues_count,
-                                 high_severity=high, medium_severity=med, low_severity=low)
+        with DATA_LOCK:
+            self._update_task_status(task.id, outcome, scan_end_time=end_time, duration_seconds=duration,
+                                     details=details, error=error_obj, issues_count=issues_count,
+                                     high_severity=high, medium_severity=med, low_severity=low)
         self.logger.info(f"SYNC Finished {task.analysis_type} for {task.model}/app{task.app_num}. Status: {outcome}, Duration: {duration}s")
 
-    def _execute_job_synchronously(self, job_id: str):
+    def _execute_job(self, job_id: str):
         job = self.get_job(job_id) 
         if not job:
-            self.logger.error(f"SYNC: Job {job_id} not found for synchronous execution.")
+            self.logger.error(f"SYNC: Job {job_id} not found for execution.")
             return
         
         self.logger.info(f"SYNC: Starting execution for Job {job_id} ({job.name}). Status: {job.status}")
@@ -343,30 +381,33 @@ class BatchJobService:
         with DATA_LOCK:
             self._update_job_status(job.id, JobStatus.RUNNING)
             self.logger.info(f"SYNC: Job {job_id} Running.")
-
             if not job.tasks:
                 self.logger.warning(f"SYNC: Job {job_id} has no tasks.")
-            else:
-                for task_obj_snapshot in list(job.tasks): 
-                    task_id_to_process = task_obj_snapshot.id
-                    current_task_version = ANALYSIS_TASKS.get(task_id_to_process) 
-
-                    if not current_task_version:
-                        self.logger.warning(f"SYNC: Task {task_id_to_process} not found in global registry for job {job_id}. Skipping.")
-                        job.completed_tasks +=1 
-                        continue
-                    
-                    if current_task_version.status == TaskStatus.PENDING:
-                        current_job_state = BATCH_JOBS.get(job_id) 
-                        if current_job_state and current_job_state.status == JobStatus.CANCELLING:
-                            self.logger.info(f"SYNC: Job {job_id} CANCELLING. Cancelling task {current_task_version.id}.")
-                            self._update_task_status(current_task_version.id, TaskStatus.CANCELLED, details={"skip_reason": "Job was cancelled."})
-                            continue
-                        self._simulate_analysis(current_task_version)
-                    else:
-                        self.logger.info(f"SYNC: Skipping task {current_task_version.id} as status is {current_task_version.status}")
-            
-            if job.completed_tasks >= job.total_tasks and job.status == JobStatus.RUNNING:
+
+        # DATA_LOCK is taken per state change only, so status, event and cancel requests are served while tasks run
+        for task_obj_snapshot in list(job.tasks): 
+            task_id_to_process = task_obj_snapshot.id
+            with DATA_LOCK:
+                current_task_version = ANALYSIS_TASKS.get(task_id_to_process) 
+
+                if not current_task_version:
+                    self.logger.warning(f"SYNC: Task {task_id_to_process} not found in global registry for job {job_id}. Skipping.")
+                    job.completed_tasks +=1 
+                    continue
+                
+                if current_task_version.status != TaskStatus.PENDING:
+                    self.logger.info(f"SYNC: Skipping task {current_task_version.id} as status is {current_task_version.status}")
+                    continue
+                current_job_state = BATCH_JOBS.get(job_id) 
+                if current_job_state and current_job_state.status == JobStatus.CANCELLING:
+                    self.logger.info(f"SYNC: Job {job_id} CANCELLING. Cancelling task {current_task_version.id}.")
+                    self._update_task_status(current_task_version.id, TaskStatus.CANCELLED, details={"skip_reason": "Job was cancelled."})
+                    continue
+            self._simulate_analysis(current_task_version)
+
+        with DATA_LOCK:
+            # A job cancelled mid-task stays CANCELLING until its running task ends, so finalize it here too
+            if job.completed_tasks >= job.total_tasks and job.status in [JobStatus.RUNNING, JobStatus.CANCELLING]:
                 job_failed = any(ANALYSIS_TASKS[t.id].status in [TaskStatus.FAILED, TaskStatus.TIMED_OUT] for t in job.tasks if t.id in ANALYSIS_TASKS) or bool(job.errors)
                 job_was_cancelled = any(ANALYSIS_TASKS[t.id].status == TaskStatus.CANCELLED for t in job.tasks if t.id in ANALYSIS_TASKS)
                 final_status = JobStatus.COMPLETED
@@ -377,7 +418,7 @@ class BatchJobService:
 
     def cancel_job(self, job_id: str) -> bool:
         with DATA_LOCK:
-            job = self.get_job(job_id)
+            job = BATCH_JOBS.get(job_id)
             if not job: return False
             if job.status not in [JobStatus.PENDING, JobStatus.QUEUED, JobStatus.INITIALIZING, JobStatus.RUNNING]: return False
             self._update_job_status(job_id, JobStatus.CANCELLING)
@@ -407,7 +448,7 @@ class BatchJobService:
 
     def archive_job(self, job_id: str) -> bool: 
         with DATA_LOCK:
-            job = self.get_job(job_id)
+            job = BATCH_JOBS.get(job_id)
             if not job: return False
             if job.status not in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED, JobStatus.ERROR]: return False
             self._update_job_status(job_id, JobStatus.ARCHIVED)
@@ -499,7 +540,7 @@ def create_batch_job():
         return redirect(url_for("batch_analysis.batch_dashboard", submitted_data=json.dumps(dict(form_data))))
     try:
         job = service.create_job(form_data) 
-        flash(f"Batch job '{job.name}' processed synchronously. Final status: {job.status}.", "success" if job.status == JobStatus.COMPLETED else "warning")
+        flash(f"Batch job '{job.name}' started with {job.total_tasks} tasks. Status: {job.status}.", "success")
         return redirect(url_for("batch_analysis.view_job", job_id=job.id))
     except Exception as e:
         current_app.logger.error(f"Error creating/processing batch job: {e}", exc_info=True)
@@ -535,6 +576,13 @@ def get_job_status_api(job_id: str):
     status_data = service.get_status_data_for_job_view(job)
     return jsonify({"job": job.to_dict(), **status_data})
 
+@batch_analysis_bp.route("/job/<job_id>/events", methods=["GET"])
+def get_job_events_api(job_id: str):
+    service = _get_batch_service()
+    if not service.peek_job(job_id): return jsonify({"error": "Job not found"}), 404
+    # Finished channels are not replayed, so open with the job's current state
+    return event_stream_response(f"batch/{job_id}", snapshot=lambda: service.progress_snapshot(job_id))
+
 @batch_analysis_bp.route("/job/<job_id>/results", methods=["GET"])
 def get_job_tasks_api(job_id: str): 
     service = _get_batch_service(); job = service.get_job(job_id)
@@ -568,5 +616,5 @@ def init_batch_analysis(app):
     if "batch_service" not in app.extensions:
         # Create the service instance, it will use current_app.logger when methods are called
         app.extensions["batch_service"] = BatchJobService()
-    app.logger.info("Batch Analysis module (SYNC MODE) initialized, blueprint registered, and custom filter added.")
+    app.logger.info("Batch Analysis module initialized, blueprint registered, and custom filter added.")
 
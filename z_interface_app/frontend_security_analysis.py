@@ -10,6 +10,10 @@ from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
 import tempfile
+import hashlib
+import re
+import time
+from bisect import bisect_right
 from typing import List, Optional, Tuple, Dict, Any, Union, Callable, Generator, Set, TypedDict
 import xml.etree.ElementTree as ET
 from contextlib import contextmanager
@@ -77,6 +81,8 @@ SEVERITY_MAP = { #
 SEVERITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2} #
 CONFIDENCE_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2} #
 DEFAULT_ORDER_VALUE = 99 #
+DEPENDENCY_CACHE_TTL = int(os.getenv("FRONTEND_DEPENDENCY_CACHE_TTL", 24 * 3600)) # Advisory DBs update daily #
+LOCKFILE_NAMES = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml") #
 
 
 class ToolStatus(str, Enum): #
@@ -152,6 +158,7 @@ class SecurityIssue: #
     code: str #
     tool: str #
     fix_suggestion: Optional[str] = None #
+    column: Optional[int] = None #
 
     def to_dict(self) -> Dict[str, Any]: #
         """Convert to dictionary representation."""
@@ -162,6 +169,224 @@ class SecurityIssue: #
         return cls(**data) #
 
 
+class DependencyScanCache: #
+    """Disk-backed cache of dependency scan results keyed by lockfile hash and tool version."""
+
+    def __init__(self, cache_dir: Path, ttl: int = DEPENDENCY_CACHE_TTL): #
+        self.cache_dir = cache_dir #
+        self.ttl = ttl #
+        self._lock = Lock() #
+        self._memory: Dict[str, Dict[str, Any]] = {} #
+
+    @staticmethod
+    def hash_lockfile(app_path: Path) -> Optional[str]: #
+        """Return the SHA-256 of the first resolved lockfile found in app_path."""
+        for name in LOCKFILE_NAMES: #
+            lockfile = app_path / name #
+            if lockfile.is_file(): #
+                digest = hashlib.sha256() #
+                digest.update(name.encode("utf-8")) #
+                with open(lockfile, "rb") as f: #
+                    for chunk in iter(lambda: f.read(65536), b""): #
+                        digest.update(chunk) #
+                return digest.hexdigest() #
+        return None #
+
+    @staticmethod
+    def make_key(tool_name: str, tool_version: str, lockfile_hash: str) -> str: #
+        """Build the cache key for a tool run against a given lockfile."""
+        raw = f"{tool_name}|{tool_version}|{lockfile_hash}" #
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest() #
+
+    def _entry_path(self, key: str) -> Path: #
+        return self.cache_dir / f"{key}.json" #
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool: #
+        return (datetime.now().timestamp() - entry.get("created_at", 0)) < self.ttl #
+
+    def get(self, key: str) -> Optional[Tuple[List[SecurityIssue], str, str]]: #
+        """Return (issues, status, output) for a key, or None on a miss or stale entry."""
+        with self._lock: #
+            entry = self._memory.get(key) #
+            if entry is None: #
+                entry_path = self._entry_path(key) #
+                if not entry_path.exists(): #
+                    return None #
+                try:
+                    with open(entry_path, "r", encoding="utf-8") as f: #
+                        entry = json.load(f) #
+                except (OSError, json.JSONDecodeError) as e: #
+                    logger.warning(f"Ignoring unreadable dependency cache entry {entry_path}: {e}") #
+                    return None #
+                self._memory[key] = entry #
+
+            if not self._is_fresh(entry): #
+                self._memory.pop(key, None) #
+                return None #
+
+        issues = [SecurityIssue.from_dict(item) for item in entry.get("issues", [])] #
+        return issues, entry.get("status", ToolStatus.UNKNOWN.value), entry.get("output", "") #
+
+    def put(self, key: str, issues: List[SecurityIssue], status: str, output: str) -> None: #
+        """Store a tool result under key, both in memory and on disk."""
+        entry = { #
+            "issues": [issue.to_dict() for issue in issues], #
+            "status": status, #
+            "output": output, #
+            "created_at": datetime.now().timestamp() #
+        }
+        with self._lock: #
+            self._memory[key] = entry #
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True) #
+                with open(self._entry_path(key), "w", encoding="utf-8") as f: #
+                    json.dump(entry, f) #
+            except OSError as e: #
+                logger.warning(f"Failed to persist dependency cache entry {key}: {e}") #
+
+
+@dataclass(frozen=True)
+class PatternRule: #
+    """A single regex rule for the in-process pattern scanner."""
+    rule_id: str # Must be a valid regex group name #
+    pattern: str #
+    issue_text: str #
+    severity: str #
+    confidence: str #
+    fix_suggestion: str #
+    validator: Optional[Callable[[str], bool]] = None # Return False to discard a match #
+
+
+def _anchor_lacks_noopener(match_text: str) -> bool: #
+    """Accept an <a target="_blank"> match only when rel lacks noopener/noreferrer."""
+    rel = re.search(r"""\brel\s*=\s*[{"'`]([^"'`}]*)""", match_text, re.IGNORECASE) #
+    return not rel or not re.search(r"noopener|noreferrer", rel.group(1), re.IGNORECASE) #
+
+
+_QUOTE = "[\"'`]" # Any JS string delimiter #
+_NOT_QUOTE = "[^\"'`]" #
+
+PATTERN_RULES: Tuple[PatternRule, ...] = ( #
+    PatternRule( #
+        "dangerous_inner_html", r"dangerouslySetInnerHTML\s*=\s*\{", #
+        "Use of dangerouslySetInnerHTML can lead to XSS if the HTML is not sanitized.", #
+        "HIGH", "MEDIUM", "Render text content instead, or sanitize the HTML (e.g. DOMPurify) first." #
+    ),
+    PatternRule( #
+        "eval_call", r"(?<![\w.$])(?:eval|new\s+Function)\s*\(", #
+        "Dynamic code execution via eval()/new Function().", #
+        "HIGH", "HIGH", "Avoid evaluating strings as code; parse data with JSON.parse instead." #
+    ),
+    PatternRule( #
+        "string_timer", r"\bset(?:Timeout|Interval)\s*\(\s*" + _QUOTE, #
+        "setTimeout/setInterval called with a string argument (implicit eval).", #
+        "MEDIUM", "HIGH", "Pass a function instead of a string." #
+    ),
+    PatternRule( #
+        "storage_token", #
+        r"(?i:\b(?:localStorage|sessionStorage)\s*(?:\.\s*setItem\s*\(\s*|\[\s*)" + _QUOTE + _NOT_QUOTE + #
+        r"*(?:token|jwt|auth|session|secret|password)" + _NOT_QUOTE + "*" + _QUOTE + ")", #
+        "Sensitive token stored in Web Storage, which is readable by any injected script.", #
+        "MEDIUM", "MEDIUM", "Keep session tokens in HttpOnly, Secure cookies." #
+    ),
+    PatternRule( #
+        "hardcoded_secret", #
+        r"(?i:\b[\w$]*(?:api[_-]?key|secret|access[_-]?token|auth[_-]?token|client[_-]?secret|password)[\w$]*" + _QUOTE + #
+        r"?\s*[:=]\s*" + _QUOTE + r"[A-Za-z0-9_\-+/=.]{12,}" + _QUOTE + ")" #
+        r"|\bAKIA[0-9A-Z]{16}\b|\bsk_live_[0-9a-zA-Z]{16,}\b|\bAIza[0-9A-Za-z_\-]{35}\b", #
+        "Hardcoded credential or API key in frontend source.", #
+        "HIGH", "MEDIUM", "Move secrets to the backend; frontend bundles are public." #
+    ),
+    PatternRule( #
+        "insecure_http_url", _QUOTE + r"http://(?!www\.w3\.org)[^\s\"'`]+", #
+        "Plain http:// URL; traffic to this endpoint is unencrypted.", #
+        "LOW", "MEDIUM", "Use https:// or a relative URL served from the same origin." #
+    ),
+    PatternRule( #
+        "target_blank_noopener", r"(?i:<a\b[^>]*\btarget\s*=\s*[{]?" + _QUOTE + "_blank" + _QUOTE + r"[}]?[^>]*>)", #
+        "Link opens in a new tab without rel=\"noopener noreferrer\" (reverse tabnabbing).", #
+        "LOW", "HIGH", "Add rel=\"noopener noreferrer\" to links with target=\"_blank\".", #
+        validator=_anchor_lacks_noopener #
+    ),
+)
+
+
+class NativePatternScanner: #
+    """Pure-Python scanner that matches all pattern rules in a single regex pass."""
+
+    DEFAULT_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".vue", ".svelte", ".html") #
+    EXCLUDED_DIRS = {"node_modules", ".git", "dist", "build", "coverage", "vendor", "bower_components"} #
+    MAX_FILE_SIZE = 1024 * 1024 # Skip minified bundles and other large artifacts #
+
+    def __init__(self, rules: Tuple[PatternRule, ...] = PATTERN_RULES): #
+        self.rules = {rule.rule_id: rule for rule in rules} #
+        self._matcher = re.compile("|".join(f"(?P<{rule.rule_id}>{rule.pattern})" for rule in rules)) #
+
+    @staticmethod
+    def _line_starts(text: str) -> List[int]: #
+        """Return the offset at which each line of text starts."""
+        starts = [0] #
+        starts.extend(m.end() for m in re.finditer("\n", text)) #
+        return starts #
+
+    def iter_files(self, root: Path) -> Generator[Path, None, None]: #
+        """Yield scannable frontend files under root, skipping build and vendor directories."""
+        for dirpath, dirs, files in os.walk(root, topdown=True): #
+            dirs[:] = [d for d in dirs if d not in self.EXCLUDED_DIRS] #
+            for file in files: #
+                if file.endswith(self.DEFAULT_EXTENSIONS) and not file.endswith(".min.js"): #
+                    yield Path(dirpath) / file #
+
+    def scan_text(self, text: str, filename: str) -> List[SecurityIssue]: #
+        """Scan source text and return one SecurityIssue per rule match."""
+        issues: List[SecurityIssue] = [] #
+        line_starts: Optional[List[int]] = None # Built lazily; most files have no matches #
+        lines: List[str] = [] #
+
+        for match in self._matcher.finditer(text): #
+            rule = self.rules[match.lastgroup] #
+            matched = match.group(0) #
+            if rule.validator and not rule.validator(matched): #
+                continue #
+
+            if line_starts is None: #
+                line_starts = self._line_starts(text) #
+                lines = text.splitlines() #
+            line_idx = bisect_right(line_starts, match.start()) - 1 #
+            line_number = line_idx + 1 #
+            end_line = bisect_right(line_starts, max(match.end() - 1, match.start())) #
+            code_line = lines[line_idx].strip() if line_idx < len(lines) else matched #
+
+            issues.append(SecurityIssue( #
+                filename=filename, line_number=line_number, #
+                issue_text=rule.issue_text, severity=rule.severity, confidence=rule.confidence, #
+                issue_type=rule.rule_id, line_range=list(range(line_number, end_line + 1)), #
+                code=code_line[:300], tool="pattern-scan", fix_suggestion=rule.fix_suggestion, #
+                column=match.start() - line_starts[line_idx] + 1 #
+            ))
+        return issues #
+
+    def scan_file(self, file_path: Path, relative_to: Optional[Path] = None) -> List[SecurityIssue]: #
+        """Scan a single file; unreadable or oversized files yield no issues."""
+        try:
+            if file_path.stat().st_size > self.MAX_FILE_SIZE: #
+                logger.debug(f"Pattern scan skipping large file: {file_path}") #
+                return [] #
+            text = file_path.read_text(encoding="utf-8", errors="replace") #
+        except OSError as e: #
+            logger.warning(f"Pattern scan could not read {file_path}: {e}") #
+            return [] #
+        display_name = os.path.relpath(file_path, relative_to) if relative_to else str(file_path) #
+        return self.scan_text(text, display_name.replace("\\", "/")) #
+
+    def scan_directory(self, root: Path, relative_to: Optional[Path] = None) -> List[SecurityIssue]: #
+        """Scan every frontend file under root."""
+        issues: List[SecurityIssue] = [] #
+        for file_path in self.iter_files(root): #
+            issues.extend(self.scan_file(file_path, relative_to or root)) #
+        return issues #
+
+
 class FrontendSecurityAnalyzer: #
     """Analyzes frontend code for security issues using various tools."""
 
@@ -172,8 +397,8 @@ class FrontendSecurityAnalyzer: #
         self.results_manager = JsonResultsManager(base_path=self.base_path, module_name="frontend_security") #
         self.analysis_lock = Lock() # Added Lock #
 
-        self.default_tools = ["eslint"] #
-        self.all_tools = ["npm-audit", "eslint", "jshint", "snyk"] #
+        self.default_tools = ["pattern-scan", "eslint"] #
+        self.all_tools = ["pattern-scan", "npm-audit", "eslint", "jshint", "snyk"] #
 
         # Default tool configurations
         self.tool_configs: Dict[str, ToolConfig] = { #
@@ -185,12 +410,19 @@ class FrontendSecurityAnalyzer: #
 
         # Check which tools are available
         self.available_tools = { #
+            "pattern-scan": True, # In-process, no external tooling required #
             "npm-audit": bool(get_executable_path("npm")), #
             "eslint": bool(get_executable_path("npx")), # npx is used to run eslint/jshint #
             "jshint": bool(get_executable_path("npx")), #
             "snyk": bool(get_executable_path("snyk")) #
         }
         logger.info(f"Available tools check: {self.available_tools}") #
+        self.pattern_scanner = NativePatternScanner() #
+
+        # Dependency scans are shared across apps with identical lockfiles
+        self.dependency_cache = DependencyScanCache(self.base_path / "results" / ".dependency_cache") #
+        self._tool_versions: Dict[str, str] = {} #
+        self._tool_versions_lock = Lock() #
 
     @contextmanager
     def _create_temp_config(self, prefix: str, config_content: dict, filename: str) -> Generator[Path, None, None]: #
@@ -709,11 +941,119 @@ class FrontendSecurityAnalyzer: #
 
         return ["snyk", "test"], {"needs_temp_output": True}, None # Signal for temp output file #
 
+    def _get_tool_version(self, tool_name: str) -> str: #
+        """Return the (memoized) version string of a dependency scanner."""
+        with self._tool_versions_lock: #
+            if tool_name in self._tool_versions: #
+                return self._tool_versions[tool_name] #
+
+        base_command = "npm" if tool_name == "npm-audit" else tool_name #
+        version = "unknown" #
+        executable_path = get_executable_path(base_command) #
+        if executable_path: #
+            try:
+                proc = subprocess.run( #
+                    [executable_path, "--version"], capture_output=True, text=True, #
+                    timeout=15, check=False, encoding='utf-8', errors='replace' #
+                )
+                output_lines = (proc.stdout or "").strip().splitlines() #
+                if output_lines: #
+                    version = output_lines[0].strip() #
+            except (subprocess.TimeoutExpired, OSError) as e: #
+                logger.warning(f"Could not determine {tool_name} version: {e}") #
+
+        with self._tool_versions_lock: #
+            self._tool_versions[tool_name] = version #
+        return version #
+
+    def _dependency_cache_key(self, tool_name: str, app_path: Path) -> Optional[str]: #
+        """Build the dependency cache key for app_path, or None if it has no lockfile."""
+        try:
+            lockfile_hash = DependencyScanCache.hash_lockfile(app_path) #
+        except OSError as e: #
+            logger.warning(f"Could not hash lockfile in {app_path}: {e}") #
+            return None #
+        if not lockfile_hash: #
+            return None #
+        return DependencyScanCache.make_key(tool_name, self._get_tool_version(tool_name), lockfile_hash) #
+
+    def _run_with_dependency_cache( #
+        self,
+        tool_name: str, #
+        app_path: Path, #
+        runner: Callable[[Path], Tuple[List[SecurityIssue], Dict[str, str], str]] #
+    ) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
+        """Serve a dependency scan from the lockfile cache, running the tool only on a miss."""
+        cache_key = self._dependency_cache_key(tool_name, app_path) #
+        if cache_key: #
+            cached = self.dependency_cache.get(cache_key) #
+            if cached: #
+                issues, cached_status, cached_output = cached #
+                logger.info(f"[{tool_name}] Using cached results for lockfile in {app_path} ({len(issues)} issues)") #
+                return issues, {tool_name: cached_status}, f"[cached result]\n{cached_output}" #
+
+        issues, status, raw_output = runner(app_path) #
+
+        tool_status = status.get(tool_name, "") #
+        cacheable = tool_status == ToolStatus.SUCCESS.value or ( #
+            tool_status.startswith("⚠️ Found") and "Errors" not in tool_status # Never cache errored or unauthenticated runs #
+        )
+        if cacheable: #
+            cache_key = cache_key or self._dependency_cache_key(tool_name, app_path) # Lockfile may have been generated by setup #
+            if cache_key: #
+                self.dependency_cache.put(cache_key, issues, tool_status, raw_output) #
+        return issues, status, raw_output #
+
     def _run_npm_audit(self, app_path: Path) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
+        return self._run_with_dependency_cache("npm-audit", app_path, self._run_npm_audit_uncached) #
+
+    def _run_npm_audit_uncached(self, app_path: Path) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
         return self._run_tool_with_setup( #
             "npm-audit", app_path, self._setup_npm_audit, self._parse_npm_audit #
         )
 
+    def _run_pattern_scan(self, app_path: Path) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
+        """Run the in-process regex rule set over the app's frontend sources."""
+        tool_name = "pattern-scan" #
+        start = time.perf_counter() #
+        try:
+            issues = self.pattern_scanner.scan_directory(app_path) #
+        except Exception as exc: #
+            logger.exception(f"Error running {tool_name}: {exc}") #
+            return [], {tool_name: f"❌ Failed: {exc}"}, f"{tool_name} failed: {exc}" #
+        elapsed = time.perf_counter() - start #
+        raw_output = f"Scanned {app_path} with {len(self.pattern_scanner.rules)} rules in {elapsed:.3f}s; {len(issues)} matches." #
+        logger.info(f"[{tool_name}] {raw_output}") #
+        return issues, {tool_name: self._determine_tool_status(tool_name, issues, "")}, raw_output #
+
+    def scan_model_patterns(self, model: str) -> Dict[int, List[SecurityIssue]]: #
+        """
+        Run the pattern scanner over every app of a model in one pass.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Dict mapping app number to its sorted issues
+        """
+        results: Dict[int, List[SecurityIssue]] = {} #
+        model_dir = self.base_path.parent / "models" / model #
+        if not model_dir.is_dir(): #
+            model_dir = self.base_path / "models" / model #
+        if not model_dir.is_dir(): #
+            logger.error(f"Model directory not found for pattern scan: {model}") #
+            return results #
+
+        start = time.perf_counter() #
+        for app_dir in sorted(model_dir.glob("app*")): #
+            app_num_str = app_dir.name[3:] #
+            if not app_dir.is_dir() or not app_num_str.isdigit(): #
+                continue #
+            app_path = self._find_application_path(model, int(app_num_str)) or app_dir #
+            results[int(app_num_str)] = self._sort_issues(self.pattern_scanner.scan_directory(app_path)) #
+        logger.info(f"Pattern scan of {len(results)} apps for {model} finished in {time.perf_counter() - start:.3f}s") #
+        return results #
+
     def _run_eslint(self, app_path: Path) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
         tool_name = "eslint" #
         status = {tool_name: ToolStatus.NOT_RUN.value} #
@@ -803,6 +1143,9 @@ class FrontendSecurityAnalyzer: #
         return issues, status, raw_output #
 
     def _run_snyk(self, app_path: Path) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
+        return self._run_with_dependency_cache("snyk", app_path, self._run_snyk_uncached) #
+
+    def _run_snyk_uncached(self, app_path: Path) -> Tuple[List[SecurityIssue], Dict[str, str], str]: #
         tool_name = "snyk" #
         status = {tool_name: ToolStatus.NOT_RUN.value} #
         raw_output = "" #
@@ -937,6 +1280,7 @@ class FrontendSecurityAnalyzer: #
             logger.info(f"Executing tools: {', '.join(runnable_tools)}") #
 
             tool_map = { #
+                "pattern-scan": self._run_pattern_scan, #
                 "npm-audit": self._run_npm_audit, #
                 "eslint": self._run_eslint, #
                 "jshint": self._run_jshint, #
@@ -1,12 +1,17 @@
+import hashlib
 import json
 import os
+import sqlite3
+import threading
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any, Union, Set
+from typing import Callable, List, Dict, Optional, Tuple, Any, Union, Set
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # Import JsonResultsManager from utils.py
 from utils import JsonResultsManager
@@ -64,18 +69,155 @@ class RequirementCheck:
         )
 
 
+LLM_CACHE_FILE_NAME = ".gpt4all_llm_cache.sqlite"
+CHAT_TEMPERATURE = 0.2
+# Batched prompts: requirements per prompt and completion budget
+BATCH_MAX_REQUIREMENTS = 10
+BATCH_TOKENS_PER_REQUIREMENT = 160
+BATCH_MAX_TOKENS = 2048
+# Extra request timeout per batched requirement, on top of GPT4ALL_TIMEOUT
+BATCH_TIMEOUT_PER_REQUIREMENT = 10
+
+
+class LLMResponseCache:
+    """
+    Content-addressed store of chat completion responses in SQLite.
+
+    The key hashes everything that determines the answer (model, sampling
+    settings and the full prompts, which embed the requirement and the
+    summarized code), so identical code in another app, or an unchanged app
+    after unrelated edits, reuses earlier answers. Least recently used entries
+    are evicted once the stored responses exceed max_bytes.
+    """
+    def __init__(self, db_path: Union[str, Path], max_bytes: int = 64 * 1024 * 1024):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_responses_access ON llm_responses (last_access);
+            ''')
+            self.conn.commit()
+        return self.conn
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> str:
+        material = json.dumps([model, temperature, max_tokens, system_prompt, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT content FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                self.hits += 1
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+
+    def put(self, key: str, model: str, content: str) -> None:
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, model, content, size, created, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, content, size, now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache store failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used responses until the cache is back under 90% of max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM llm_responses ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} cached LLM responses ({total} bytes kept)")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
 class GPT4AllClient:
-    def __init__(self, api_url: str = None, preferred_model: str = None):
+    def __init__(self, api_url: str = None, preferred_model: str = None, cache_path: Union[str, Path] = None):
         self.api_url = api_url or os.getenv("GPT4ALL_API_URL", "http://localhost:4891/v1")
         self.preferred_model = preferred_model
         self.available_models = []
         self.timeout = int(os.getenv("GPT4ALL_TIMEOUT", "30"))
+        # Requests in flight at once; 2 keeps a single-slot local server busy
+        # (one generating, one queued) without piling up timeouts
+        self.max_concurrency = max(1, int(os.getenv("GPT4ALL_MAX_CONCURRENCY", "2")))
         self.last_check_time = 0
         self.is_available = False
         self.logger = logger  # Use the module-level logger
-        logger.info(f"GPT4All client initialized with URL: {self.api_url}")
+
+        # Keep-alive connections shared by all requests, one per in-flight slot
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._inflight = threading.BoundedSemaphore(self.max_concurrency)
+        self._server_lock = threading.Lock()
+
+        # Persistent response cache; GPT4ALL_CACHE_MAX_MB=0 disables it
+        cache_path = os.getenv("GPT4ALL_CACHE_PATH") or cache_path
+        cache_max_mb = float(os.getenv("GPT4ALL_CACHE_MAX_MB", "64"))
+        self.cache = LLMResponseCache(cache_path, int(cache_max_mb * 1024 * 1024)) if cache_path and cache_max_mb > 0 else None
+        logger.info(f"GPT4All client initialized with URL: {self.api_url} (max {self.max_concurrency} concurrent requests)")
 
     def check_server(self) -> bool:
+        # Concurrent checks share one probe instead of each hitting /models
+        with self._server_lock:
+            return self._check_server()
+
+    def _check_server(self) -> bool:
         current_time = time.time()
         if current_time - self.last_check_time < 15 and self.is_available:
             return self.is_available
@@ -84,7 +226,7 @@ class GPT4AllClient:
 
         try:
             logger.debug(f"Checking GPT4All server at: {self.api_url}/models")
-            response = requests.get(f"{self.api_url}/models", timeout=5)
+            response = self.session.get(f"{self.api_url}/models", timeout=5)
 
             if response.status_code == 200:
                 models_data = response.json()
@@ -451,12 +593,8 @@ class GPT4AllClient:
             result["confidence"] = "MEDIUM"
         return result
 
-    def analyze_code(self, requirement: str, code: str, is_frontend: bool = True, model: str = None) -> Dict[str, Any]:
-        if not self.check_server():
-            logger.error("GPT4All server is not available")
-            return {"met": False, "confidence": "LOW", "explanation": "GPT4All server is not available"}
-
-        model_to_use = self._extract_model_id(model) if model else self.get_best_model()
+    def analyze_code(self, requirement: str, code: str, is_frontend: bool = True, model: str = None,
+                     use_cache: bool = True) -> Dict[str, Any]:
         code_max_length = 8000
         if len(code) > code_max_length:
             original_len = len(code)
@@ -489,6 +627,120 @@ Respond with JSON containing:
 - "confidence": Your confidence level (HIGH/MEDIUM/LOW)
 - "explanation": Specific evidence from the code
 """
+        # Cached answers need no server round trip, not even the availability probe
+        content = self._cached_completion(system_prompt, user_prompt, model) if use_cache else None
+        if content is None:
+            if not self.check_server():
+                logger.error("GPT4All server is not available")
+                return {"met": False, "confidence": "LOW", "explanation": "GPT4All server is not available"}
+            model_to_use = self._extract_model_id(model) if model else self.get_best_model()
+            content = self._chat_completion(
+                system_prompt, user_prompt, model_to_use,
+                validate=lambda text: self._normalize_verdict(self._parse_verdict_json(text)) is not None
+            )
+        if content is None:
+            return self._fallback_analyze_code(requirement, code, is_frontend)
+        try:
+            result = json.loads(content)
+            logger.info(f"Analysis result: requirement met = {result.get('met', False)}")
+            return result
+        except json.JSONDecodeError:
+            return self._extract_json_from_text(content)
+
+    def analyze_requirements_batch(self, requirements: List[str], code: str, is_frontend: bool = True,
+                                   model: str = None, use_cache: bool = True) -> List[Optional[Dict[str, Any]]]:
+        """
+        Check several requirements against one code side in a single prompt, so the
+        model processes the code once instead of once per requirement.
+        
+        Args:
+            requirements: Requirements to check
+            code: Frontend or backend code
+            is_frontend: Whether the code is frontend code
+            model: Optional model override
+            use_cache: Whether a cached answer may be used (fresh answers are always stored)
+            
+        Returns:
+            One verdict per requirement, in order; None where the response could not
+            be mapped to the requirement (callers re-check those individually)
+        """
+        if not requirements:
+            return []
+        code_max_length = 8000
+        if len(code) > code_max_length:
+            code = self.summarize_code(code, code_max_length, is_frontend)
+
+        system_prompt = """
+You are an expert code reviewer focused on determining if code meets specific requirements.
+You will receive several numbered requirements and one piece of code.
+For EACH requirement, decide whether the code satisfies it, based on concrete evidence in the code.
+Some code may be summarized or simplified - look for key patterns and functionality.
+Respond with only a JSON array holding one object per requirement, in the same order:
+[
+  {"index": 1, "met": true/false, "confidence": "HIGH"/"MEDIUM"/"LOW", "explanation": "Brief explanation with specific code evidence"}
+]
+"""
+        code_type = "Frontend" if is_frontend else "Backend"
+        numbered = "\n".join(f"{i}. {req}" for i, req in enumerate(requirements, 1))
+        user_prompt = f"""
+Requirements:
+{numbered}
+Code Type: {code_type}
+Analyze if the following code meets each requirement:
+```
+{code}
+```
+Respond with a JSON array of {len(requirements)} objects with "index", "met", "confidence" and "explanation".
+"""
+        max_tokens = min(BATCH_MAX_TOKENS, 256 + BATCH_TOKENS_PER_REQUIREMENT * len(requirements))
+        content = self._cached_completion(system_prompt, user_prompt, model, max_tokens) if use_cache else None
+        if content is None:
+            if not self.check_server():
+                logger.error("GPT4All server is not available")
+                return [None] * len(requirements)
+            model_to_use = self._extract_model_id(model) if model else self.get_best_model()
+            timeout = self.timeout + BATCH_TIMEOUT_PER_REQUIREMENT * len(requirements)
+            content = self._chat_completion(
+                system_prompt, user_prompt, model_to_use, max_tokens=max_tokens, timeout=timeout,
+                validate=lambda text: any(verdict is not None for verdict in self._parse_batch_verdicts(text, requirements))
+            )
+        if content is None:
+            return [None] * len(requirements)
+        verdicts = self._parse_batch_verdicts(content, requirements)
+        parsed = sum(1 for verdict in verdicts if verdict is not None)
+        logger.info(f"Batch analysis parsed {parsed}/{len(requirements)} {code_type.lower()} verdicts")
+        return verdicts
+
+    def _cached_completion(self, system_prompt: str, user_prompt: str, model: Optional[str] = None,
+                           max_tokens: int = 1024) -> Optional[str]:
+        """
+        Cached answer for a prompt, looked up without probing the server. The model is
+        the one a request would use as far as it is known without the server's model list.
+        """
+        if not self.cache:
+            return None
+        if model:
+            model_to_use = self._extract_model_id(model)
+        elif self.available_models:
+            model_to_use = self.get_best_model()
+        else:
+            model_to_use = (self._extract_model_id(self.preferred_model) if self.preferred_model else "") or "Llama 3 8B Instruct"
+        cached = self.cache.get(LLMResponseCache.make_key(model_to_use, system_prompt, user_prompt, CHAT_TEMPERATURE, max_tokens))
+        if cached is not None:
+            logger.info(f"Using cached analysis response for model: {model_to_use}")
+        return cached
+
+    def _chat_completion(self, system_prompt: str, user_prompt: str, model_to_use: str,
+                         max_tokens: int = 1024, timeout: Optional[float] = None,
+                         validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Send a chat completion, retrying once with an alternate model; None if every attempt failed.
+        Answers are stored in the response cache, keyed by the model that answered, when validate
+        (if given) accepts them; callers look the cache up first through _cached_completion.
+        timeout defaults to GPT4ALL_TIMEOUT; longer completions should pass a larger one.
+        """
+        temperature = CHAT_TEMPERATURE
+
         available_models = self.available_models.copy() if self.available_models else [model_to_use]
         if model_to_use in available_models:
             available_models.remove(model_to_use)
@@ -501,46 +753,142 @@ Respond with JSON containing:
                 if not current_model or not isinstance(current_model, str):
                     logger.warning(f"Invalid model: {current_model}, using fallback")
                     current_model = "Llama 3 8B Instruct"
-                payload = {"model": current_model, "messages": [{"role": "system", "content": system_prompt},{"role": "user", "content": user_prompt}],"temperature": 0.2,"max_tokens": 1024}
+                payload = {"model": current_model, "messages": [{"role": "system", "content": system_prompt},{"role": "user", "content": user_prompt}],"temperature": temperature,"max_tokens": max_tokens}
                 logger.info(f"Sending analysis request to GPT4All API using model: {current_model}")
-                response = requests.post(f"{self.api_url}/chat/completions", json=payload, timeout=self.timeout)
+                with self._inflight:
+                    response = self.session.post(f"{self.api_url}/chat/completions", json=payload, timeout=timeout or self.timeout)
                 if response.status_code == 200:
                     data = response.json()
                     content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    try:
-                        result = json.loads(content)
-                        logger.info(f"Analysis result: requirement met = {result.get('met', False)}")
-                        return result
-                    except json.JSONDecodeError:
-                        return self._extract_json_from_text(content)
-                else:
-                    logger.error(f"GPT4All API request failed: {response.status_code}")
-                    logger.error(f"Response: {response.text[:500]}")
-                    if attempt < max_attempts - 1:
-                        logger.info(f"Retrying with alternate model: {available_models[attempt+1]}")
-                        continue
-                    return self._fallback_analyze_code(requirement, code, is_frontend)
+                    if validate is not None and content and not validate(content):
+                        logger.info("Not caching a response that did not parse into verdicts")
+                    elif self.cache and content:
+                        key = LLMResponseCache.make_key(current_model, system_prompt, user_prompt, temperature, max_tokens)
+                        self.cache.put(key, current_model, content)
+                    return content
+                logger.error(f"GPT4All API request failed: {response.status_code}")
+                logger.error(f"Response: {response.text[:500]}")
+                if attempt < max_attempts - 1:
+                    logger.info(f"Retrying with alternate model: {available_models[attempt+1]}")
             except Exception as e:
                 logger.exception(f"Error analyzing code: {str(e)}")
                 if attempt < max_attempts - 1:
                     logger.info(f"Retrying with alternate model due to exception: {available_models[attempt+1]}")
-                    continue
-                return self._fallback_analyze_code(requirement, code, is_frontend)
-        return self._fallback_analyze_code(requirement, code, is_frontend)
+        return None
+
+    @staticmethod
+    def _normalize_verdict(item: Any) -> Optional[Dict[str, Any]]:
+        """A verdict object with a usable "met" flag, or None."""
+        if not isinstance(item, dict):
+            return None
+        met = item.get("met")
+        if isinstance(met, str) and met.strip().lower() in ("true", "yes", "false", "no"):
+            met = met.strip().lower() in ("true", "yes")
+        if not isinstance(met, bool):
+            return None
+        confidence = str(item.get("confidence", "LOW")).upper()
+        return {
+            "met": met,
+            "confidence": confidence if confidence in ("HIGH", "MEDIUM", "LOW") else "LOW",
+            "explanation": str(item.get("explanation", ""))
+        }
+
+    def _parse_batch_verdicts(self, text: str, requirements: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Map a batched response back to its requirements. Objects are matched by
+        "index", then by requirement text, then by position; anything that cannot
+        be matched stays None.
+        """
+        items: List[Any] = []
+        decoder = json.JSONDecoder()
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError:
+            parsed = None
+            array_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', text, re.DOTALL) or re.search(r'(\[.*\])', text, re.DOTALL)
+            if array_match:
+                try:
+                    parsed = json.loads(array_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+        if isinstance(parsed, dict):
+            # {"results": [...]} or a single object
+            parsed = next((v for v in parsed.values() if isinstance(v, list)), [parsed])
+        if isinstance(parsed, list):
+            items = parsed
+        else:
+            # Truncated or malformed array: salvage every complete object in it
+            position = text.find("{")
+            while position != -1:
+                try:
+                    item, end = decoder.raw_decode(text, position)
+                    items.append(item)
+                    position = text.find("{", end)
+                except json.JSONDecodeError:
+                    position = text.find("{", position + 1)
+
+        def item_index(item: Dict[str, Any]) -> Optional[int]:
+            index = item.get("index", item.get("id"))
+            if isinstance(index, str) and index.strip().isdigit():
+                index = int(index)
+            return index if isinstance(index, int) and not isinstance(index, bool) else None
+
+        verdicts: List[Optional[Dict[str, Any]]] = [None] * len(requirements)
+        lookup = {req.strip().lower(): i for i, req in enumerate(requirements)}
+        # Prompts number from 1, but some models answer with 0-based indices. Indices are
+        # only trusted when they all fit one numbering; otherwise fall back to text/position.
+        indices = [item_index(item) for item in items if isinstance(item, dict)]
+        indices = [index for index in indices if index is not None]
+        if all(1 <= index <= len(requirements) for index in indices):
+            base = 1
+        elif all(0 <= index < len(requirements) for index in indices):
+            base = 0
+        else:
+            logger.warning(f"Ignoring inconsistent batch indices {sorted(set(indices))} for {len(requirements)} requirements")
+            base = None
+        unplaced = []
+        for item in items:
+            verdict = self._normalize_verdict(item)
+            if verdict is None:
+                continue
+            slot = None
+            index = item_index(item)
+            if base is not None and index is not None and verdicts[index - base] is None:
+                slot = index - base
+            elif isinstance(item.get("requirement"), str):
+                slot = lookup.get(item["requirement"].strip().lower())
+            if slot is None or verdicts[slot] is not None:
+                unplaced.append(verdict)
+            else:
+                verdicts[slot] = verdict
+        # Unlabelled objects only count when they line up one-to-one with the gaps
+        gaps = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        if unplaced and len(unplaced) == len(gaps):
+            for i, verdict in zip(gaps, unplaced):
+                verdicts[i] = verdict
+        return verdicts
+
+    @staticmethod
+    def _parse_verdict_json(text: str) -> Optional[Dict[str, Any]]:
+        """The JSON object of a single-requirement answer, or None if it holds none."""
+        try:
+            parsed = json.loads(text)
+            return parsed if isinstance(parsed, dict) else None
+        except json.JSONDecodeError:
+            pass
+        for pattern in (r'```(?:json)?\s*({.*?})\s*```', r'({.*?})'):
+            json_match = re.search(pattern, text, re.DOTALL)
+            if json_match:
+                try:
+                    return json.loads(json_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+        return None
 
     def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
-        json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                pass
-        json_match = re.search(r'({.*?})', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                pass
+        parsed = self._parse_verdict_json(text)
+        if parsed is not None:
+            return parsed
         result = {"met": "meets the requirement" in text.lower() or "requirement is met" in text.lower(), "confidence": "LOW", "explanation": text[:200] + ("..." if len(text) > 200 else "")}
         return result
 
@@ -548,18 +896,21 @@ Respond with JSON containing:
 class GPT4AllAnalyzer:
     def __init__(self, base_path: Union[Path, str] = None):
         self.base_path = Path(base_path) if base_path else Path.cwd()
-        self.client = GPT4AllClient()
         
         if "z_interface_app" in str(self.base_path):
             self.base_path = self.base_path.parent
         else:
             self.base_path = self.base_path
+        self.client = GPT4AllClient(cache_path=self.base_path / "results" / LLM_CACHE_FILE_NAME)
         # Initialize JsonResultsManager
         self.results_manager = JsonResultsManager(base_path=self.base_path, module_name="gpt4all")
         
         # Cache for quick lookup of previously analyzed requirements
         self.requirements_cache = {}
         
+        # One prompt per code side for all requirements instead of one per requirement
+        self.batch_mode = os.getenv("GPT4ALL_BATCH_MODE", "true").lower() in ("1", "true", "yes")
+        
         logger.info(f"GPT4All analyzer initialized with base path: {self.base_path}")
 
     def find_app_directory(self, model: str, app_num: int) -> Path:
@@ -823,7 +1174,8 @@ class GPT4AllAnalyzer:
             logger.error(f"Error loading requirements for {model}/app{app_num}: {e}")
             return None
 
-    def check_requirements(self, model: str, app_num: int, requirements: List[str] = None, force_rerun: bool = False) -> List[RequirementCheck]:
+    def check_requirements(self, model: str, app_num: int, requirements: List[str] = None, force_rerun: bool = False,
+                           batch: Optional[bool] = None) -> List[RequirementCheck]:
         """
         Check multiple requirements against both frontend and backend code.
         
@@ -832,15 +1184,12 @@ class GPT4AllAnalyzer:
             app_num: Application number
             requirements: List of requirements to check (if None, loads from a config)
             force_rerun: Whether to force rerun the analysis instead of using cached results
+            batch: Send each code side once with all requirements (defaults to GPT4ALL_BATCH_MODE);
+                requirements the batched answer does not cover are checked one by one
             
         Returns:
             List of RequirementCheck objects
         """
-        # Check if the GPT4All server is available
-        if not self.client.check_server():
-            logger.error("GPT4All server is not available")
-            return self._create_error_checks(requirements or ["Server unavailable"], "GPT4All server is not available")
-        
         # Try to load saved results if not forcing a rerun
         if not force_rerun:
             saved_checks = self.load_requirements(model, app_num)
@@ -848,6 +1197,11 @@ class GPT4AllAnalyzer:
                 logger.info(f"Using saved analysis results for {model}/app{app_num}")
                 return saved_checks
         
+        # Check if the GPT4All server is available
+        if not self.client.check_server():
+            logger.error("GPT4All server is not available")
+            return self._create_error_checks(requirements or ["Server unavailable"], "GPT4All server is not available")
+        
         # Find the application directory
         directory = self.find_app_directory(model, app_num)
         if not directory.exists():
@@ -867,59 +1221,37 @@ class GPT4AllAnalyzer:
             logger.error(f"No code files found in {directory}")
             return self._create_error_checks(requirements, "No code files found")
         
-        # Check each requirement
-        results = []
-        for req in requirements:
-            check = RequirementCheck(requirement=req)
-            result = RequirementResult()
-            
-            # Analyze frontend code
-            frontend_analysis = None
-            if frontend_code:
-                logger.info(f"Analyzing frontend code for requirement: {req}")
-                frontend_analysis = self.client.analyze_code(req, frontend_code, is_frontend=True)
-                result.frontend_analysis = frontend_analysis
-            else:
-                result.frontend_analysis = {"met": False, "confidence": "HIGH", "explanation": "No frontend code found"}
-            
-            # Analyze backend code
-            backend_analysis = None
-            if backend_code:
-                logger.info(f"Analyzing backend code for requirement: {req}")
-                backend_analysis = self.client.analyze_code(req, backend_code, is_frontend=False)
-                result.backend_analysis = backend_analysis
-            else:
-                result.backend_analysis = {"met": False, "confidence": "HIGH", "explanation": "No backend code found"}
-            
-            # Determine overall requirement status
-            frontend_met = frontend_analysis.get("met", False) if frontend_code else False
-            backend_met = backend_analysis.get("met", False) if backend_code else False
-            result.met = frontend_met or backend_met
-            
-            # Determine confidence level
-            frontend_confidence = frontend_analysis.get("confidence", "LOW") if frontend_code else "LOW"
-            backend_confidence = backend_analysis.get("confidence", "LOW") if backend_code else "LOW"
-            confidence_levels = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
-            frontend_score = confidence_levels.get(frontend_confidence, 1)
-            backend_score = confidence_levels.get(backend_confidence, 1)
-            result.confidence = "HIGH" if max(frontend_score, backend_score) == 3 else "MEDIUM" if max(frontend_score, backend_score) == 2 else "LOW"
-            
-            # Combine explanations
-            frontend_explanation = frontend_analysis.get("explanation", "") if frontend_code else "No frontend code found"
-            backend_explanation = backend_analysis.get("explanation", "") if backend_code else "No backend code found"
-            combined_explanation = ""
-            if frontend_explanation:
-                combined_explanation += f"Frontend: {frontend_explanation}"
-            if backend_explanation:
-                if combined_explanation:
-                    combined_explanation += "\n\nBackend: "
-                else:
-                    combined_explanation += "Backend: "
-                combined_explanation += backend_explanation
-            
-            result.explanation = combined_explanation
-            check.result = result
-            results.append(check)
+        # Check every requirement against both code sides concurrently; the client
+        # bounds how many requests reach the server at once
+        sides = [(is_frontend, code) for is_frontend, code in ((True, frontend_code), (False, backend_code)) if code]
+        batch = self.batch_mode if batch is None else batch
+        analyses: Dict[Tuple[str, bool], Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=self.client.max_concurrency, thread_name_prefix="gpt4all-check") as executor:
+            if batch:
+                unique_requirements = list(dict.fromkeys(requirements))
+                chunks = [unique_requirements[i:i + BATCH_MAX_REQUIREMENTS]
+                          for i in range(0, len(unique_requirements), BATCH_MAX_REQUIREMENTS)]
+                batch_futures = [
+                    (is_frontend, chunk, executor.submit(self._analyze_side_batch, chunk, code, is_frontend, not force_rerun))
+                    for is_frontend, code in sides for chunk in chunks
+                ]
+                for is_frontend, chunk, future in batch_futures:
+                    for req, verdict in zip(chunk, future.result()):
+                        if verdict is not None:
+                            analyses[(req, is_frontend)] = verdict
+            # Per-requirement calls only for what the batched answers left out
+            futures = {
+                (req, is_frontend): executor.submit(self._analyze_side, req, code, is_frontend, not force_rerun)
+                for req in requirements
+                for is_frontend, code in sides if (req, is_frontend) not in analyses
+            }
+            if batch and futures:
+                logger.info(f"Re-checking {len(futures)} requirement/side pairs missing from batched answers")
+            analyses.update({key: future.result() for key, future in futures.items()})
+        results = [
+            self._combine_analyses(req, analyses.get((req, True)), analyses.get((req, False)))
+            for req in requirements
+        ]
         
         # Save the results using JsonResultsManager
         self.save_requirements(model, app_num, results)
@@ -927,6 +1259,71 @@ class GPT4AllAnalyzer:
         logger.info(f"Completed requirement checks: {len(results)} requirements checked")
         return results
 
+    def _analyze_side(self, requirement: str, code: str, is_frontend: bool, use_cache: bool = True) -> Dict[str, Any]:
+        side = "frontend" if is_frontend else "backend"
+        logger.info(f"Analyzing {side} code for requirement: {requirement}")
+        try:
+            return self.client.analyze_code(requirement, code, is_frontend=is_frontend, use_cache=use_cache)
+        except Exception as e:
+            logger.exception(f"Error analyzing {side} code for requirement '{requirement}': {e}")
+            return self.client._fallback_analyze_code(requirement, code, is_frontend)
+
+    def _analyze_side_batch(self, requirements: List[str], code: str, is_frontend: bool,
+                            use_cache: bool = True) -> List[Optional[Dict[str, Any]]]:
+        side = "frontend" if is_frontend else "backend"
+        logger.info(f"Analyzing {side} code for {len(requirements)} requirements in one prompt")
+        try:
+            return self.client.analyze_requirements_batch(requirements, code, is_frontend=is_frontend, use_cache=use_cache)
+        except Exception as e:
+            logger.exception(f"Error in batched {side} analysis: {e}")
+            return [None] * len(requirements)
+
+    def _combine_analyses(self, requirement: str, frontend_analysis: Optional[Dict[str, Any]],
+                          backend_analysis: Optional[Dict[str, Any]]) -> RequirementCheck:
+        """
+        Merge the per-side analyses of one requirement into a RequirementCheck.
+        
+        Args:
+            requirement: The requirement text
+            frontend_analysis: Frontend result, or None when the app has no frontend code
+            backend_analysis: Backend result, or None when the app has no backend code
+            
+        Returns:
+            RequirementCheck met if either side meets it, at the higher side's confidence
+        """
+        result = RequirementResult()
+        result.frontend_analysis = frontend_analysis or {"met": False, "confidence": "HIGH", "explanation": "No frontend code found"}
+        result.backend_analysis = backend_analysis or {"met": False, "confidence": "HIGH", "explanation": "No backend code found"}
+        
+        # Determine overall requirement status
+        frontend_met = frontend_analysis.get("met", False) if frontend_analysis else False
+        backend_met = backend_analysis.get("met", False) if backend_analysis else False
+        result.met = frontend_met or backend_met
+        
+        # Determine confidence level
+        frontend_confidence = frontend_analysis.get("confidence", "LOW") if frontend_analysis else "LOW"
+        backend_confidence = backend_analysis.get("confidence", "LOW") if backend_analysis else "LOW"
+        confidence_levels = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+        frontend_score = confidence_levels.get(frontend_confidence, 1)
+        backend_score = confidence_levels.get(backend_confidence, 1)
+        result.confidence = "HIGH" if max(frontend_score, backend_score) == 3 else "MEDIUM" if max(frontend_score, backend_score) == 2 else "LOW"
+        
+        # Combine explanations
+        frontend_explanation = frontend_analysis.get("explanation", "") if frontend_analysis else "No frontend code found"
+        backend_explanation = backend_analysis.get("explanation", "") if backend_analysis else "No backend code found"
+        combined_explanation = ""
+        if frontend_explanation:
+            combined_explanation += f"Frontend: {frontend_explanation}"
+        if backend_explanation:
+            if combined_explanation:
+                combined_explanation += "\n\nBackend: "
+            else:
+                combined_explanation += "Backend: "
+            combined_explanation += backend_explanation
+        
+        result.explanation = combined_explanation
+        return RequirementCheck(requirement=requirement, result=result)
+
     def get_analysis_summary(self, model: str, app_num: int, results: List[RequirementCheck] = None) -> Dict[str, Any]:
         """
         Generate a summary of the requirements analysis results.
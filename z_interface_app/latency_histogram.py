@@ -0,0 +1,239 @@
+import base64
+import math
+import struct
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Bucket i covers (MIN_VALUE * GROWTH**(i-1), MIN_VALUE * GROWTH**i]; a 2% growth keeps
+# reported percentiles within ~1% of the recorded value
+DEFAULT_MIN_VALUE = 0.01  # milliseconds
+DEFAULT_GROWTH = 1.02
+ENCODING_MAGIC = b"LHG1"
+_HEADER = struct.Struct("<4sdddddQ")  # magic, min_value, growth, min, max, sum, bucket count
+# Key used for the all-requests histogram, matching Locust's aggregated row
+AGGREGATED_KEY = "Aggregated"
+REPORT_KEY = "latency_histograms"
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed (HDR-style) latency histogram.
+
+    Only non-empty buckets are kept, so a histogram costs a few hundred bytes
+    however many samples it holds. Histograms with the same bucketing can be
+    merged exactly, which is what makes per-worker and per-run histograms
+    combinable, and any percentile can be read back later.
+    """
+    def __init__(self, min_value: float = DEFAULT_MIN_VALUE, growth: float = DEFAULT_GROWTH):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min = math.inf
+        self.max = 0.0
+        self.sum = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return max(0, math.ceil(math.log(value / self.min_value) / self._log_growth - 1e-9))
+
+    def _bucket_value(self, index: int) -> float:
+        """Geometric midpoint of a bucket."""
+        if index == 0:
+            return self.min_value
+        return self.min_value * self.growth ** (index - 0.5)
+
+    def record(self, value: float, count: int = 1) -> None:
+        if value is None or value < 0:
+            return
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if (other.min_value, other.growth) != (self.min_value, self.growth):
+            raise ValueError("Cannot merge histograms with different bucketing")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total_count if self.total_count else 0.0
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Latency at percentile (0-100), clamped to the recorded min/max."""
+        if not self.total_count:
+            return 0.0
+        if percentile >= 100:
+            return self.max
+        target = max(1, math.ceil(self.total_count * percentile / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percentiles: Iterable[float]) -> Dict[str, float]:
+        return {f"{p:g}": round(self.value_at_percentile(p), 3) for p in percentiles}
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 95, 99, 99.9)) -> Dict[str, Any]:
+        return {
+            "count": self.total_count,
+            "min": round(self.min, 3) if self.total_count else 0.0,
+            "max": round(self.max, 3),
+            "mean": round(self.mean, 3),
+            "percentiles": self.percentiles(percentiles),
+        }
+
+    def encode(self) -> bytes:
+        """Compact binary form: fixed header, then (index delta, count) varint pairs."""
+        out = bytearray(_HEADER.pack(
+            ENCODING_MAGIC, self.min_value, self.growth,
+            self.min if self.total_count else 0.0, self.max, self.sum, len(self.counts)
+        ))
+        previous = 0
+        for index in sorted(self.counts):
+            _write_varint(out, index - previous)
+            _write_varint(out, self.counts[index])
+            previous = index
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "LatencyHistogram":
+        magic, min_value, growth, minimum, maximum, total, buckets = _HEADER.unpack_from(data, 0)
+        if magic != ENCODING_MAGIC:
+            raise ValueError("Not an encoded latency histogram")
+        histogram = cls(min_value, growth)
+        pos = _HEADER.size
+        index = 0
+        for _ in range(buckets):
+            delta, pos = _read_varint(data, pos)
+            count, pos = _read_varint(data, pos)
+            index += delta
+            histogram.counts[index] = count
+            histogram.total_count += count
+        histogram.sum = total
+        histogram.max = maximum
+        histogram.min = minimum if histogram.total_count else math.inf
+        return histogram
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.encode()).decode("ascii")
+
+    @classmethod
+    def from_base64(cls, text: str) -> "LatencyHistogram":
+        return cls.decode(base64.b64decode(text))
+
+
+class HistogramSet:
+    """Per-endpoint histograms keyed "<METHOD> <name>", plus the aggregated one."""
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, request_type: str, name: str, response_time: float) -> None:
+        with self._lock:
+            for key in (f"{request_type} {name}", AGGREGATED_KEY):
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = LatencyHistogram()
+                histogram.record(response_time)
+
+    def merge(self, other: "HistogramSet") -> "HistogramSet":
+        with self._lock:
+            for key, histogram in other.histograms.items():
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = LatencyHistogram(histogram.min_value, histogram.growth).merge(histogram)
+        return self
+
+    def drain(self) -> "HistogramSet":
+        """Return the current contents and start empty (used for worker reports)."""
+        drained = HistogramSet()
+        with self._lock:
+            drained.histograms, self.histograms = self.histograms, {}
+        return drained
+
+    def get(self, key: str = AGGREGATED_KEY) -> Optional[LatencyHistogram]:
+        return self.histograms.get(key)
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 95, 99, 99.9)) -> Dict[str, Dict[str, Any]]:
+        return {key: histogram.summary(percentiles) for key, histogram in sorted(self.histograms.items())}
+
+    def to_dict(self) -> Dict[str, str]:
+        return {key: histogram.to_base64() for key, histogram in self.histograms.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "HistogramSet":
+        histogram_set = cls()
+        histogram_set.histograms = {key: LatencyHistogram.from_base64(text) for key, text in (data or {}).items()}
+        return histogram_set
+
+    @classmethod
+    def merged(cls, sets: Iterable["HistogramSet"]) -> "HistogramSet":
+        result = cls()
+        for histogram_set in sets:
+            result.merge(histogram_set)
+        return result
+
+
+def attach_histogram_capture(environment: Any) -> HistogramSet:
+    """
+    Record every request's latency into a HistogramSet.
+
+    Works for local, worker and master runners: workers ship (and reset) their
+    histograms with each stats report, and the master merges them as they
+    arrive. Call after the environment's runner has been created.
+    """
+    from locust.runners import MasterRunner, WorkerRunner
+
+    histograms = HistogramSet()
+    runner = environment.runner
+
+    if not isinstance(runner, MasterRunner):
+        def on_request(request_type, name, response_time, **kwargs):
+            histograms.record(request_type, name, response_time)
+        environment.events.request.add_listener(on_request)
+
+    if isinstance(runner, WorkerRunner):
+        def on_report_to_master(client_id, data, **kwargs):
+            data[REPORT_KEY] = histograms.drain().to_dict()
+        environment.events.report_to_master.add_listener(on_report_to_master)
+
+    if isinstance(runner, MasterRunner):
+        def on_worker_report(client_id, data, **kwargs):
+            if data.get(REPORT_KEY):
+                histograms.merge(HistogramSet.from_dict(data[REPORT_KEY]))
+        environment.events.worker_report.add_listener(on_worker_report)
+
+    return histograms
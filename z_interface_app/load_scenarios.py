@@ -0,0 +1,441 @@
+import json
+import logging
+import re
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from route_extractor import PATH_PARAM_PATTERN, FlaskRoute
+
+logger = logging.getLogger(__name__)
+
+REQUIREMENTS_FILE_NAME = "requirements.json"
+VAR_PATTERN = re.compile(r"\$\{(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)\}")
+AUTH_KEYWORDS = {
+    "register": ("register", "signup", "sign-up", "sign_up"),
+    "login": ("login", "signin", "sign-in", "sign_in", "token"),
+    "logout": ("logout", "signout", "sign-out", "sign_out"),
+}
+# GET routes that only make sense for a logged-in user
+ACCOUNT_KEYWORDS = ("user", "profile", "me", "account", "session", "check-auth", "auth")
+# Response keys searched for a bearer token after a login/register step
+TOKEN_KEYS = ["access_token", "token", "jwt", "auth_token", "id_token"]
+# Per-user values: register and every later login must send the same credentials
+STICKY_FIELDS = ("username", "email", "password", "user", "login")
+TEXT_FIELDS = ("content", "body", "text", "message", "description", "comment", "bio", "note")
+TITLE_FIELDS = ("title", "name", "subject", "label")
+UPLOAD_CONTENT = b"locust load test upload\n"
+SCENARIO_WEIGHTS = {"crud": 3, "browse": 2, "session": 1}
+FEATURE_WEIGHT = 2
+
+
+# ---------------------------------------------------------------------------
+# Scenario generation
+# ---------------------------------------------------------------------------
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in path.strip("/").split("/") if segment]
+
+
+def _is_param(segment: str) -> bool:
+    return bool(PATH_PARAM_PATTERN.fullmatch(segment))
+
+
+def _auth_role(route: FlaskRoute) -> Optional[str]:
+    if "POST" not in route.methods:
+        return None
+    segments = _segments(route.path)
+    last = segments[-1].lower() if segments else ""
+    for role, keywords in AUTH_KEYWORDS.items():
+        if last in keywords:
+            return role
+    return None
+
+
+def _singular(word: str) -> str:
+    word = word.lower()
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _template_path(route: FlaskRoute) -> str:
+    """Flask path with every path parameter as a ``${name}`` placeholder."""
+    return PATH_PARAM_PATTERN.sub(lambda m: "${" + m.group("name") + "}", route.path)
+
+
+def _request_fields(route: FlaskRoute, method: str) -> Dict[str, Any]:
+    """Request arguments whose values are generated per step from each parameter's name."""
+    fields: Dict[str, Any] = {}
+    query = {p.name: "${" + p.name + "}" for p in route.params_in("query")}
+    if query:
+        fields["params"] = query
+    if method in ("POST", "PUT", "PATCH"):
+        body = {p.name: "${" + p.name + "}" for p in route.params_in("body")}
+        form = {p.name: "${" + p.name + "}" for p in route.params_in("form")}
+        files = {p.name: f"{p.name}.txt" for p in route.params_in("file")}
+        if body:
+            fields["json"] = body
+        elif form or files:
+            if form:
+                fields["data"] = form
+            if files:
+                fields["files"] = files
+    samples = {p.name: p.sample for p in route.parameters
+               if p.location in ("path", "query", "body", "form") and p.sample not in ("test", None)}
+    if samples:
+        fields["defaults"] = samples
+    return fields
+
+
+def make_step(route: FlaskRoute, method: str, extract: Optional[Dict[str, List[str]]] = None,
+              expect: Optional[List[int]] = None, requires: Optional[str] = None) -> Dict[str, Any]:
+    """One request of a scenario, as a JSON-serializable dict."""
+    step: Dict[str, Any] = {
+        "method": method,
+        "path": _template_path(route),
+        "request_name": route.path,
+    }
+    step.update(_request_fields(route, method))
+    if extract:
+        step["extract"] = extract
+    if expect:
+        step["expect"] = expect
+    if requires and requires in [p.name for p in route.params_in("path")]:
+        step["requires"] = [requires]
+    return step
+
+
+def _id_candidates(var: str, resource: str) -> List[str]:
+    return [var, "id", f"{resource}_id", "_id", "uuid"]
+
+
+class _Resource:
+    """Routes sharing one collection path, e.g. /api/posts and /api/posts/<id>/..."""
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.name = _singular(_segments(collection)[-1]) if _segments(collection) else "root"
+        self.item_param: Optional[str] = None
+        self.collection_routes: List[Tuple[FlaskRoute, str]] = []
+        self.item_routes: List[Tuple[FlaskRoute, str]] = []
+        self.nested_routes: List[Tuple[FlaskRoute, str]] = []
+
+    def first(self, routes: List[Tuple[FlaskRoute, str]], method: str) -> Optional[FlaskRoute]:
+        return next((route for route, m in routes if m == method), None)
+
+
+def _group_resources(routes: Iterable[FlaskRoute]) -> Dict[str, _Resource]:
+    resources: Dict[str, _Resource] = {}
+    for route in routes:
+        segments = _segments(route.path)
+        # /posts/<id>/comments belongs to posts; /posts/<id> is the posts item
+        param_index = next((i for i, segment in enumerate(segments) if _is_param(segment)), None)
+        if param_index is None:
+            collection = "/" + "/".join(segments)
+        else:
+            collection = "/" + "/".join(segments[:param_index])
+        resource = resources.setdefault(collection, _Resource(collection))
+        for method in route.methods:
+            if method in ("HEAD", "OPTIONS"):
+                continue
+            if param_index is None:
+                resource.collection_routes.append((route, method))
+            elif param_index == len(segments) - 1:
+                resource.item_routes.append((route, method))
+                resource.item_param = resource.item_param or PATH_PARAM_PATTERN.fullmatch(
+                    segments[param_index]).group("name")
+            else:
+                resource.nested_routes.append((route, method))
+    return resources
+
+
+def _crud_scenario(resource: _Resource) -> Optional[Dict[str, Any]]:
+    """create -> list -> read -> update -> nested -> delete for a resource with a create route."""
+    create = resource.first(resource.collection_routes, "POST")
+    if create is None:
+        return None
+    var = resource.item_param
+    extract = {var: _id_candidates(var, resource.name)} if var else None
+    steps = [make_step(create, "POST", extract=extract)]
+    listing = resource.first(resource.collection_routes, "GET")
+    if listing:
+        steps.append(make_step(listing, "GET"))
+    if not var:
+        # Create-only resources such as form submissions: submit, then read back the list
+        return {"scenario": f"{resource.name}_submit", "kind": "crud", "resource": resource.name, "steps": steps}
+    for method in ("GET", "PUT", "PATCH"):
+        route = resource.first(resource.item_routes, method)
+        if route:
+            steps.append(make_step(route, method, requires=var))
+    for route, method in resource.nested_routes:
+        if method != "DELETE":
+            steps.append(make_step(route, method, requires=var))
+    delete = resource.first(resource.item_routes, "DELETE")
+    if delete:
+        steps.append(make_step(delete, "DELETE", requires=var))
+    return {"scenario": f"{resource.name}_crud", "kind": "crud", "resource": resource.name, "steps": steps}
+
+
+def _browse_steps(resource: _Resource) -> List[Dict[str, Any]]:
+    """list -> read the first listed item, for collections without a create route."""
+    steps = []
+    listing = resource.first(resource.collection_routes, "GET")
+    read = resource.first(resource.item_routes, "GET")
+    requires = None
+    if listing:
+        extract = None
+        if read and resource.item_param:
+            extract = {resource.item_param: _id_candidates(resource.item_param, resource.name)}
+            requires = resource.item_param
+        steps.append(make_step(listing, "GET", extract=extract))
+    if read:
+        steps.append(make_step(read, "GET", requires=requires))
+    for route, method in resource.nested_routes:
+        if method == "GET":
+            steps.append(make_step(route, method, requires=requires))
+    return steps
+
+
+def _feature_tokens(app_info: Optional[Dict[str, Any]]) -> List[set]:
+    if not app_info:
+        return []
+    texts = list(app_info.get("specific_features", [])) + list(app_info.get("requirements", []))
+    return [{_singular(token) for token in re.findall(r"[a-zA-Z]+", str(text))} for text in texts]
+
+
+def _scenario_weight(scenario: Dict[str, Any], features: List[set]) -> int:
+    """Base weight by kind, plus FEATURE_WEIGHT per requirement that names the scenario's resource."""
+    weight = SCENARIO_WEIGHTS.get(scenario["kind"], 1)
+    keywords = {scenario.get("resource", "")}
+    if scenario["kind"] == "session":
+        keywords = {"login", "session", "authentication", "password"}
+    for tokens in features:
+        if keywords & tokens:
+            weight += FEATURE_WEIGHT
+    return weight
+
+
+def build_scenarios(routes: List[FlaskRoute], app_info: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Derive multi-step user flows from an app's Flask routes.
+
+    Register/login routes become per-user setup steps whose token and session carry
+    over into every later request; each resource with a create route gets a CRUD
+    flow that feeds the created id into its item routes; remaining GET routes form
+    a browse flow. Requirements from ``requirements.json`` raise the weight of the
+    flows touching the features they name.
+
+    Args:
+        routes: Routes from ``extract_app_routes``
+        app_info: The app's entry in requirements.json, if any
+
+    Returns:
+        Scenario configs understood by ``UserGenerator`` alongside plain endpoints
+    """
+    auth: Dict[str, FlaskRoute] = {}
+    other_routes = []
+    for route in routes:
+        role = _auth_role(route)
+        if role:
+            auth.setdefault(role, route)
+        else:
+            other_routes.append(route)
+
+    scenarios: List[Dict[str, Any]] = []
+    setup = []
+    if "register" in auth:
+        # The same user may register again after a restart; a conflict still leaves them usable
+        setup.append(make_step(auth["register"], "POST", extract={"token": TOKEN_KEYS},
+                               expect=[200, 201, 400, 409]))
+    if "login" in auth:
+        setup.append(make_step(auth["login"], "POST", extract={"token": TOKEN_KEYS}))
+    if setup:
+        scenarios.append({"scenario": "setup", "kind": "setup", "on_start": True, "steps": setup})
+
+    account_steps = []
+    browse_steps = []
+    for resource in _group_resources(other_routes).values():
+        crud = _crud_scenario(resource)
+        if crud:
+            scenarios.append(crud)
+            continue
+        is_account = any(keyword in _segments(resource.collection)[-1:] for keyword in ACCOUNT_KEYWORDS) \
+            if resource.collection != "/" else False
+        steps = _browse_steps(resource)
+        (account_steps if is_account and "login" in auth else browse_steps).extend(steps)
+
+    if "login" in auth:
+        # Ends logged in, so flows picked after this one keep an authenticated session
+        session = []
+        if "logout" in auth:
+            session.append(make_step(auth["logout"], "POST"))
+        session.append(make_step(auth["login"], "POST", extract={"token": TOKEN_KEYS}))
+        session.extend(account_steps)
+        scenarios.append({"scenario": "session", "kind": "session", "steps": session})
+    if browse_steps:
+        scenarios.append({"scenario": "browse", "kind": "browse", "steps": browse_steps})
+
+    features = _feature_tokens(app_info)
+    for scenario in scenarios:
+        if not scenario.get("on_start"):
+            scenario["weight"] = _scenario_weight(scenario, features)
+    logger.info(f"Built {len(scenarios)} load scenarios from {len(routes)} routes")
+    return scenarios
+
+
+def load_app_requirements(app_dir: Union[str, Path], app_num: int) -> Optional[Dict[str, Any]]:
+    """Find this app's entry in the requirements.json next to the models directory."""
+    app_dir = Path(app_dir)
+    for candidate in (app_dir.parents[1] / REQUIREMENTS_FILE_NAME, app_dir.parents[2] / REQUIREMENTS_FILE_NAME):
+        if not candidate.is_file():
+            continue
+        try:
+            with open(candidate, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {candidate}: {e}")
+            return None
+        for app in data.get("applications", []) if isinstance(data, dict) else []:
+            if str(app.get("id")) in (f"app_{app_num}", str(app_num)):
+                return app
+        return None
+    return None
+
+
+def is_scenario(endpoint: Dict[str, Any]) -> bool:
+    return "steps" in endpoint
+
+
+# ---------------------------------------------------------------------------
+# Scenario execution (shared by generated user classes and locustfiles)
+# ---------------------------------------------------------------------------
+
+class ScenarioContext:
+    """Per-user variables: credentials, ids extracted from responses and the auth token."""
+
+    def __init__(self):
+        self.uid = uuid.uuid4().hex[:10]
+        self.sequence = 0
+        self.values: Dict[str, Any] = {}
+
+    def new_iteration(self) -> None:
+        self.sequence += 1
+        # Keep credentials and the token; ids and content are produced again by each flow
+        self.values = {k: v for k, v in self.values.items() if k in STICKY_FIELDS or k == "token"}
+
+    def generate(self, name: str, default: Any = None) -> Any:
+        lowered = name.lower()
+        if "email" in lowered:
+            return f"lt_{self.uid}@example.com"
+        if "password" in lowered:
+            return f"LoadTest!{self.uid}"
+        if lowered in STICKY_FIELDS:
+            return f"lt_{self.uid}"
+        if default is not None:
+            return default
+        if lowered in ("page",):
+            return 1
+        if lowered in ("per_page", "limit", "size", "page_size"):
+            return 10
+        if lowered.endswith("_id") or lowered == "id":
+            return 1
+        if any(field in lowered for field in TITLE_FIELDS):
+            return f"Load test {name} {self.uid}-{self.sequence}"
+        if any(field in lowered for field in TEXT_FIELDS):
+            return f"Load test {name} written by lt_{self.uid} in iteration {self.sequence}."
+        if lowered in ("rating", "score", "quantity", "amount", "price"):
+            return 5
+        return f"{name}-{self.uid}-{self.sequence}"
+
+    def get(self, name: str, defaults: Dict[str, Any]) -> Any:
+        if name not in self.values:
+            self.values[name] = self.generate(name, defaults.get(name))
+        return self.values[name]
+
+    def resolve(self, template: Any, defaults: Dict[str, Any]) -> Any:
+        if isinstance(template, dict):
+            return {key: self.resolve(value, defaults) for key, value in template.items()}
+        if isinstance(template, list):
+            return [self.resolve(value, defaults) for value in template]
+        if not isinstance(template, str):
+            return template
+        whole = VAR_PATTERN.fullmatch(template)
+        if whole:
+            # Keep the generated type, e.g. integers in JSON bodies
+            return self.get(whole.group("name"), defaults)
+        return VAR_PATTERN.sub(lambda m: str(self.get(m.group("name"), defaults)), template)
+
+
+def find_value(data: Any, keys: List[str]) -> Any:
+    """First value for any of ``keys`` in a JSON response, searching nested objects and lists."""
+    queue = [data]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            for key in keys:
+                if node.get(key) not in (None, ""):
+                    return node[key]
+            queue.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list) and node:
+            queue.append(node[0])
+    return None
+
+
+def _context(user: Any) -> ScenarioContext:
+    context = getattr(user, "scenario_context", None)
+    if context is None:
+        context = user.scenario_context = ScenarioContext()
+    return context
+
+
+def run_step(user: Any, step: Dict[str, Any], context: ScenarioContext) -> bool:
+    """
+    Send one scenario request with ``user.client``.
+
+    Returns:
+        False when the step failed or an id it requires was never extracted,
+        which ends the scenario for this iteration
+    """
+    defaults = step.get("defaults", {})
+    if any(var not in context.values for var in step.get("requires", [])):
+        return False
+    kwargs: Dict[str, Any] = {"name": step.get("request_name", step["path"]), "catch_response": True}
+    for param in ("params", "json", "data", "headers"):
+        if param in step:
+            kwargs[param] = context.resolve(step[param], defaults)
+    if "files" in step:
+        kwargs["files"] = {field: (file_name, UPLOAD_CONTENT) for field, file_name in step["files"].items()}
+    path = context.resolve(step["path"], defaults)
+
+    with user.client.request(step["method"], path, **kwargs) as response:
+        expected = step.get("expect")
+        ok = response.status_code in expected if expected else response.ok
+        if not ok:
+            response.failure(f"HTTP {response.status_code}")
+            return False
+        response.success()
+        if step.get("extract"):
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            for var, keys in step["extract"].items():
+                value = find_value(body, keys)
+                if value is not None:
+                    context.values[var] = value
+                    if var == "token":
+                        user.client.headers["Authorization"] = f"Bearer {value}"
+    return True
+
+
+def run_scenario(user: Any, scenario: Dict[str, Any]) -> None:
+    """Run every step of a scenario in order, stopping at the first failed step."""
+    context = _context(user)
+    if not scenario.get("on_start"):
+        context.new_iteration()
+    for step in scenario["steps"]:
+        if not run_step(user, step, context):
+            break
@@ -0,0 +1,114 @@
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from locust import HttpUser, task, between
+
+from load_scenarios import is_scenario, run_scenario
+
+logger = logging.getLogger(__name__)
+
+# Static locustfile used by CLI runs and worker processes; it builds its user
+# class from the JSON endpoint spec named by this environment variable
+ENDPOINT_SPEC_ENV = "PERF_ENDPOINT_SPEC"
+SPEC_LOCUSTFILE_PATH = Path(__file__).resolve().parent / "spec_locustfile.py"
+# Endpoint keys that cannot cross a process boundary
+LOCAL_ONLY_KEYS = ("validators",)
+
+
+class UserGenerator:
+    @staticmethod
+    def create_http_user(host: str, endpoints: List[Dict[str, Any]]) -> type:
+        class_attrs = {
+            'host': host,
+            'wait_time': between(1, 3)
+        }
+
+        setup_scenarios = []
+        for i, endpoint in enumerate(endpoints):
+            if is_scenario(endpoint):
+                # Multi-step flow; setup flows run once per user before any task
+                if endpoint.get('on_start'):
+                    setup_scenarios.append(endpoint)
+                    continue
+                scenario_name = re.sub(r"[^a-zA-Z0-9_]", "_", endpoint.get('scenario', 'flow')).lower()
+                task_name = f"scenario_{scenario_name}_{i}"
+
+                def create_scenario_fn(captured_scenario):
+                    def scenario_fn(self: HttpUser):
+                        run_scenario(self, captured_scenario)
+                    return scenario_fn
+
+                scenario_fn_instance = create_scenario_fn(endpoint)
+                scenario_fn_instance.__name__ = task_name
+                class_attrs[task_name] = task(endpoint.get('weight', 1))(scenario_fn_instance)
+                continue
+
+            path = endpoint['path']
+            method = endpoint.get('method', 'GET').lower()
+            weight = endpoint.get('weight', 1)
+            ep_name_part = re.sub(r"[^a-zA-Z0-9_]", "_", path.strip('/')).lower()
+            if not ep_name_part: ep_name_part = "root"
+            task_name = endpoint.get('name', f"task_{method}_{ep_name_part}_{i}")
+
+            def create_task_fn(captured_path, captured_method, captured_endpoint_config):
+                def task_fn(self: HttpUser):
+                    kwargs = {}
+                    for param in ['params', 'data', 'json', 'headers', 'files']:
+                        if param in captured_endpoint_config:
+                            kwargs[param] = captured_endpoint_config[param]
+
+                    request_name = captured_endpoint_config.get('request_name', captured_path)
+                    kwargs['name'] = request_name
+
+                    request_method_func = getattr(self.client, captured_method)
+                    with request_method_func(captured_path, catch_response=True, **kwargs) as response:
+                        validators = captured_endpoint_config.get('validators')
+                        if validators and callable(validators):
+                            try:
+                                validators(response)
+                            except Exception as val_err:
+                                response.failure(f"Validator failed: {val_err}")
+                        elif not response.ok:
+                            response.failure(f"HTTP {response.status_code}")
+                task_fn.__name__ = task_name
+                task_fn.__doc__ = f"Task for {captured_method.upper()} {captured_path}"
+                return task_fn
+
+            task_fn_instance = create_task_fn(path, method, endpoint)
+            decorated_task = task(weight)(task_fn_instance)
+            class_attrs[task_name] = decorated_task
+
+        if setup_scenarios:
+            def on_start(self: HttpUser):
+                for scenario in setup_scenarios:
+                    run_scenario(self, scenario)
+            class_attrs['on_start'] = on_start
+
+        DynamicUserClass = type('DynamicHttpUser', (HttpUser,), class_attrs)
+        logger.debug(f"Created DynamicHttpUser class with tasks: {list(class_attrs.keys())}")
+        return DynamicUserClass
+
+
+def write_endpoint_spec(host: str, endpoints: List[Dict[str, Any]], spec_path: Union[str, Path]) -> str:
+    """Write the endpoint configs for the static locustfile to load."""
+    portable = []
+    for endpoint in endpoints:
+        dropped = [key for key in LOCAL_ONLY_KEYS if key in endpoint]
+        if dropped:
+            logger.warning(f"Ignoring {dropped} for {endpoint.get('path')}: not supported outside the library runner")
+        portable.append({k: v for k, v in endpoint.items() if k not in LOCAL_ONLY_KEYS})
+    spec_path = Path(spec_path)
+    with open(spec_path, "w", encoding="utf-8") as f:
+        json.dump({"host": host, "endpoints": portable}, f, indent=2)
+    return str(spec_path)
+
+
+def load_endpoint_spec(spec_path: Union[str, Path]) -> Dict[str, Any]:
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if not spec.get("endpoints"):
+        raise ValueError(f"Endpoint spec {spec_path} lists no endpoints")
+    return spec
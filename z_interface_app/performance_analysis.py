@@ -3,27 +3,108 @@ import logging
 import os
 import re
 import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, Callable, Tuple, TypedDict
+from typing import Dict, List, Optional, Set, Union, Any, Callable, Tuple, TypedDict
 import socket
+import subprocess
+import sys
 import io
 
-from locust import HttpUser, task, constant, events, between
+from locust import LoadTestShape, constant, events
 from locust.env import Environment
-from locust.stats import stats_printer, StatsEntry, RequestStats, sort_stats
-from locust.runners import Runner, LocalRunner
+from locust.stats import (
+    stats_printer, StatsEntry, RequestStats, sort_stats,
+    calculate_response_time_percentile, diff_response_time_dicts
+)
+try:
+    from locust.stats import update_stats_history
+except ImportError:
+    # Older Locust releases (e.g. 2.20) fill stats.history only from the web UI
+    update_stats_history = None
+from locust.runners import Runner, LocalRunner, MasterRunner
 import gevent
 import pandas as pd
 import matplotlib.pyplot as plt
 
 # Import JsonResultsManager from utils.py for standardized file handling
 from utils import JsonResultsManager
+from latency_histogram import HistogramSet, attach_histogram_capture
+from load_scenarios import is_scenario
+from locust_users import ENDPOINT_SPEC_ENV, SPEC_LOCUSTFILE_PATH, UserGenerator, write_endpoint_spec
+from performance_regression import RESULT_FILE_NAME, RegressionDetector, load_profile, record_from_result
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENDPOINT_SPEC_FILE_NAME = "endpoint_spec.json"
+
+# Distributed mode: a master runner in this process plus local `locust --worker` processes
+MASTER_BIND_HOST = "127.0.0.1"
+MAX_LOCAL_WORKERS = int(os.getenv('LOCUST_MAX_WORKERS', '0')) or (os.cpu_count() or 1)
+WORKER_CONNECT_TIMEOUT = int(os.getenv('LOCUST_WORKER_CONNECT_TIMEOUT', '30'))
+# Workers flush stats every few seconds; give them time to send the last report after stop
+WORKER_FINAL_REPORT_SECONDS = 4
+# Interval of the in-process stats history that backs the stored time series
+HISTORY_SAMPLE_SECONDS = 1
+# Numeric columns of Locust's stats CSV
+STATS_NUMERIC_COLUMNS = [
+    'Request Count', 'Failure Count', 'Median Response Time', 'Average Response Time',
+    'Min Response Time', 'Max Response Time', 'Average Content Size', 'Requests/s', 'Failures/s'
+]
+# Stored history series -> source columns, in-memory history keys first, then stats_history.csv headers
+HISTORY_SERIES = {
+    "current_rps": ("current_rps", "Requests/s"),
+    "current_fail_per_sec": ("current_fail_per_sec", "Failures/s"),
+    "avg_response_time": ("avg_response_time", "total_avg_response_time",
+                          "Total Average Response Time", "Average Response Time"),
+    "median_response_time": ("median_response_time", "response_time_percentile_0.5",
+                             "Total Median Response Time", "Median Response Time", "50%"),
+    "p95_response_time": ("response_time_percentile_0.95", "95%"),
+    "user_count": ("user_count", "User Count"),
+}
+# Capacity search (see run_capacity_search): the first part of every step is ramp-up and not measured
+CAPACITY_FILE_NAME = ".locust_capacity.json"
+RUN_CAPACITY_FILE_NAME = "capacity.json"
+CAPACITY_WARMUP_FRACTION = 0.25
+# Knee: going up a step must raise throughput by at least this share of the relative user increase
+CAPACITY_KNEE_MIN_GAIN = 0.25
+# Per-run time series (see _save_timeseries); PNGs are rendered from it on first view
+TIMESERIES_FILE_NAME = "timeseries.json"
+TIMESERIES_VERSION = 1
+CHARTS_DIR_NAME = "charts"
+CHART_RENDER_TIMEOUT = 20
+# The first series of each chart is required for the chart to be offered; the rest are drawn when present
+CHARTS = [
+    {"id": "requests_failures_per_second", "name": "RPS & Failures/s",
+     "title": "Requests and Failures Per Second Over Time", "ylabel": "Rate (per second)", "series": [
+         {"key": "current_rps", "label": "Requests/s", "style": {"color": "tab:blue", "linewidth": 1.5}},
+         {"key": "current_fail_per_sec", "label": "Failures/s",
+          "style": {"color": "tab:red", "linestyle": "--", "linewidth": 1}},
+     ]},
+    {"id": "response_times", "name": "Response Times",
+     "title": "Response Times Over Time", "ylabel": "Response Time (ms)", "series": [
+         {"key": "avg_response_time", "label": "Average RT", "style": {"color": "tab:green", "linewidth": 1.5}},
+         {"key": "median_response_time", "label": "Median RT (P50)",
+          "style": {"color": "tab:orange", "linestyle": "-", "linewidth": 1.5}},
+         {"key": "p95_response_time", "label": "95th Percentile RT",
+          "style": {"color": "tab:purple", "linestyle": ":", "linewidth": 1.5}},
+     ]},
+    {"id": "active_users", "name": "Active Users",
+     "title": "Number of Active Users Over Time", "ylabel": "Users", "series": [
+         {"key": "user_count", "label": "Active Users", "style": {"color": "tab:cyan", "linewidth": 1.5}},
+     ]},
+]
+CHART_IDS = {chart["id"] for chart in CHARTS}
+# Per-endpoint latency histograms (see latency_histogram.py), stored next to .locust_result.json
+HISTOGRAM_FILE_NAME = ".locust_histograms.json"
+RUN_HISTOGRAM_FILE_NAME = "latency_histograms.json"
+
 
 @dataclass
 class EndpointStats:
@@ -75,6 +156,13 @@ class PerformanceResult:
     test_name: str = ""
     host: str = ""
     graph_urls: List[GraphInfo] = field(default_factory=list)
+    workers: int = 0
+    histogram_file: str = ""
+    timeseries_file: str = ""
+    model: str = ""
+    app_num: int = 0
+    profile: str = ""
+    regression: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         result = asdict(self)
@@ -90,60 +178,74 @@ class PerformanceResult:
         logger.info(f"Performance results saved to {file_path}")
 
 
-class UserGenerator:
-    @staticmethod
-    def create_http_user(host: str, endpoints: List[Dict[str, Any]]) -> type:
-        class_attrs = {
-            'host': host,
-            'wait_time': between(1, 3)
-        }
+@dataclass
+class CapacityStep:
+    users: int
+    requests: int
+    failures: int
+    rps: float
+    median_response_time: float
+    percentile_95: float
+    failure_rate: float
+    within_slo: bool
+
 
-        for i, endpoint in enumerate(endpoints):
-            path = endpoint['path']
-            method = endpoint.get('method', 'GET').lower()
-            weight = endpoint.get('weight', 1)
-            ep_name_part = re.sub(r"[^a-zA-Z0-9_]", "_", path.strip('/')).lower()
-            if not ep_name_part: ep_name_part = "root"
-            task_name = endpoint.get('name', f"task_{method}_{ep_name_part}_{i}")
-
-            def create_task_fn(captured_path, captured_method, captured_endpoint_config):
-                def task_fn(self: HttpUser):
-                    kwargs = {}
-                    for param in ['params', 'data', 'json', 'headers', 'files']:
-                        if param in captured_endpoint_config:
-                            kwargs[param] = captured_endpoint_config[param]
-
-                    request_name = captured_endpoint_config.get('request_name', captured_path)
-                    kwargs['name'] = request_name
-
-                    request_method_func = getattr(self.client, captured_method)
-                    with request_method_func(captured_path, catch_response=True, **kwargs) as response:
-                        validators = captured_endpoint_config.get('validators')
-                        if validators and callable(validators):
-                            try:
-                                validators(response)
-                            except Exception as val_err:
-                                response.failure(f"Validator failed: {val_err}")
-                        elif not response.ok:
-                            response.failure(f"HTTP {response.status_code}")
-                task_fn.__name__ = task_name
-                task_fn.__doc__ = f"Task for {captured_method.upper()} {captured_path}"
-                return task_fn
-
-            task_fn_instance = create_task_fn(path, method, endpoint)
-            decorated_task = task(weight)(task_fn_instance)
-            class_attrs[task_name] = decorated_task
-
-        DynamicUserClass = type('DynamicHttpUser', (HttpUser,), class_attrs)
-        logger.debug(f"Created DynamicHttpUser class with tasks: {list(class_attrs.keys())}")
-        return DynamicUserClass
+@dataclass
+class CapacityResult:
+    """Outcome of a capacity search: the highest load an app sustained within the SLO."""
+    test_name: str
+    host: str
+    slo_p95_ms: float
+    slo_failure_rate: float
+    steps: List[CapacityStep] = field(default_factory=list)
+    max_sustainable_rps: float = 0.0
+    max_sustainable_users: int = 0
+    knee_users: Optional[int] = None
+    stop_reason: str = ""
+    start_time: str = ""
+    end_time: str = ""
+    model: str = ""
+    app_num: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StepLoadShape(LoadTestShape):
+    """
+    Staircase load: start_users, then step_users more every step_duration seconds
+    up to max_users. The capacity search ends the test early through stop().
+    """
+    def __init__(self, start_users: int, step_users: int, step_duration: int, max_users: int, spawn_rate: float):
+        super().__init__()
+        self.start_users = start_users
+        self.step_users = step_users
+        self.step_duration = step_duration
+        self.max_users = max_users
+        self.spawn_rate = spawn_rate
+        self.steps = max(1, (max_users - start_users) // max(step_users, 1) + 1)
+        self.stopped = False
+
+    def users_for_step(self, step: int) -> int:
+        return min(self.start_users + step * self.step_users, self.max_users)
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def tick(self) -> Optional[Tuple[int, float]]:
+        step = int(self.get_run_time() // self.step_duration)
+        if self.stopped or step >= self.steps:
+            return None
+        return self.users_for_step(step), self.spawn_rate
 
 
 class LocustPerformanceTester:
-    def __init__(self, output_dir: Union[str, Path], static_url_path: str = "/static"):
+    def __init__(self, output_dir: Union[str, Path], static_url_path: str = "/static",
+                 chart_url_path: str = "/performance/charts"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.static_url_path = "/" + static_url_path.strip('/')
+        self.chart_url_path = "/" + chart_url_path.strip('/')
         logger.info(f"PerformanceTester initialized. Output dir: {self.output_dir}, Static URL path: {self.static_url_path}")
         self.current_test_dir: Optional[Path] = None
         self.environment: Optional[Environment] = None
@@ -152,6 +254,14 @@ class LocustPerformanceTester:
         # Initialize JsonResultsManager for standardized results handling
         self.results_manager = JsonResultsManager(base_path=self.output_dir, module_name="performance")
 
+        # Lazy chart rendering: one worker, in-flight jobs keyed by (run id, chart id)
+        self._chart_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-render")
+        self._chart_jobs: Dict[Tuple[str, str], Any] = {}
+        self._chart_lock = threading.Lock()
+
+        # Index of per-run results for regression checks across runs
+        self.regression_detector = RegressionDetector(self.output_dir / "performance_reports")
+
     def _save_consolidated_results(self,
                                    result: PerformanceResult,
                                    model: str,
@@ -238,6 +348,13 @@ class LocustPerformanceTester:
             result.percentile_95 = data.get('percentile_95', 0.0)
             result.percentile_99 = data.get('percentile_99', 0.0)
             result.graph_urls = data.get('graph_urls', [])
+            result.workers = data.get('workers', 0)
+            result.histogram_file = data.get('histogram_file', '')
+            result.timeseries_file = data.get('timeseries_file', '')
+            result.model = data.get('model', '')
+            result.app_num = data.get('app_num', 0)
+            result.profile = data.get('profile', '')
+            result.regression = data.get('regression', {})
             
             logger.info(f"Successfully loaded performance results for {model}/app{app_num}")
             return result
@@ -341,14 +458,15 @@ class LocustPerformanceTester:
         test_dir = self._setup_test_directory(full_test_name)
         csv_prefix = str(test_dir / "stats")
 
-        temp_locustfile = None
+        process_env = None
         if not locustfile_path and endpoints:
             try:
-                temp_locustfile = self._create_temp_locustfile(host, endpoints, test_dir)
-                locustfile_path = temp_locustfile
-            except Exception as temp_err:
-                logger.error(f"Failed to create temporary locustfile: {temp_err}")
+                spec_path = self._write_endpoint_spec(host, endpoints, test_dir)
+            except Exception as spec_err:
+                logger.error(f"Failed to write endpoint spec: {spec_err}")
                 return None
+            locustfile_path = str(SPEC_LOCUSTFILE_PATH)
+            process_env = {**os.environ, ENDPOINT_SPEC_ENV: spec_path}
         elif not locustfile_path:
             logger.error("No locustfile or endpoints provided for CLI test.")
             return None
@@ -357,7 +475,7 @@ class LocustPerformanceTester:
             cmd = ["locust", "-f", locustfile_path, "--host", host]
             if headless:
                 cmd.extend(["--headless", "--users", str(user_count),
-                            "--spawn_rate", str(spawn_rate), "--run-time", run_time])
+                            "--spawn-rate", str(spawn_rate), "--run-time", run_time])
             else:
                 pass
 
@@ -381,6 +499,7 @@ class LocustPerformanceTester:
                 capture_output=True,
                 text=True,
                 encoding='utf-8',
+                env=process_env,
                 check=False
             )
 
@@ -423,8 +542,15 @@ class LocustPerformanceTester:
             result.test_name = full_test_name
             result.host = host
 
-            graph_infos = self._generate_graphs_from_csv(history_file, test_dir)
-            result.graph_urls = graph_infos
+            timeseries_file = self._save_timeseries_from_csv(history_file, test_dir)
+            if timeseries_file:
+                result.timeseries_file = str(timeseries_file)
+                result.graph_urls = self.chart_links(test_dir.name)
+            if model and app_num:
+                result.model, result.app_num = model, app_num
+            if endpoints:
+                result.profile = self.load_profile_key(endpoints, user_count, spawn_rate, result.duration, workers)
+            self._record_run(result, test_dir)
 
             # Save results using JsonResultsManager if model and app_num are provided
             if model and app_num:
@@ -437,13 +563,6 @@ class LocustPerformanceTester:
         except Exception as e:
             logger.exception(f"Unhandled error running Locust CLI test '{full_test_name}': {e}")
             return None
-        finally:
-            if temp_locustfile and os.path.exists(temp_locustfile):
-                try:
-                    os.unlink(temp_locustfile)
-                    logger.debug(f"Deleted temporary locustfile: {temp_locustfile}")
-                except Exception as e_unlink:
-                    logger.warning(f"Failed to delete temporary file {temp_locustfile}: {e_unlink}")
 
     def _extract_stats_from_environment(
         self,
@@ -521,6 +640,349 @@ class LocustPerformanceTester:
         logger.info(f"Stats extraction complete. Total Requests: {result.total_requests}, Failures: {result.total_failures}")
         return result
 
+    @staticmethod
+    def load_profile_key(endpoints: List[Dict[str, Any]], user_count: int, spawn_rate: int,
+                         run_time: int, workers: int = 0) -> str:
+        """Regression-comparison key for a run configuration (requested load, not what was hit)."""
+        return load_profile(user_count, spawn_rate, run_time, workers, [
+            f"SCENARIO {ep.get('scenario', '')} {json.dumps(ep['steps'], sort_keys=True)} w{ep.get('weight', 1)}"
+            if is_scenario(ep) else f"{ep.get('method', 'GET').upper()} {ep['path']} w{ep.get('weight', 1)}"
+            for ep in endpoints
+        ])
+
+    def _record_run(self, result: PerformanceResult, test_dir: Path) -> None:
+        """Check a finished run against earlier runs of the same app and profile, then store it in its directory."""
+        if result.model and result.app_num:
+            try:
+                record = record_from_result(test_dir.name, result.to_dict())
+                result.regression = self.regression_detector.evaluate(record).to_dict()
+            except Exception as e:
+                logger.error(f"Regression check failed for '{result.test_name}': {e}", exc_info=True)
+        try:
+            result.save_json(test_dir / RESULT_FILE_NAME)
+        except OSError as e:
+            logger.error(f"Failed to save run results for '{result.test_name}': {e}")
+
+    def run_capacity_search(
+        self,
+        test_name: str,
+        host: str,
+        endpoints: List[Dict[str, Any]],
+        slo_p95_ms: float = 500.0,
+        slo_failure_rate: float = 1.0,
+        start_users: int = 5,
+        step_users: int = 5,
+        step_duration: int = 15,
+        max_users: int = 200,
+        spawn_rate: Optional[float] = None,
+        model: Optional[str] = None,
+        app_num: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> CapacityResult:
+        """
+        Find the highest throughput an app sustains within a latency/error SLO.
+        
+        Users ramp up in steps (StepLoadShape). After each step the step's own
+        p95 and failure rate are read from the runner's stats (a diff of the
+        response-time table, excluding the ramp-up at the start of the step).
+        The search stops at the knee: the first step that breaks the SLO, or
+        that adds users without a matching gain in throughput.
+        
+        Args:
+            test_name: Base name of the test
+            host: Target host URL
+            endpoints: Endpoint configurations, as for run_test_library
+            slo_p95_ms: Highest acceptable 95th percentile response time (ms)
+            slo_failure_rate: Highest acceptable failure rate (percent)
+            start_users: Users in the first step
+            step_users: Users added per step
+            step_duration: Seconds per step
+            max_users: Upper bound on users
+            spawn_rate: Users started per second (default: a step's users within a second)
+            model: Model name (results are saved per app when given with app_num)
+            app_num: Application number
+            progress_callback: Called with each finished step
+            
+        Returns:
+            CapacityResult with per-step measurements and the max sustainable RPS
+        """
+        if not endpoints:
+            raise ValueError("Capacity search requires endpoints")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        full_test_name = f"{test_name}_capacity_{timestamp}"
+        test_dir = self._setup_test_directory(full_test_name)
+        shape = StepLoadShape(start_users, step_users, step_duration, max_users,
+                              spawn_rate or max(step_users, start_users))
+        result = CapacityResult(
+            test_name=full_test_name, host=host, slo_p95_ms=slo_p95_ms, slo_failure_rate=slo_failure_rate,
+            model=model or "", app_num=app_num or 0, start_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+        self.environment = Environment(
+            user_classes=[self.create_user_class(host, endpoints)], host=host,
+            catch_exceptions=True, shape_class=shape
+        )
+        self.runner = self.environment.create_local_runner()
+        histograms = attach_histogram_capture(self.environment)
+
+        def snapshot() -> Tuple[int, int, Dict[int, int], float]:
+            total = self.environment.stats.total
+            return total.num_requests, total.num_failures, dict(total.response_times), time.monotonic()
+
+        def controller():
+            warmup = step_duration * CAPACITY_WARMUP_FRACTION
+            for step in range(shape.steps):
+                gevent.sleep(max(0.0, step * step_duration + warmup - shape.get_run_time()))
+                start = snapshot()
+                gevent.sleep(max(0.0, (step + 1) * step_duration - shape.get_run_time()))
+                end = snapshot()
+                step_result = self._capacity_step(shape.users_for_step(step), start, end, slo_p95_ms, slo_failure_rate)
+                result.steps.append(step_result)
+                result.stop_reason = self._capacity_stop_reason(result.steps)
+                if progress_callback:
+                    try:
+                        progress_callback({"test_name": full_test_name, "step": step + 1, "of": shape.steps,
+                                           **asdict(step_result)})
+                    except Exception as cb_err:
+                        logger.debug(f"Error in progress_callback: {cb_err}")
+                if result.stop_reason:
+                    break
+            result.stop_reason = result.stop_reason or "max_users"
+            shape.stop()
+            self.runner.quit()
+
+        logger.info(
+            f"Capacity search '{full_test_name}': {start_users}+{step_users} users every {step_duration}s "
+            f"up to {max_users}, SLO p95<={slo_p95_ms}ms, failures<={slo_failure_rate}%"
+        )
+        self.runner.start_shape()
+        controller_greenlet = gevent.spawn(controller)
+        try:
+            self.runner.greenlet.join()
+        finally:
+            if not controller_greenlet.dead:
+                controller_greenlet.kill(block=False)
+            if self.runner:
+                self.runner.quit()
+
+        sustainable = [s for s in result.steps if s.within_slo]
+        if sustainable:
+            best = max(sustainable, key=lambda s: s.rps)
+            result.max_sustainable_rps, result.max_sustainable_users = best.rps, best.users
+        if result.stop_reason in ("slo_breach", "throughput_plateau"):
+            result.knee_users = result.steps[-1].users
+        result.end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        logger.info(
+            f"Capacity search '{full_test_name}' stopped ({result.stop_reason}): "
+            f"{result.max_sustainable_rps} RPS at {result.max_sustainable_users} users"
+        )
+
+        self._save_latency_histograms(histograms, full_test_name, test_dir, None, None)
+        self._save_capacity_result(result, test_dir)
+        self.environment = None
+        self.runner = None
+        return result
+
+    @staticmethod
+    def _capacity_step(users: int, start: Tuple[int, int, Dict[int, int], float],
+                       end: Tuple[int, int, Dict[int, int], float], slo_p95_ms: float,
+                       slo_failure_rate: float) -> CapacityStep:
+        requests, failures = end[0] - start[0], end[1] - start[1]
+        response_times = diff_response_time_dicts(end[2], start[2])
+        window_requests = sum(response_times.values())
+        elapsed = max(end[3] - start[3], 1e-6)
+        p50 = calculate_response_time_percentile(response_times, window_requests, 0.5) if window_requests else 0
+        p95 = calculate_response_time_percentile(response_times, window_requests, 0.95) if window_requests else 0
+        failure_rate = failures / requests * 100 if requests else 0.0
+        return CapacityStep(
+            users=users,
+            requests=requests,
+            failures=failures,
+            rps=round(requests / elapsed, 2),
+            median_response_time=float(p50),
+            percentile_95=float(p95),
+            failure_rate=round(failure_rate, 2),
+            within_slo=bool(requests) and p95 <= slo_p95_ms and failure_rate <= slo_failure_rate
+        )
+
+    @staticmethod
+    def _capacity_stop_reason(steps: List[CapacityStep]) -> str:
+        """Why the search should stop after the latest step, or "" to keep ramping."""
+        latest = steps[-1]
+        if not latest.within_slo:
+            return "slo_breach"
+        if len(steps) >= 2:
+            previous = steps[-2]
+            if previous.rps > 0 and latest.users > previous.users:
+                user_gain = latest.users / previous.users - 1
+                rps_gain = latest.rps / previous.rps - 1
+                if rps_gain < user_gain * CAPACITY_KNEE_MIN_GAIN:
+                    return "throughput_plateau"
+        return ""
+
+    def _save_capacity_result(self, result: CapacityResult, test_dir: Path) -> None:
+        try:
+            with open(test_dir / RUN_CAPACITY_FILE_NAME, "w", encoding="utf-8") as f:
+                json.dump(result.to_dict(), f, indent=2)
+            if result.model and result.app_num:
+                self.results_manager.save_results(
+                    model=result.model, app_num=result.app_num, results=result,
+                    file_name=CAPACITY_FILE_NAME, maintain_legacy=False
+                )
+        except Exception as e:
+            logger.error(f"Failed to save capacity result for '{result.test_name}': {e}")
+
+    def load_capacity_results(self) -> List[Dict[str, Any]]:
+        """Latest capacity result of every app that has one."""
+        results = []
+        for capacity_file in sorted((self.output_dir / "results").glob(f"*/app*/{CAPACITY_FILE_NAME}")):
+            try:
+                with open(capacity_file, "r", encoding="utf-8") as f:
+                    results.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable capacity result {capacity_file}: {e}")
+        return results
+
+    @staticmethod
+    def summarize_capacity(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cross-model comparison of max sustainable RPS."""
+        if not results:
+            return []
+        df = pd.DataFrame(results)
+        summary = []
+        for model, group in df.groupby("model", sort=True):
+            summary.append({
+                "model": model,
+                "apps_tested": int(len(group)),
+                "mean_max_rps": round(float(group["max_sustainable_rps"].mean()), 2),
+                "median_max_rps": round(float(group["max_sustainable_rps"].median()), 2),
+                "min_max_rps": round(float(group["max_sustainable_rps"].min()), 2),
+                "median_max_users": float(group["max_sustainable_users"].median()),
+            })
+        return sorted(summary, key=lambda s: s["median_max_rps"], reverse=True)
+
+    def _save_latency_histograms(self, histograms: HistogramSet, test_name: str, test_dir: Path,
+                                 model: Optional[str], app_num: Optional[int]) -> str:
+        """Persist a run's histograms in its report directory and as the app's latest."""
+        payload = {
+            "test_name": test_name,
+            "encoding": "LHG1/base64",
+            "histograms": histograms.to_dict(),
+        }
+        run_file = test_dir / RUN_HISTOGRAM_FILE_NAME
+        try:
+            with open(run_file, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            if model is not None and app_num is not None:
+                self.results_manager.save_results(
+                    model=model, app_num=app_num, results=payload,
+                    file_name=HISTOGRAM_FILE_NAME, maintain_legacy=False
+                )
+            logger.info(f"Saved latency histograms for {len(payload['histograms'])} series to {run_file}")
+            return str(run_file)
+        except Exception as e:
+            logger.error(f"Failed to save latency histograms for '{test_name}': {e}")
+            return ""
+
+    def load_latency_histograms(self, model: Optional[str] = None, app_num: Optional[int] = None,
+                                report_ids: Optional[List[str]] = None) -> Optional[HistogramSet]:
+        """
+        Load latency histograms for the given runs merged into one set, or the
+        app's latest run when no report ids are given.
+        
+        Args:
+            model: Model name (for the latest run)
+            app_num: Application number (for the latest run)
+            report_ids: Test directory names under performance_reports to merge
+            
+        Returns:
+            HistogramSet or None if nothing was found
+        """
+        payloads = []
+        if report_ids:
+            for report_id in report_ids:
+                run_file = self.output_dir / "performance_reports" / Path(report_id).name / RUN_HISTOGRAM_FILE_NAME
+                if run_file.is_file():
+                    with open(run_file, "r", encoding="utf-8") as f:
+                        payloads.append(json.load(f))
+                else:
+                    logger.warning(f"No latency histograms stored for report {report_id}")
+        elif model is not None and app_num is not None:
+            data = self.results_manager.load_results(model=model, app_num=app_num, file_name=HISTOGRAM_FILE_NAME)
+            if data:
+                payloads.append(data)
+        if not payloads:
+            return None
+        return HistogramSet.merged(HistogramSet.from_dict(p.get("histograms", {})) for p in payloads)
+
+    @staticmethod
+    def resolve_worker_count(workers: Optional[int]) -> int:
+        """
+        Number of local worker processes to start.
+        
+        0 keeps the single-process local runner; a negative value sizes the
+        pool to the CPU count, leaving one core for the master.
+        """
+        if not workers:
+            return 0
+        cpu_count = os.cpu_count() or 1
+        if workers < 0:
+            workers = cpu_count - 1
+        return max(0, min(workers, MAX_LOCAL_WORKERS))
+
+    @staticmethod
+    def _find_free_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((MASTER_BIND_HOST, 0))
+            return sock.getsockname()[1]
+
+    def _start_local_workers(self, spec_path: str, master_port: int, count: int,
+                             test_dir: Path, cpu_affinity: Optional[Set[int]] = None) -> List[subprocess.Popen]:
+        """Launch `count` headless Locust worker processes, running the endpoint spec, connected to the local master."""
+        preexec_fn = None
+        if cpu_affinity and hasattr(os, "sched_setaffinity"):
+            preexec_fn = lambda: os.sched_setaffinity(0, cpu_affinity)
+        processes = []
+        for i in range(count):
+            cmd = [
+                sys.executable, "-m", "locust", "-f", str(SPEC_LOCUSTFILE_PATH), "--worker",
+                "--master-host", MASTER_BIND_HOST, "--master-port", str(master_port)
+            ]
+            log_file = open(test_dir / f"locust_worker_{i}.log", "w", encoding='utf-8')
+            try:
+                processes.append(subprocess.Popen(
+                    cmd, stdout=log_file, stderr=subprocess.STDOUT, preexec_fn=preexec_fn,
+                    env={**os.environ, ENDPOINT_SPEC_ENV: spec_path}
+                ))
+            finally:
+                log_file.close()
+        logger.info(f"Started {count} Locust worker processes for master on port {master_port}")
+        return processes
+
+    def _wait_for_workers(self, expected: int) -> int:
+        """Wait (cooperatively) until workers connect; returns how many did."""
+        deadline = time.monotonic() + WORKER_CONNECT_TIMEOUT
+        while self.runner.worker_count < expected and time.monotonic() < deadline:
+            gevent.sleep(0.5)
+        connected = self.runner.worker_count
+        if connected < expected:
+            logger.warning(f"Only {connected}/{expected} Locust workers connected within {WORKER_CONNECT_TIMEOUT}s")
+        else:
+            logger.info(f"All {expected} Locust workers connected")
+        return connected
+
+    @staticmethod
+    def _stop_local_workers(processes: List[subprocess.Popen]) -> None:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Locust worker {process.pid} did not exit; killing it")
+                process.kill()
+
     def run_test_library(
         self,
         test_name: str,
@@ -535,7 +997,11 @@ class LocustPerformanceTester:
         on_stop_callback: Optional[Callable[[Environment], None]] = None,
         model: Optional[str] = None,
         app_num: Optional[int] = None,
-        force_rerun: bool = False
+        force_rerun: bool = False,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress_interval: float = 1.0,
+        workers: int = 0,
+        cpu_affinity: Optional[Set[int]] = None
     ) -> PerformanceResult:
         """
         Run a Locust performance test using the library API.
@@ -548,12 +1014,17 @@ class LocustPerformanceTester:
             user_count: Number of users to simulate
             spawn_rate: Rate at which to spawn users
             run_time: Test duration in seconds
-            generate_graphs: Whether to generate performance graphs
+            generate_graphs: Whether to store the run's time series for charts
             on_start_callback: Optional callback when test starts
             on_stop_callback: Optional callback when test ends
             model: Optional model name for result organization
             app_num: Optional app number for result organization
             force_rerun: Whether to force rerun the test instead of using cached results
+            progress_callback: Optional callable receiving live aggregate stats while the test runs
+            progress_interval: Seconds between progress_callback invocations
+            workers: Local worker processes to generate load from (0 runs in-process,
+                negative sizes to the CPU count); requires endpoints
+            cpu_affinity: CPUs the worker processes are pinned to (Linux only)
             
         Returns:
             PerformanceResult object with test results
@@ -574,14 +1045,41 @@ class LocustPerformanceTester:
         if user_class is None:
             raise ValueError("Either user_class or endpoints must be provided")
 
+        worker_count = self.resolve_worker_count(workers)
+        if worker_count and not endpoints:
+            # Workers load a generated locustfile, which needs the endpoint configurations
+            logger.warning("Distributed mode requires endpoints; falling back to a local runner")
+            worker_count = 0
+
         self.environment = None
         self.runner = None
         self.environment = Environment(user_classes=[user_class], host=host, catch_exceptions=True)
-        self.environment.create_local_runner()
+        master_port = None
+        if worker_count:
+            master_port = self._find_free_port()
+            self.environment.create_master_runner(master_bind_host=MASTER_BIND_HOST, master_bind_port=master_port)
+        else:
+            self.environment.create_local_runner()
         if not self.environment.runner:
             raise RuntimeError("Failed to create Locust runner.")
         self.runner = self.environment.runner
         self.environment.custom_data = {}
+        histograms = attach_histogram_capture(self.environment)
+
+        worker_processes: List[subprocess.Popen] = []
+        if worker_count:
+            try:
+                spec_path = self._write_endpoint_spec(host, endpoints, test_dir)
+                worker_processes = self._start_local_workers(
+                    spec_path, master_port, worker_count, test_dir, cpu_affinity
+                )
+                worker_count = self._wait_for_workers(worker_count)
+                if not worker_count:
+                    raise RuntimeError(f"No Locust workers connected within {WORKER_CONNECT_TIMEOUT}s")
+            except Exception:
+                self.runner.quit()
+                self._stop_local_workers(worker_processes)
+                raise
 
         @events.test_start.add_listener
         def on_test_start(environment: Environment, **kwargs):
@@ -606,10 +1104,51 @@ class LocustPerformanceTester:
         logger.info(f"Locust runner started. Waiting for {run_time} seconds...")
 
         stopper_greenlet = None
+        reporter_greenlet = None
+        history_greenlet = None
         try:
+            def history_sampler():
+                # Library runs have no web UI/CSV writer to fill environment.stats.history
+                while True:
+                    gevent.sleep(HISTORY_SAMPLE_SECONDS)
+                    if self.runner and self.runner.state not in ("ready", "stopped"):
+                        update_stats_history(self.runner)
+            if update_stats_history is not None:
+                history_greenlet = gevent.spawn(history_sampler)
+            else:
+                logger.warning("This Locust version has no update_stats_history; no time series will be stored for this run")
+
+            def reporter():
+                started = time.monotonic()
+                while True:
+                    gevent.sleep(progress_interval)
+                    if not self.environment or not self.runner:
+                        return
+                    total = self.environment.stats.total
+                    elapsed = time.monotonic() - started
+                    try:
+                        progress_callback({
+                            "test_name": full_test_name,
+                            "elapsed_seconds": round(elapsed, 1),
+                            "progress": min(99, int(elapsed / run_time * 100)) if run_time else None,
+                            "user_count": self.runner.user_count,
+                            "num_requests": total.num_requests,
+                            "num_failures": total.num_failures,
+                            "current_rps": round(total.current_rps, 2),
+                            "median_response_time": total.median_response_time,
+                            "p95_response_time": total.get_response_time_percentile(0.95),
+                        })
+                    except Exception as cb_err:
+                        logger.debug(f"Error in progress_callback: {cb_err}")
+            if progress_callback:
+                reporter_greenlet = gevent.spawn(reporter)
+            
             def stopper():
                 gevent.sleep(run_time)
                 logger.info(f"Run time ({run_time}s) elapsed. Stopping runner for test '{full_test_name}'...")
+                if self.runner and isinstance(self.runner, MasterRunner):
+                    self.runner.stop()
+                    gevent.sleep(WORKER_FINAL_REPORT_SECONDS)
                 if self.runner:
                     self.runner.quit()
                     logger.info("Runner quit signal sent.")
@@ -629,6 +1168,12 @@ class LocustPerformanceTester:
             if stopper_greenlet and not stopper_greenlet.dead:
                 stopper_greenlet.kill(block=False)
                 logger.debug("Stopper greenlet killed.")
+            if reporter_greenlet and not reporter_greenlet.dead:
+                reporter_greenlet.kill(block=False)
+            if history_greenlet and not history_greenlet.dead:
+                history_greenlet.kill(block=False)
+            if worker_processes:
+                self._stop_local_workers(worker_processes)
 
         end_time = datetime.now()
         logger.info(f"Test '{full_test_name}' finished execution at {end_time.isoformat()}")
@@ -651,14 +1196,20 @@ class LocustPerformanceTester:
         )
         result.test_name = full_test_name
         result.host = host
+        result.workers = worker_count
+        result.histogram_file = self._save_latency_histograms(histograms, full_test_name, test_dir, model, app_num)
 
         if generate_graphs:
-            try:
-                graph_infos = self._generate_graphs_from_history(self.environment.stats.history, test_dir)
-                result.graph_urls = graph_infos
-            except Exception as graph_err:
-                logger.error(f"Failed to generate graphs for test '{full_test_name}': {graph_err}", exc_info=True)
-                result.graph_urls = []
+            # Only the time series is stored here; chart PNGs are rendered on first view
+            timeseries_file = self._save_timeseries_from_history(self.environment.stats.history, test_dir)
+            if timeseries_file:
+                result.timeseries_file = str(timeseries_file)
+                result.graph_urls = self.chart_links(test_dir.name)
+        if model is not None and app_num is not None:
+            result.model, result.app_num = model, app_num
+        if endpoints:
+            result.profile = self.load_profile_key(endpoints, user_count, spawn_rate, run_time, worker_count)
+        self._record_run(result, test_dir)
 
         # Save results using JsonResultsManager if model and app_num are provided
         if model is not None and app_num is not None:
@@ -670,49 +1221,11 @@ class LocustPerformanceTester:
         logger.info(f"Returning results for test {full_test_name}")
         return result
 
-    def _create_temp_locustfile(self, host: str, endpoints: List[Dict[str, Any]], test_dir: Path) -> str:
-        content = f"""# Auto-generated Locustfile for {test_dir.name}
-from locust import HttpUser, task, between
-import json
-
-class DynamicHttpUser(HttpUser):
-    host = "{host}"
-    wait_time = between(1, 3)
-    print(f"DynamicHttpUser targeting host: {{host}}")
-"""
-        for i, endpoint in enumerate(endpoints):
-            path = endpoint['path']
-            method = endpoint.get('method', 'GET').lower()
-            weight = endpoint.get('weight', 1)
-            ep_name_part = re.sub(r"[^a-zA-Z0-9_]", "_", path.strip('/')).lower()
-            if not ep_name_part: ep_name_part = "root"
-            func_name = f"task_{method}_{ep_name_part}_{i}"
-            request_name = endpoint.get('request_name', path)
-            params_list = []
-            params_list.append(f'name="{request_name}"')
-            params_list.append('catch_response=True')
-            if 'params' in endpoint: params_list.append(f"params={endpoint['params']!r}")
-            if 'data' in endpoint: params_list.append(f"data={endpoint['data']!r}")
-            if 'json' in endpoint: params_list.append(f"json={endpoint['json']!r}")
-            if 'headers' in endpoint: params_list.append(f"headers={endpoint['headers']!r}")
-            param_str = ", ".join(params_list)
-            task_code = f"""
-    @task({weight})
-    def {func_name}(self):
-        with self.client.{method}("{path}", {param_str}) as response:
-            if not response.ok:
-                response.failure(f"HTTP {{response.status_code}}")
-"""
-            content += task_code
-        locustfile_path = test_dir / f"locustfile_{test_dir.name}.py"
-        try:
-            with open(locustfile_path, "w", encoding='utf-8') as f:
-                f.write(content)
-            logger.info(f"Created temporary Locustfile for CLI run at {locustfile_path}")
-            return str(locustfile_path)
-        except Exception as e:
-            logger.error(f"Failed to write temporary locustfile {locustfile_path}: {e}", exc_info=True)
-            raise
+    def _write_endpoint_spec(self, host: str, endpoints: List[Dict[str, Any]], test_dir: Path) -> str:
+        """Store the run's endpoints as the JSON spec the static locustfile loads; kept with the run's artifacts."""
+        spec_path = write_endpoint_spec(host, endpoints, test_dir / ENDPOINT_SPEC_FILE_NAME)
+        logger.info(f"Wrote endpoint spec for {len(endpoints)} endpoints to {spec_path}")
+        return spec_path
 
     def _parse_csv_results(
         self,
@@ -733,67 +1246,70 @@ class DynamicHttpUser(HttpUser):
             stats_path = Path(stats_file)
             if stats_path.exists() and stats_path.stat().st_size > 0:
                 df_stats = pd.read_csv(stats_file)
-                num_cols = ['Request Count', 'Failure Count', 'Median Response Time', 'Average Response Time', 'Min Response Time', 'Max Response Time', 'Average Content Size', 'Requests/s', 'Failures/s']
                 percentile_cols = [col for col in df_stats.columns if '%' in col]
-                num_cols.extend(percentile_cols)
-                for col in num_cols:
-                    if col in df_stats.columns:
-                        df_stats[col] = pd.to_numeric(df_stats[col], errors='coerce').fillna(0)
-                    else:
-                        logger.warning(f"Expected numeric column '{col}' not found in {stats_file}")
-
-                for _, row in df_stats.iterrows():
-                    is_aggregated = row['Name'] == 'Aggregated'
-                    percentiles_dict = {}
-                    p95_val, p99_val = 0.0, 0.0
-                    for p_col in percentile_cols:
-                        if p_col in row:
-                            p_key = p_col.replace('%', '').strip()
-                            p_val = row.get(p_col, 0.0)
-                            percentiles_dict[p_key] = p_val
-                            if '95' in p_key: p95_val = p_val
-                            if '99' in p_key: p99_val = p_val
-                    if is_aggregated:
-                        total_requests = int(row.get('Request Count', 0))
-                        total_failures = int(row.get('Failure Count', 0))
-                        avg_response_time = row.get('Average Response Time', 0.0)
-                        median_response_time = row.get('Median Response Time', 0.0)
-                        requests_per_sec = row.get('Requests/s', 0.0)
-                        percentile_95 = p95_val
-                        percentile_99 = p99_val
-                    else:
-                        endpoint_stats = EndpointStats(
-                            name=row.get('Name', 'Unknown Endpoint'),
-                            method=row.get('Type', 'Unknown Method'),
-                            num_requests=int(row.get('Request Count', 0)),
-                            num_failures=int(row.get('Failure Count', 0)),
-                            median_response_time=row.get('Median Response Time', 0.0),
-                            avg_response_time=row.get('Average Response Time', 0.0),
-                            min_response_time=row.get('Min Response Time', 0.0),
-                            max_response_time=row.get('Max Response Time', 0.0),
-                            avg_content_length=row.get('Average Content Size', 0.0),
-                            current_rps=row.get('Requests/s', 0.0),
-                            current_fail_per_sec=row.get('Failures/s', 0.0),
-                            percentiles=percentiles_dict
-                        )
-                        endpoints.append(endpoint_stats)
+                num_cols = [col for col in STATS_NUMERIC_COLUMNS if col in df_stats.columns] + percentile_cols
+                missing = [col for col in STATS_NUMERIC_COLUMNS if col not in df_stats.columns]
+                if missing:
+                    logger.warning(f"Expected numeric columns {missing} not found in {stats_file}")
+                # One columnar conversion; missing columns read as zeros
+                numeric = df_stats[num_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+                numeric = numeric.reindex(columns=STATS_NUMERIC_COLUMNS + percentile_cols, fill_value=0)
+                names = df_stats['Name'].fillna('Unknown Endpoint').astype(str).to_numpy() if 'Name' in df_stats else None
+                if names is None:
+                    logger.error(f"Stats CSV {stats_file} has no 'Name' column. Cannot parse results.")
+                    return None
+                methods = df_stats['Type'].fillna('Unknown Method').astype(str).to_numpy() if 'Type' in df_stats else ['Unknown Method'] * len(names)
+                is_aggregated = names == 'Aggregated'
+                percentile_keys = [col.replace('%', '').strip() for col in percentile_cols]
+                percentile_values = numeric[percentile_cols].to_numpy(dtype=float)
+                p95_idx = percentile_keys.index('95') if '95' in percentile_keys else None
+                p99_idx = percentile_keys.index('99') if '99' in percentile_keys else None
+                columns = {col: numeric[col].to_numpy() for col in STATS_NUMERIC_COLUMNS}
+
+                aggregated_rows = is_aggregated.nonzero()[0]
+                if len(aggregated_rows):
+                    i = aggregated_rows[0]
+                    total_requests = int(columns['Request Count'][i])
+                    total_failures = int(columns['Failure Count'][i])
+                    avg_response_time = float(columns['Average Response Time'][i])
+                    median_response_time = float(columns['Median Response Time'][i])
+                    requests_per_sec = float(columns['Requests/s'][i])
+                    percentile_95 = float(percentile_values[i, p95_idx]) if p95_idx is not None else 0.0
+                    percentile_99 = float(percentile_values[i, p99_idx]) if p99_idx is not None else 0.0
+
+                endpoint_rows = (~is_aggregated).nonzero()[0]
+                endpoints = [
+                    EndpointStats(
+                        name=names[i],
+                        method=methods[i],
+                        num_requests=int(columns['Request Count'][i]),
+                        num_failures=int(columns['Failure Count'][i]),
+                        median_response_time=float(columns['Median Response Time'][i]),
+                        avg_response_time=float(columns['Average Response Time'][i]),
+                        min_response_time=float(columns['Min Response Time'][i]),
+                        max_response_time=float(columns['Max Response Time'][i]),
+                        avg_content_length=float(columns['Average Content Size'][i]),
+                        current_rps=float(columns['Requests/s'][i]),
+                        current_fail_per_sec=float(columns['Failures/s'][i]),
+                        percentiles=dict(zip(percentile_keys, percentile_values[i].tolist()))
+                    )
+                    for i in endpoint_rows
+                ]
             else:
                 logger.error(f"Stats CSV file not found or is empty: {stats_file}. Cannot parse results.")
                 return None
 
             failures_path = Path(failures_file)
             if failures_path.exists() and failures_path.stat().st_size > 0:
-                df_failures = pd.read_csv(failures_file)
-                df_failures['Occurrences'] = pd.to_numeric(df_failures['Occurrences'], errors='coerce').fillna(0).astype(int)
-                for _, row in df_failures.iterrows():
-                    error_stats = ErrorStats(
-                        method=row.get('Method', 'N/A'),
-                        endpoint=row.get('Name', 'N/A'),
-                        error_type=row.get('Error', 'Unknown Error'),
-                        count=int(row.get('Occurrences', 0)),
-                        description=row.get('Error', '')
-                    )
-                    errors.append(error_stats)
+                df_failures = pd.read_csv(failures_file).reindex(columns=['Method', 'Name', 'Error', 'Occurrences'])
+                occurrences = pd.to_numeric(df_failures['Occurrences'], errors='coerce').fillna(0).astype(int).to_numpy()
+                failure_methods = df_failures['Method'].fillna('N/A').astype(str).to_numpy()
+                failure_names = df_failures['Name'].fillna('N/A').astype(str).to_numpy()
+                failure_errors = df_failures['Error'].fillna('Unknown Error').astype(str).to_numpy()
+                errors = [
+                    ErrorStats(error_type=error, count=int(count), endpoint=name, method=method, description=error)
+                    for method, name, error, count in zip(failure_methods, failure_names, failure_errors, occurrences)
+                ]
             else:
                 logger.warning(f"Failures CSV file not found or is empty: {failures_file}")
 
@@ -823,172 +1339,213 @@ class DynamicHttpUser(HttpUser):
             logger.exception(f"Unexpected error parsing CSV results: {e}")
             return None
 
-    def _generate_graphs_from_history(self, history: List[StatsEntry], test_dir: Path) -> List[GraphInfo]:
-        graph_infos: List[GraphInfo] = []
+    @staticmethod
+    def _normalize_history(df: pd.DataFrame, time_column: str, time_unit: Optional[str] = None) -> pd.DataFrame:
+        """
+        Map Locust history (in-memory records or stats_history.csv) onto one set
+        of columns: time_dt plus the HISTORY_SERIES names, converted once.
+        """
+        normalized = pd.DataFrame({
+            "time_dt": pd.to_datetime(df[time_column], unit=time_unit, errors='coerce')
+        })
+        for series, candidates in HISTORY_SERIES.items():
+            column = next((c for c in candidates if c in df.columns), None)
+            if column is not None:
+                normalized[series] = pd.to_numeric(df[column], errors='coerce').to_numpy()
+        return normalized.dropna(subset=['time_dt'])
+
+    def _history_frame(self, history: List[Any]) -> pd.DataFrame:
+        """Columnar frame from Environment.stats.history (dicts or StatsEntry-like objects)."""
+        records = history if isinstance(history[0], dict) else [h.to_dict() for h in history]
+        df = pd.DataFrame.from_records(records)
+        if df.empty or 'time' not in df.columns:
+            return pd.DataFrame()
+        # Locust 2.x stores each series value as a [timestamp, value] pair
+        for column in df.columns:
+            if isinstance(df[column].iloc[0], (list, tuple)):
+                df[column] = df[column].str[1]
+        return self._normalize_history(df, 'time')
+
+    def _history_frame_from_csv(self, history_file: Path) -> pd.DataFrame:
+        """Columnar frame of the aggregated rows of a stats_history.csv, reading only charted columns."""
+        header = pd.read_csv(history_file, nrows=0).columns
+        wanted = {'Timestamp', 'Name'} | {c for candidates in HISTORY_SERIES.values() for c in candidates}
+        df = pd.read_csv(history_file, usecols=[c for c in header if c in wanted])
+        if df.empty or 'Timestamp' not in df.columns:
+            return pd.DataFrame()
+        if 'Name' in df.columns:
+            # --csv-full-history also writes one row per endpoint per interval
+            df = df[df['Name'] == 'Aggregated']
+        return self._normalize_history(df, 'Timestamp', time_unit='s')
+
+    def _save_timeseries(self, df: pd.DataFrame, test_dir: Path, source: str) -> Optional[Path]:
+        """
+        Store a normalized history frame as the run's compact time-series JSON.
+
+        Timestamps become second offsets from the first sample and gaps are
+        forward-filled, so both the UI and the lazy PNG renderer can plot the
+        file as-is.
+        """
+        times = df['time_dt']
+        start = times.iloc[0]
+        offsets = ((times - start).dt.total_seconds()).round(1).tolist()
+        series = {}
+        for chart in CHARTS:
+            for line in chart["series"]:
+                key = line["key"]
+                if key in df.columns:
+                    values = df[key].ffill().round(3)
+                    series[key] = [None if pd.isna(v) else float(v) for v in values]
+        payload = {
+            "version": TIMESERIES_VERSION,
+            "source": source,
+            "start": start.to_pydatetime().isoformat(),
+            "t": offsets,
+            "series": series,
+            "charts": [chart for chart in CHARTS if chart["series"][0]["key"] in series],
+        }
+        timeseries_file = test_dir / TIMESERIES_FILE_NAME
+        with open(timeseries_file, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        logger.info(f"Saved {len(offsets)} time-series samples for {len(series)} series to {timeseries_file}")
+        return timeseries_file
+
+    def _save_timeseries_from_history(self, history: List[StatsEntry], test_dir: Path) -> Optional[Path]:
         if not history:
-            logger.warning("No history data provided for graph generation.")
-            return graph_infos
+            logger.warning("No history data provided for time-series storage.")
+            return None
         try:
-            history_data = [h.to_dict() for h in history]
-            df = pd.DataFrame(history_data)
-            if df.empty or 'time' not in df.columns:
-                logger.warning("History DataFrame is empty or missing 'time' column after conversion.")
-                return graph_infos
-            try:
-                df['time_dt'] = pd.to_datetime(df['time'])
-            except Exception as time_err:
-                logger.error(f"Could not parse history time column: {time_err}. Using index.", exc_info=True)
-                df['time_dt'] = pd.to_datetime(df.index, unit='s', origin=pd.Timestamp(history[0].time) if history else 'unix')
-
-            plt.style.use('seaborn-v0_8-whitegrid')
-            if 'current_rps' in df.columns and 'current_fail_per_sec' in df.columns:
-                plt.figure(figsize=(12, 6))
-                plt.plot(df['time_dt'], df['current_rps'], label='Requests/s', color='tab:blue', linewidth=1.5)
-                plt.plot(df['time_dt'], df['current_fail_per_sec'], label='Failures/s', color='tab:red', linestyle='--', linewidth=1)
-                plt.title('Requests and Failures Per Second Over Time')
-                plt.xlabel('Time')
-                plt.ylabel('Rate (per second)')
-                plt.legend()
-                plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-                plt.tight_layout()
-                rps_path = test_dir / 'requests_failures_per_second.png'
-                plt.savefig(rps_path)
-                plt.close()
-                graph_url = f"{self.static_url_path}/{rps_path.relative_to(self.output_dir).as_posix()}"
-                graph_infos.append({"name": "RPS & Failures/s", "url": graph_url})
-            else:
-                logger.warning("Skipping RPS graph: 'current_rps' or 'current_fail_per_sec' column missing.")
-
-            required_rt_cols = ['median_response_time', 'avg_response_time']
-            if all(col in df.columns for col in required_rt_cols):
-                plt.figure(figsize=(12, 6))
-                plt.plot(df['time_dt'], df['avg_response_time'], label='Average RT', color='tab:green', linewidth=1.5)
-                plt.plot(df['time_dt'], df['median_response_time'], label='Median RT (P50)', color='tab:orange', linestyle='-', linewidth=1.5)
-                p95_col_name = next((col for col in df.columns if '95' in col and isinstance(df[col].iloc[0], (int, float))), None)
-                if p95_col_name:
-                    plt.plot(df['time_dt'], df[p95_col_name], label='95th Percentile RT', color='tab:purple', linestyle=':', linewidth=1.5)
-                else:
-                    logger.warning("95th percentile column not found or not numeric in history data.")
-                plt.title('Response Times Over Time')
-                plt.xlabel('Time')
-                plt.ylabel('Response Time (ms)')
-                plt.legend()
-                plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-                plt.tight_layout()
-                rt_path = test_dir / 'response_times.png'
-                plt.savefig(rt_path)
-                plt.close()
-                graph_url = f"{self.static_url_path}/{rt_path.relative_to(self.output_dir).as_posix()}"
-                graph_infos.append({"name": "Response Times", "url": graph_url})
-            else:
-                logger.warning("Skipping Response Time graph: Required columns missing.")
-
-            if 'user_count' in df.columns:
-                plt.figure(figsize=(12, 6))
-                plt.plot(df['time_dt'], df['user_count'], label='Active Users', color='tab:cyan', linewidth=1.5)
-                plt.title('Number of Active Users Over Time')
-                plt.xlabel('Time')
-                plt.ylabel('Users')
-                plt.legend()
-                plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-                plt.tight_layout()
-                users_path = test_dir / 'active_users.png'
-                plt.savefig(users_path)
-                plt.close()
-                graph_url = f"{self.static_url_path}/{users_path.relative_to(self.output_dir).as_posix()}"
-                graph_infos.append({"name": "Active Users", "url": graph_url})
-            else:
-                logger.warning("Skipping Active Users graph: 'user_count' column missing.")
-            logger.info(f"Generated {len(graph_infos)} performance graphs in {test_dir}")
-            return graph_infos
-        except ImportError:
-            logger.warning("Matplotlib or Pandas not installed. Skipping graph generation from history.")
-            return []
+            df = self._history_frame(history)
+            if df.empty:
+                logger.warning("History data is empty or missing its time column after conversion.")
+                return None
+            return self._save_timeseries(df, test_dir, source="history")
         except Exception as e:
-            logger.error(f"Error generating graphs from history: {e}", exc_info=True)
-            return []
+            logger.error(f"Error saving time series from history: {e}", exc_info=True)
+            return None
 
-    def _generate_graphs_from_csv(self, history_csv_path: str, test_dir: Path) -> List[GraphInfo]:
-        graph_infos: List[GraphInfo] = []
+    def _save_timeseries_from_csv(self, history_csv_path: str, test_dir: Path) -> Optional[Path]:
         history_file = Path(history_csv_path)
         if not history_file.exists() or history_file.stat().st_size == 0:
-            logger.warning(f"History CSV file not found or empty: {history_csv_path}. Cannot generate graphs.")
-            return graph_infos
+            logger.warning(f"History CSV file not found or empty: {history_csv_path}. Cannot store time series.")
+            return None
         try:
-            df = pd.read_csv(history_file)
-            if df.empty or 'Timestamp' not in df.columns:
-                logger.warning(f"History CSV {history_csv_path} is empty or missing 'Timestamp' column.")
-                return graph_infos
-            try:
-                df['time_dt'] = pd.to_datetime(df['Timestamp'], unit='s', errors='coerce')
-                df.dropna(subset=['time_dt'], inplace=True)
-                if df.empty:
-                    logger.warning("No valid timestamps found in history CSV after conversion.")
-                    return graph_infos
-            except Exception as time_err:
-                logger.error(f"Could not parse history timestamp column: {time_err}. Using index.", exc_info=True)
-                df['time_dt'] = df.index
-            plt.style.use('seaborn-v0_8-whitegrid')
-            if 'Requests/s' in df.columns and 'Failures/s' in df.columns:
-                plt.figure(figsize=(12, 6))
-                plt.plot(df['time_dt'], df['Requests/s'], label='RPS', color='tab:blue', linewidth=1.5)
-                plt.plot(df['time_dt'], df['Failures/s'], label='Failures/s', color='tab:red', linestyle='--', linewidth=1)
-                plt.title('Requests and Failures Per Second Over Time (from CSV)')
-                plt.xlabel('Time')
-                plt.ylabel('Rate (per second)')
-                plt.legend()
-                plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-                plt.tight_layout()
-                rps_path = test_dir / 'requests_failures_per_second_csv.png'
-                plt.savefig(rps_path)
-                plt.close()
-                graph_url = f"{self.static_url_path}/{rps_path.relative_to(self.output_dir).as_posix()}"
-                graph_infos.append({"name": "RPS & Failures/s (CSV)", "url": graph_url})
-            rt_cols = ['Average Response Time', 'Median Response Time']
-            if all(col in df.columns for col in rt_cols):
-                plt.figure(figsize=(12, 6))
-                plt.plot(df['time_dt'], df['Average Response Time'], label='Average RT', color='tab:green', linewidth=1.5)
-                plt.plot(df['time_dt'], df['Median Response Time'], label='Median RT (P50)', color='tab:orange', linewidth=1.5)
-                p95_col = next((col for col in df.columns if '95%' in col), None)
-                if p95_col:
-                    df[p95_col] = pd.to_numeric(df[p95_col], errors='coerce')
-                    plt.plot(df['time_dt'], df[p95_col].fillna(method='ffill'), label='95th Percentile RT', color='tab:purple', linestyle=':', linewidth=1.5)
-                plt.title('Response Times Over Time (from CSV)')
-                plt.xlabel('Time')
-                plt.ylabel('Response Time (ms)')
-                plt.legend()
-                plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-                plt.tight_layout()
-                rt_path = test_dir / 'response_times_csv.png'
-                plt.savefig(rt_path)
-                plt.close()
-                graph_url = f"{self.static_url_path}/{rt_path.relative_to(self.output_dir).as_posix()}"
-                graph_infos.append({"name": "Response Times (CSV)", "url": graph_url})
-            if 'User Count' in df.columns:
-                plt.figure(figsize=(12, 6))
-                plt.plot(df['time_dt'], df['User Count'], label='Active Users', color='tab:cyan', linewidth=1.5)
-                plt.title('Number of Active Users Over Time (from CSV)')
-                plt.xlabel('Time')
-                plt.ylabel('Users')
-                plt.legend()
-                plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-                plt.tight_layout()
-                users_path = test_dir / 'active_users_csv.png'
-                plt.savefig(users_path)
-                plt.close()
-                graph_url = f"{self.static_url_path}/{users_path.relative_to(self.output_dir).as_posix()}"
-                graph_infos.append({"name": "Active Users (CSV)", "url": graph_url})
-            logger.info(f"Generated {len(graph_infos)} performance graphs from CSV in {test_dir}")
-            return graph_infos
-        except ImportError:
-            logger.warning("Matplotlib or Pandas not installed. Skipping graph generation from CSV.")
-            return []
+            df = self._history_frame_from_csv(history_file)
+            if df.empty:
+                logger.warning(f"History CSV {history_csv_path} has no valid timestamped rows.")
+                return None
+            return self._save_timeseries(df, test_dir, source="csv")
         except pd.errors.EmptyDataError:
             logger.warning(f"History CSV file was empty: {history_csv_path}")
-            return []
+            return None
         except Exception as e:
-            logger.error(f"Error generating graphs from CSV '{history_csv_path}': {e}", exc_info=True)
+            logger.error(f"Error saving time series from CSV '{history_csv_path}': {e}", exc_info=True)
+            return None
+
+    def _run_dir(self, report_id: str) -> Path:
+        return self.output_dir / "performance_reports" / Path(report_id).name
+
+    def load_timeseries(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Load a run's stored time series, or None if the run has none."""
+        timeseries_file = self._run_dir(report_id) / TIMESERIES_FILE_NAME
+        if not timeseries_file.is_file():
+            return None
+        with open(timeseries_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def chart_links(self, report_id: str, timeseries: Optional[Dict[str, Any]] = None) -> List[GraphInfo]:
+        """Lazy PNG URLs for the charts a run's time series can draw."""
+        timeseries = timeseries if timeseries is not None else self.load_timeseries(report_id)
+        if not timeseries:
             return []
+        label_suffix = " (CSV)" if timeseries.get("source") == "csv" else ""
+        run_id = Path(report_id).name
+        return [
+            {"name": chart["name"] + label_suffix, "url": f"{self.chart_url_path}/{run_id}/{chart['id']}.png"}
+            for chart in timeseries.get("charts", [])
+        ]
+
+    def render_chart(self, report_id: str, chart_id: str, timeout: float = CHART_RENDER_TIMEOUT) -> Optional[Path]:
+        """
+        Return the cached PNG for one of a run's charts, rendering it first if needed.
+        
+        Rendering happens on a single background worker (pyplot is not thread-safe)
+        and concurrent requests for the same chart share one job. The cache lives
+        in the run's charts/ directory and is refreshed if the time series changes.
+        
+        Args:
+            report_id: Test directory name under performance_reports
+            chart_id: One of the CHARTS ids
+            timeout: Seconds to wait for a pending render
+            
+        Returns:
+            Path to the PNG, or None if the run or chart does not exist
+            
+        Raises:
+            TimeoutError: The render is still in progress
+        """
+        if chart_id not in CHART_IDS:
+            return None
+        run_dir = self._run_dir(report_id)
+        timeseries_file = run_dir / TIMESERIES_FILE_NAME
+        if not timeseries_file.is_file():
+            return None
+        png_path = run_dir / CHARTS_DIR_NAME / f"{chart_id}.png"
+        if png_path.is_file() and png_path.stat().st_mtime >= timeseries_file.stat().st_mtime:
+            return png_path
+
+        key = (run_dir.name, chart_id)
+        with self._chart_lock:
+            future = self._chart_jobs.get(key)
+            if future is None:
+                future = self._chart_executor.submit(self._render_chart_job, key, timeseries_file, chart_id, png_path)
+                self._chart_jobs[key] = future
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"Chart {chart_id} for {run_dir.name} is still rendering")
+
+    def _render_chart_job(self, key: Tuple[str, str], timeseries_file: Path, chart_id: str,
+                          png_path: Path) -> Optional[Path]:
+        try:
+            return self._render_chart_png(timeseries_file, chart_id, png_path)
+        finally:
+            with self._chart_lock:
+                self._chart_jobs.pop(key, None)
+
+    @staticmethod
+    def _render_chart_png(timeseries_file: Path, chart_id: str, png_path: Path) -> Optional[Path]:
+        with open(timeseries_file, "r", encoding="utf-8") as f:
+            timeseries = json.load(f)
+        chart = next((c for c in timeseries.get("charts", []) if c["id"] == chart_id), None)
+        if chart is None:
+            return None
+        series = timeseries.get("series", {})
+        start = datetime.fromisoformat(timeseries["start"])
+        times = [start + timedelta(seconds=offset) for offset in timeseries.get("t", [])]
+        label_suffix = " (from CSV)" if timeseries.get("source") == "csv" else ""
+
+        plt.style.use('seaborn-v0_8-whitegrid')
+        fig = plt.figure(figsize=(12, 6))
+        try:
+            for line in chart["series"]:
+                if line["key"] in series:
+                    values = [float('nan') if v is None else v for v in series[line["key"]]]
+                    plt.plot(times, values, label=line["label"], **line["style"])
+            plt.title(chart["title"] + label_suffix)
+            plt.xlabel('Time')
+            plt.ylabel(chart["ylabel"])
+            plt.legend()
+            plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+            plt.tight_layout()
+            png_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = png_path.with_suffix(".png.tmp")
+            plt.savefig(tmp_path, format="png")
+            os.replace(tmp_path, png_path)
+        finally:
+            plt.close(fig)
+        logger.info(f"Rendered chart {png_path}")
+        return png_path
 
     def get_performance_summary(self, result: PerformanceResult) -> Dict[str, Any]:
         """
@@ -1001,7 +1558,7 @@ class DynamicHttpUser(HttpUser):
             Dictionary with summary information
         """
         # Define base results directory
-        results_dir = self.base_path / "results"
+        results_dir = self.output_dir / "results"
         
         summary = {
             "total_requests": result.total_requests,
@@ -1020,6 +1577,7 @@ class DynamicHttpUser(HttpUser):
             "results_path": str(results_dir),  # Add results directory path
             "top_endpoints": [],
             "error_count": len(result.errors),
+            "regression": result.regression.get("verdict", ""),
             "scan_time": datetime.now().isoformat()
         }
         
@@ -1046,4 +1604,325 @@ class DynamicHttpUser(HttpUser):
         else:
             summary["performance_rating"] = "Poor"
             
-        return summary
\ No newline at end of file
+        return summary
+
+
+@dataclass
+class CampaignTarget:
+    model: str
+    app_num: int
+    host: str
+    endpoints: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class LoadTestCampaign:
+    """A load profile applied to many apps, with one consolidated results table."""
+    id: str
+    targets: List[CampaignTarget]
+    user_count: int = 10
+    spawn_rate: int = 1
+    run_time: int = 30
+    concurrency: int = 1
+    workers: int = 0
+    # run_capacity_search parameters; when set each app gets a capacity search instead of a fixed load
+    capacity: Optional[Dict[str, Any]] = None
+    status: str = "pending"
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    model_summary: List[Dict[str, Any]] = field(default_factory=list)
+    cancel_requested: bool = False
+
+    def to_dict(self, include_rows: bool = True) -> Dict[str, Any]:
+        data = asdict(self)
+        data["total"] = len(self.targets)
+        data["completed"] = len(self.rows)
+        data["targets"] = [f"{t.model}/app{t.app_num}" for t in self.targets]
+        if not include_rows:
+            data.pop("rows")
+        return data
+
+
+class CampaignRunner:
+    """
+    Run one load profile across a fleet of apps and compare the results per model.
+
+    Tests run sequentially by default. With concurrency > 1 the available CPUs
+    are split into equal slots and each concurrent test generates load from
+    worker processes pinned to its own slot, so tests do not compete for the
+    same cores.
+
+    Slot threads are greenlets under gevent's monkey patching and share one
+    core, so concurrent tests must generate their load in worker processes.
+    Capacity searches only use the in-process runner, so capacity campaigns
+    always run one app at a time.
+    """
+    TABLE_COLUMNS = [
+        "model", "app_num", "host", "status", "test_name", "total_requests", "total_failures",
+        "error_rate", "requests_per_sec", "avg_response_time", "median_response_time",
+        "percentile_95", "percentile_99", "duration", "workers", "max_sustainable_rps",
+        "max_sustainable_users", "stop_reason", "error",
+    ]
+
+    def __init__(self, output_dir: Union[str, Path],
+                 publish: Optional[Callable[[str, str, Dict[str, Any], bool], None]] = None):
+        self.output_dir = Path(output_dir)
+        self.campaigns_dir = self.output_dir / "performance_reports" / "campaigns"
+        self.publish = publish
+        self.campaigns: Dict[str, LoadTestCampaign] = {}
+        self._lock = threading.Lock()
+
+    def create(self, targets: List[CampaignTarget], user_count: int = 10, spawn_rate: int = 1,
+               run_time: int = 30, concurrency: int = 1, workers: int = 0,
+               capacity: Optional[Dict[str, Any]] = None) -> LoadTestCampaign:
+        if capacity is not None and concurrency > 1:
+            logger.info("Capacity campaigns run in-process; running apps one at a time")
+            concurrency = 1
+        campaign = LoadTestCampaign(
+            id=f"campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}",
+            targets=targets,
+            user_count=user_count,
+            spawn_rate=spawn_rate,
+            run_time=run_time,
+            concurrency=max(1, min(concurrency, len(targets) or 1, len(self._available_cpus()))),
+            workers=workers,
+            capacity=capacity
+        )
+        with self._lock:
+            self.campaigns[campaign.id] = campaign
+        return campaign
+
+    def start(self, campaign: LoadTestCampaign) -> None:
+        """Run the campaign on a background thread."""
+        thread = threading.Thread(target=self.run, args=(campaign,), name=f"perf-{campaign.id}", daemon=True)
+        thread.start()
+
+    def get(self, campaign_id: str) -> Optional[LoadTestCampaign]:
+        with self._lock:
+            campaign = self.campaigns.get(campaign_id)
+        return campaign or self._load(campaign_id)
+
+    def list_campaigns(self) -> List[Dict[str, Any]]:
+        """Campaigns run in this process plus those saved on disk, newest first."""
+        with self._lock:
+            known = {cid: c.to_dict(include_rows=False) for cid, c in self.campaigns.items()}
+        if self.campaigns_dir.is_dir():
+            for campaign_dir in self.campaigns_dir.iterdir():
+                if campaign_dir.name not in known:
+                    campaign = self._load(campaign_dir.name)
+                    if campaign:
+                        known[campaign.id] = campaign.to_dict(include_rows=False)
+        return sorted(known.values(), key=lambda c: c["created_at"], reverse=True)
+
+    def cancel(self, campaign_id: str) -> bool:
+        """Skip the campaign's remaining apps; tests already running finish normally."""
+        campaign = self.get(campaign_id)
+        if not campaign or campaign.status not in ("pending", "running"):
+            return False
+        campaign.cancel_requested = True
+        return True
+
+    @staticmethod
+    def _available_cpus() -> List[int]:
+        if hasattr(os, "sched_getaffinity"):
+            return sorted(os.sched_getaffinity(0))
+        return list(range(os.cpu_count() or 1))
+
+    def _cpu_slots(self, concurrency: int) -> List[Optional[Set[int]]]:
+        if concurrency <= 1:
+            return [None]
+        cpus = self._available_cpus()
+        per_slot = max(1, len(cpus) // concurrency)
+        return [set(cpus[i * per_slot:(i + 1) * per_slot]) for i in range(concurrency)]
+
+    def run(self, campaign: LoadTestCampaign) -> LoadTestCampaign:
+        campaign.status = "running"
+        campaign.started_at = datetime.now().isoformat()
+        logger.info(f"Campaign {campaign.id}: {len(campaign.targets)} apps, concurrency {campaign.concurrency}")
+        self._notify(campaign)
+        pending = list(campaign.targets)
+        pending_lock = threading.Lock()
+
+        def slot_worker(cpu_slot: Optional[Set[int]]):
+            # Each slot owns its tester, since a tester holds the state of one running test
+            tester = LocustPerformanceTester(self.output_dir)
+            while not campaign.cancel_requested:
+                with pending_lock:
+                    if not pending:
+                        return
+                    target = pending.pop(0)
+                row = self._run_target(tester, campaign, target, cpu_slot)
+                with self._lock:
+                    campaign.rows.append(row)
+                self._notify(campaign, row)
+
+        slots = self._cpu_slots(campaign.concurrency)
+        threads = [
+            threading.Thread(target=slot_worker, args=(slot,), name=f"{campaign.id}-slot{i}", daemon=True)
+            for i, slot in enumerate(slots)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        campaign.model_summary = self.summarize(campaign.rows)
+        campaign.status = "cancelled" if campaign.cancel_requested else "completed"
+        campaign.finished_at = datetime.now().isoformat()
+        self._save(campaign)
+        self._notify(campaign, final=True)
+        logger.info(f"Campaign {campaign.id} {campaign.status}: {len(campaign.rows)}/{len(campaign.targets)} apps tested")
+        return campaign
+
+    def _run_target(self, tester: LocustPerformanceTester, campaign: LoadTestCampaign,
+                    target: CampaignTarget, cpu_slot: Optional[Set[int]]) -> Dict[str, Any]:
+        row = {"model": target.model, "app_num": target.app_num, "host": target.host}
+        # A pinned slot generates all load from worker processes on its own cores;
+        # the slot thread itself only coordinates
+        workers = max(1, len(cpu_slot)) if cpu_slot is not None else campaign.workers
+        try:
+            if campaign.capacity is not None:
+                capacity = tester.run_capacity_search(
+                    test_name=f"{campaign.id}_{target.model}_app{target.app_num}",
+                    host=target.host,
+                    endpoints=target.endpoints,
+                    model=target.model,
+                    app_num=target.app_num,
+                    progress_callback=lambda step: self._notify(
+                        campaign, step=dict(step, model=target.model, app_num=target.app_num)
+                    ),
+                    **campaign.capacity
+                )
+                steps = capacity.steps
+                row.update({
+                    "status": "completed",
+                    "test_name": capacity.test_name,
+                    "total_requests": sum(step.requests for step in steps),
+                    "total_failures": sum(step.failures for step in steps),
+                    "max_sustainable_rps": capacity.max_sustainable_rps,
+                    "max_sustainable_users": capacity.max_sustainable_users,
+                    "stop_reason": capacity.stop_reason,
+                })
+                return row
+            result = tester.run_test_library(
+                test_name=f"{campaign.id}_{target.model}_app{target.app_num}",
+                host=target.host,
+                endpoints=target.endpoints,
+                user_count=campaign.user_count,
+                spawn_rate=campaign.spawn_rate,
+                run_time=campaign.run_time,
+                generate_graphs=False,
+                model=target.model,
+                app_num=target.app_num,
+                force_rerun=True,
+                workers=workers,
+                cpu_affinity=cpu_slot
+            )
+            row.update({
+                "status": "completed",
+                "test_name": result.test_name,
+                "total_requests": result.total_requests,
+                "total_failures": result.total_failures,
+                "error_rate": round(result.total_failures / result.total_requests * 100, 2) if result.total_requests else 0.0,
+                "requests_per_sec": round(result.requests_per_sec, 2),
+                "avg_response_time": round(result.avg_response_time, 2),
+                "median_response_time": round(result.median_response_time, 2),
+                "percentile_95": round(result.percentile_95, 2),
+                "percentile_99": round(result.percentile_99, 2),
+                "duration": result.duration,
+                "workers": result.workers,
+            })
+        except Exception as e:
+            logger.exception(f"Campaign {campaign.id}: test for {target.model}/app{target.app_num} failed: {e}")
+            row.update({"status": "failed", "error": str(e)})
+        return row
+
+    @staticmethod
+    def summarize(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cross-model comparison: throughput, latency and error rate (or max sustainable RPS) per model."""
+        if not rows:
+            return []
+        df = pd.DataFrame(rows, columns=CampaignRunner.TABLE_COLUMNS)
+        capacity_mode = df["max_sustainable_rps"].notna().any()
+
+        def stat(series: pd.Series, how: str) -> float:
+            value = getattr(series, how)()
+            return round(float(value), 2) if pd.notna(value) else 0.0
+
+        summary = []
+        for model, group in df.groupby("model", sort=True):
+            done = group[group["status"] == "completed"]
+            requests = int(done["total_requests"].sum())
+            failures = int(done["total_failures"].sum())
+            entry = {
+                "model": model,
+                "apps_tested": int(len(done)),
+                "apps_failed": int(len(group) - len(done)),
+                "total_requests": requests,
+                "error_rate": round(failures / requests * 100, 2) if requests else 0.0,
+            }
+            if capacity_mode:
+                entry.update({
+                    "median_max_rps": stat(done["max_sustainable_rps"], "median"),
+                    "min_max_rps": stat(done["max_sustainable_rps"], "min"),
+                    "median_max_users": stat(done["max_sustainable_users"], "median"),
+                })
+            else:
+                entry.update({
+                    "mean_rps": stat(done["requests_per_sec"], "mean"),
+                    "median_p95": stat(done["percentile_95"], "median"),
+                    "worst_p95": stat(done["percentile_95"], "max"),
+                    "median_response_time": stat(done["median_response_time"], "median"),
+                })
+            summary.append(entry)
+        sort_key = "median_max_rps" if capacity_mode else "mean_rps"
+        return sorted(summary, key=lambda s: s[sort_key], reverse=True)
+
+    def _save(self, campaign: LoadTestCampaign) -> None:
+        campaign_dir = self.campaigns_dir / campaign.id
+        campaign_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            pd.DataFrame(campaign.rows, columns=self.TABLE_COLUMNS).to_csv(campaign_dir / "results.csv", index=False)
+            with open(campaign_dir / "campaign.json", "w", encoding="utf-8") as f:
+                json.dump(campaign.to_dict(), f, indent=2, default=str)
+            logger.info(f"Saved campaign {campaign.id} results to {campaign_dir}")
+        except Exception as e:
+            logger.exception(f"Failed to save campaign {campaign.id}: {e}")
+
+    def _load(self, campaign_id: str) -> Optional[LoadTestCampaign]:
+        campaign_file = self.campaigns_dir / campaign_id / "campaign.json"
+        if not campaign_file.is_file():
+            return None
+        try:
+            with open(campaign_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            targets = []
+            for label in data.get("targets", []):
+                model, _, app = label.rpartition("/app")
+                targets.append(CampaignTarget(model=model, app_num=int(app), host=""))
+            return LoadTestCampaign(
+                id=data["id"], targets=targets,
+                **{k: data[k] for k in (
+                    "user_count", "spawn_rate", "run_time", "concurrency", "workers", "capacity", "status",
+                    "created_at", "started_at", "finished_at", "rows", "model_summary"
+                ) if k in data}
+            )
+        except Exception as e:
+            logger.warning(f"Could not load campaign {campaign_id}: {e}")
+            return None
+
+    def _notify(self, campaign: LoadTestCampaign, row: Optional[Dict[str, Any]] = None, final: bool = False,
+                step: Optional[Dict[str, Any]] = None) -> None:
+        if not self.publish:
+            return
+        data = campaign.to_dict(include_rows=False)
+        if row:
+            data["last_result"] = row
+        if step:
+            data["capacity_step"] = step
+        try:
+            self.publish(f"campaign/{campaign.id}", "progress" if not final else "complete", data, final)
+        except Exception as e:
+            logger.debug(f"Could not publish campaign progress: {e}")
@@ -0,0 +1,460 @@
+import hashlib
+import json
+import logging
+import math
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from latency_histogram import AGGREGATED_KEY, HistogramSet, LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+RESULT_FILE_NAME = ".locust_result.json"
+HISTOGRAM_FILE_NAME = "latency_histograms.json"
+TIMESERIES_FILE_NAME = "timeseries.json"
+INDEX_FILE_NAME = "run_index.json"
+INDEX_VERSION = 1
+
+DEFAULT_BASELINE_RUNS = 5
+DEFAULT_BOOTSTRAP_SAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+# Relative change (percent) a confidence interval must clear before a change is flagged
+DEFAULT_THRESHOLD_PCT = 5.0
+# Absolute error-rate change (percentage points) treated as meaningful
+ERROR_RATE_THRESHOLD_PP = 1.0
+# Runs with fewer requests are too small to compare (and are not used as baselines)
+MIN_RUN_REQUESTS = 100
+# Measured durations jitter by a second or two; bucket them so reruns share a profile
+DURATION_BUCKET_SECONDS = 10
+
+
+@dataclass
+class RunRecord:
+    """Index entry for one stored Locust run."""
+    run_id: str
+    model: str
+    app_num: int
+    profile: str
+    start_time: str
+    user_count: int = 0
+    spawn_rate: int = 0
+    duration: int = 0
+    workers: int = 0
+    total_requests: int = 0
+    total_failures: int = 0
+    requests_per_sec: float = 0.0
+    median_response_time: float = 0.0
+    percentile_95: float = 0.0
+    verdict: str = ""
+
+    @property
+    def error_rate(self) -> float:
+        return self.total_failures / self.total_requests if self.total_requests else 0.0
+
+
+@dataclass
+class MetricComparison:
+    metric: str
+    baseline: float
+    candidate: float
+    delta_pct: float
+    ci_low: Optional[float]
+    ci_high: Optional[float]
+    verdict: str
+
+
+@dataclass
+class RegressionReport:
+    run_id: str
+    model: str
+    app_num: int
+    profile: str
+    baseline_runs: List[str]
+    verdict: str
+    comparisons: List[MetricComparison] = field(default_factory=list)
+    confidence: float = DEFAULT_CONFIDENCE
+    threshold_pct: float = DEFAULT_THRESHOLD_PCT
+    bootstrap_samples: int = DEFAULT_BOOTSTRAP_SAMPLES
+    created: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def load_profile(user_count: int, spawn_rate: int, duration: int, workers: int,
+                 endpoints: List[str]) -> str:
+    """
+    Key identifying comparable runs: same users, spawn rate, (bucketed) duration,
+    worker count and endpoint set.
+    """
+    duration_bucket = int(round(duration / DURATION_BUCKET_SECONDS)) * DURATION_BUCKET_SECONDS
+    endpoint_hash = hashlib.sha1("\n".join(sorted(endpoints)).encode("utf-8")).hexdigest()[:8]
+    return f"u{user_count}-s{spawn_rate}-d{duration_bucket}-w{workers}-{endpoint_hash}"
+
+
+def record_from_result(run_id: str, data: Dict[str, Any]) -> Optional[RunRecord]:
+    """
+    Build an index entry from a stored PerformanceResult dict. Runs without a
+    recorded profile fall back to one derived from the endpoints they hit.
+    """
+    if not data.get("model") or not data.get("app_num"):
+        return None
+    endpoints = [f"{e.get('method', '')} {e.get('name', '')}" for e in data.get("endpoints", [])]
+    return RunRecord(
+        run_id=run_id,
+        model=data["model"],
+        app_num=int(data["app_num"]),
+        profile=data.get("profile") or load_profile(data.get("user_count", 0), data.get("spawn_rate", 0),
+                                                    data.get("duration", 0), data.get("workers", 0), endpoints),
+        start_time=data.get("start_time", ""),
+        user_count=data.get("user_count", 0),
+        spawn_rate=data.get("spawn_rate", 0),
+        duration=data.get("duration", 0),
+        workers=data.get("workers", 0),
+        total_requests=data.get("total_requests", 0),
+        total_failures=data.get("total_failures", 0),
+        requests_per_sec=data.get("requests_per_sec", 0.0),
+        median_response_time=data.get("median_response_time", 0.0),
+        percentile_95=data.get("percentile_95", 0.0),
+        verdict=(data.get("regression") or {}).get("verdict", ""),
+    )
+
+
+class RegressionDetector:
+    """
+    Index of stored Locust runs and bootstrap comparisons between them.
+
+    Every run directory under performance_reports/ holding a .locust_result.json
+    is indexed by model, app and load profile. A run is compared against the
+    preceding runs with the same profile:
+
+    - p50/p95 latency: hierarchical bootstrap over the runs' stored latency
+      histograms (resample baseline runs, then requests within each run)
+    - RPS: bootstrap of steady-state per-second throughput from the stored
+      time series, or the run-level figure when no series exists
+    - error rate: normal-approximation interval for a difference in proportions
+
+    A metric is flagged only when its whole confidence interval lies beyond
+    the threshold, so noisy runs come out "unchanged" rather than as false alarms.
+    """
+    def __init__(self, reports_dir: Union[str, Path], seed: Optional[int] = None):
+        self.reports_dir = Path(reports_dir)
+        self.index_file = self.reports_dir / INDEX_FILE_NAME
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._records: Dict[str, RunRecord] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not self.index_file.is_file():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return
+            for run_id, entry in data.get("runs", {}).items():
+                self._mtimes[run_id] = entry.pop("mtime", 0.0)
+                self._records[run_id] = RunRecord(**entry)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable run index {self.index_file}: {e}")
+            self._records, self._mtimes = {}, {}
+
+    def _save_index(self) -> None:
+        runs = {run_id: {**asdict(record), "mtime": self._mtimes.get(run_id, 0.0)}
+                for run_id, record in self._records.items()}
+        tmp_file = self.index_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "runs": runs}, f)
+        tmp_file.replace(self.index_file)
+
+    def refresh(self) -> List[RunRecord]:
+        """Bring the index up to date with the run directories on disk; returns all records."""
+        with self._lock:
+            seen = set()
+            changed = False
+            if self.reports_dir.is_dir():
+                for result_file in self.reports_dir.glob(f"*/{RESULT_FILE_NAME}"):
+                    run_id = result_file.parent.name
+                    seen.add(run_id)
+                    mtime = result_file.stat().st_mtime
+                    if self._mtimes.get(run_id) == mtime:
+                        continue
+                    try:
+                        with open(result_file, "r", encoding="utf-8") as f:
+                            record = record_from_result(run_id, json.load(f))
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Skipping unreadable run result {result_file}: {e}")
+                        record = None
+                    self._mtimes[run_id] = mtime
+                    if record:
+                        self._records[run_id] = record
+                    else:
+                        self._records.pop(run_id, None)
+                    changed = True
+            for run_id in set(self._records) - seen:
+                del self._records[run_id]
+                self._mtimes.pop(run_id, None)
+                changed = True
+            if changed:
+                self._save_index()
+            return list(self._records.values())
+
+    def history(self, model: str, app_num: int, profile: Optional[str] = None) -> List[RunRecord]:
+        """Indexed runs of one app (optionally one load profile), oldest first."""
+        records = [
+            r for r in self.refresh()
+            if r.model == model and r.app_num == app_num and (profile is None or r.profile == profile)
+        ]
+        return sorted(records, key=lambda r: (r.start_time, r.run_id))
+
+    def profiles(self, model: str, app_num: int) -> Dict[str, int]:
+        """Load profiles seen for an app with their run counts."""
+        counts: Dict[str, int] = {}
+        for record in self.history(model, app_num):
+            counts[record.profile] = counts.get(record.profile, 0) + 1
+        return counts
+
+    def get(self, run_id: str) -> Optional[RunRecord]:
+        self.refresh()
+        return self._records.get(run_id)
+
+    def compare(
+        self,
+        candidate: RunRecord,
+        baseline_ids: Optional[List[str]] = None,
+        baseline_count: int = DEFAULT_BASELINE_RUNS,
+        threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+        confidence: float = DEFAULT_CONFIDENCE,
+        bootstrap_samples: int = DEFAULT_BOOTSTRAP_SAMPLES
+    ) -> RegressionReport:
+        """
+        Compare a run against explicit baseline runs, or against the latest
+        `baseline_count` earlier runs of the same app and load profile.
+        """
+        if baseline_ids:
+            self.refresh()
+            baselines = [self._records[b] for b in baseline_ids if b in self._records and b != candidate.run_id]
+            baselines = [b for b in baselines if b.total_requests >= MIN_RUN_REQUESTS]
+        else:
+            earlier = [
+                r for r in self.history(candidate.model, candidate.app_num, candidate.profile)
+                if r.run_id != candidate.run_id and r.total_requests >= MIN_RUN_REQUESTS
+                and (r.start_time, r.run_id) < (candidate.start_time, candidate.run_id)
+            ]
+            baselines = earlier[-baseline_count:]
+
+        report = RegressionReport(
+            run_id=candidate.run_id,
+            model=candidate.model,
+            app_num=candidate.app_num,
+            profile=candidate.profile,
+            baseline_runs=[b.run_id for b in baselines],
+            verdict="no_baseline",
+            confidence=confidence,
+            threshold_pct=threshold_pct,
+            bootstrap_samples=bootstrap_samples
+        )
+        if candidate.total_requests < MIN_RUN_REQUESTS:
+            report.verdict = "insufficient_data"
+            return report
+        if not baselines:
+            return report
+
+        alpha = (1 - confidence) / 2
+        quantiles = (alpha * 100, (1 - alpha) * 100)
+
+        baseline_histograms = [self._load_histogram(b.run_id) for b in baselines]
+        candidate_histogram = self._load_histogram(candidate.run_id)
+        for metric, percentile, fallback in (("p50", 50, "median_response_time"), ("p95", 95, "percentile_95")):
+            if candidate_histogram and all(baseline_histograms):
+                base_boot = self._bootstrap_percentile(baseline_histograms, percentile, bootstrap_samples)
+                cand_boot = self._bootstrap_percentile([candidate_histogram], percentile, bootstrap_samples)
+                base_value = self._merge(baseline_histograms).value_at_percentile(percentile)
+                cand_value = candidate_histogram.value_at_percentile(percentile)
+                comparison = self._compare_bootstrap(metric, base_value, cand_value, base_boot, cand_boot,
+                                                     quantiles, threshold_pct, higher_is_better=False)
+            else:
+                comparison = self._compare_points(
+                    metric, [getattr(b, fallback) for b in baselines], getattr(candidate, fallback),
+                    quantiles, threshold_pct, bootstrap_samples, higher_is_better=False
+                )
+            report.comparisons.append(comparison)
+
+        baseline_rps = [self._load_rps_samples(b) for b in baselines]
+        candidate_rps = self._load_rps_samples(candidate)
+        base_boot = self._bootstrap_means(baseline_rps, bootstrap_samples)
+        cand_boot = self._bootstrap_means([candidate_rps], bootstrap_samples)
+        report.comparisons.append(self._compare_bootstrap(
+            "rps", float(np.mean([s.mean() for s in baseline_rps])), float(candidate_rps.mean()),
+            base_boot, cand_boot, quantiles, threshold_pct, higher_is_better=True
+        ))
+
+        report.comparisons.append(self._compare_error_rate(baselines, candidate, confidence))
+
+        verdicts = {c.verdict for c in report.comparisons}
+        report.verdict = ("regression" if "regression" in verdicts
+                          else "improvement" if "improvement" in verdicts else "unchanged")
+        return report
+
+    def evaluate(self, record: RunRecord, **kwargs: Any) -> RegressionReport:
+        """Compare a freshly finished run with its history and note the verdict in the index."""
+        report = self.compare(record, **kwargs)
+        with self._lock:
+            if record.run_id in self._records:
+                self._records[record.run_id].verdict = report.verdict
+        logger.info(
+            f"Regression check for {record.run_id} against {len(report.baseline_runs)} runs: {report.verdict}"
+        )
+        return report
+
+    def _load_histogram(self, run_id: str) -> Optional[LatencyHistogram]:
+        histogram_file = self.reports_dir / run_id / HISTOGRAM_FILE_NAME
+        if not histogram_file.is_file():
+            return None
+        try:
+            with open(histogram_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return HistogramSet.from_dict(data.get("histograms", {})).get(AGGREGATED_KEY)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load histograms for {run_id}: {e}")
+            return None
+
+    @staticmethod
+    def _merge(histograms: List[LatencyHistogram]) -> LatencyHistogram:
+        merged = LatencyHistogram(histograms[0].min_value, histograms[0].growth)
+        for histogram in histograms:
+            merged.merge(histogram)
+        return merged
+
+    def _load_rps_samples(self, record: RunRecord) -> np.ndarray:
+        """Per-second RPS once all users are running, or the run-level RPS as a single sample."""
+        timeseries_file = self.reports_dir / record.run_id / TIMESERIES_FILE_NAME
+        try:
+            with open(timeseries_file, "r", encoding="utf-8") as f:
+                series = json.load(f).get("series", {})
+            rps = np.array([np.nan if v is None else v for v in series.get("current_rps", [])], dtype=float)
+            users = series.get("user_count")
+            if users and len(users) == len(rps):
+                users = np.array([np.nan if v is None else v for v in users], dtype=float)
+                rps = rps[users >= np.nanmax(users)]
+            rps = rps[~np.isnan(rps)]
+            if rps.size:
+                return rps
+        except (OSError, ValueError):
+            pass
+        return np.array([record.requests_per_sec], dtype=float)
+
+    def _bootstrap_percentile(self, histograms: List[LatencyHistogram], percentile: float,
+                              samples: int) -> np.ndarray:
+        """
+        Bootstrap distribution of a latency percentile over one or more runs.
+
+        Each iteration draws runs with replacement, redraws each chosen run's
+        requests from its histogram (multinomial over buckets) and reads the
+        percentile from the pooled counts.
+        """
+        reference = histograms[0]
+        buckets = np.array(sorted({i for h in histograms for i in h.counts}))
+        position = {index: i for i, index in enumerate(buckets)}
+        draws = []
+        for histogram in histograms:
+            probabilities = np.zeros(len(buckets))
+            for index, count in histogram.counts.items():
+                probabilities[position[index]] = count
+            probabilities /= probabilities.sum()
+            draws.append(self._rng.multinomial(histogram.total_count, probabilities, size=samples))
+        draws = np.stack(draws)  # runs x samples x buckets
+
+        runs = len(histograms)
+        if runs == 1:
+            pooled = draws[0]
+        else:
+            chosen = self._rng.integers(0, runs, size=(samples, runs))
+            pooled = draws[chosen, np.arange(samples)[:, None]].sum(axis=1)
+        cumulative = pooled.cumsum(axis=1)
+        targets = np.maximum(1, np.ceil(cumulative[:, -1] * percentile / 100.0))
+        bucket_at = (cumulative >= targets[:, None]).argmax(axis=1)
+        values = np.array([reference._bucket_value(int(index)) for index in buckets])
+        return values[bucket_at]
+
+    def _bootstrap_means(self, sample_sets: List[np.ndarray], samples: int) -> np.ndarray:
+        """Bootstrap distribution of mean throughput over runs (runs, then seconds within each run)."""
+        run_means = np.stack([
+            self._rng.choice(values, size=(samples, values.size), replace=True).mean(axis=1)
+            for values in sample_sets
+        ])  # runs x samples
+        runs = len(sample_sets)
+        if runs == 1:
+            return run_means[0]
+        chosen = self._rng.integers(0, runs, size=(samples, runs))
+        return run_means[chosen, np.arange(samples)[:, None]].mean(axis=1)
+
+    def _compare_points(self, metric: str, baseline_values: List[float], candidate_value: float,
+                        quantiles: Tuple[float, float], threshold_pct: float, samples: int,
+                        higher_is_better: bool) -> MetricComparison:
+        """Fallback when no histograms are stored: bootstrap over the baseline runs' reported values."""
+        baseline = np.array(baseline_values, dtype=float)
+        base_boot = self._rng.choice(baseline, size=(samples, baseline.size), replace=True).mean(axis=1)
+        cand_boot = np.full(samples, float(candidate_value))
+        return self._compare_bootstrap(metric, float(baseline.mean()), float(candidate_value), base_boot,
+                                       cand_boot, quantiles, threshold_pct, higher_is_better)
+
+    @staticmethod
+    def _compare_bootstrap(metric: str, baseline: float, candidate: float, base_boot: np.ndarray,
+                           cand_boot: np.ndarray, quantiles: Tuple[float, float], threshold_pct: float,
+                           higher_is_better: bool) -> MetricComparison:
+        if baseline <= 0:
+            return MetricComparison(metric, baseline, candidate, 0.0, None, None, "insufficient_data")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = (cand_boot / base_boot - 1) * 100
+        relative = relative[np.isfinite(relative)]
+        if not relative.size:
+            return MetricComparison(metric, baseline, candidate, 0.0, None, None, "insufficient_data")
+        ci_low, ci_high = (float(v) for v in np.percentile(relative, quantiles))
+        worse, better = (ci_high < -threshold_pct, ci_low > threshold_pct) if higher_is_better \
+            else (ci_low > threshold_pct, ci_high < -threshold_pct)
+        verdict = "regression" if worse else "improvement" if better else "unchanged"
+        return MetricComparison(
+            metric=metric,
+            baseline=round(baseline, 3),
+            candidate=round(candidate, 3),
+            delta_pct=round((candidate / baseline - 1) * 100, 2),
+            ci_low=round(ci_low, 2),
+            ci_high=round(ci_high, 2),
+            verdict=verdict
+        )
+
+    @staticmethod
+    def _compare_error_rate(baselines: List[RunRecord], candidate: RunRecord,
+                            confidence: float) -> MetricComparison:
+        """Difference in failure proportions (percentage points) with a normal-approximation interval."""
+        base_requests = sum(b.total_requests for b in baselines)
+        base_rate = sum(b.total_failures for b in baselines) / base_requests if base_requests else 0.0
+        cand_rate = candidate.error_rate
+        if not base_requests or not candidate.total_requests:
+            return MetricComparison("error_rate", base_rate * 100, cand_rate * 100, 0.0, None, None,
+                                    "insufficient_data")
+        z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+        stderr = math.sqrt(base_rate * (1 - base_rate) / base_requests
+                           + cand_rate * (1 - cand_rate) / candidate.total_requests)
+        diff = (cand_rate - base_rate) * 100
+        ci_low, ci_high = diff - z * stderr * 100, diff + z * stderr * 100
+        verdict = ("regression" if ci_low > ERROR_RATE_THRESHOLD_PP
+                   else "improvement" if ci_high < -ERROR_RATE_THRESHOLD_PP else "unchanged")
+        return MetricComparison(
+            metric="error_rate",
+            baseline=round(base_rate * 100, 3),
+            candidate=round(cand_rate * 100, 3),
+            delta_pct=round(diff, 3),
+            ci_low=round(ci_low, 3),
+            ci_high=round(ci_high, 3),
+            verdict=verdict
+        )
@@ -0,0 +1,343 @@
+import ast
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+PATH_PARAM_PATTERN = re.compile(r"<(?:(?P<converter>[a-zA-Z_]+)(?:\([^)]*\))?:)?(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)>")
+# Flask converter -> (OpenAPI type, sample value)
+CONVERTER_TYPES = {
+    None: ("string", "test"),
+    "string": ("string", "test"),
+    "int": ("integer", 1),
+    "float": ("number", 1.0),
+    "path": ("string", "test"),
+    "uuid": ("string", "00000000-0000-0000-0000-000000000000"),
+}
+BACKEND_SOURCE_GLOB = "backend/**/*.py"
+SKIP_DIRS = {"venv", ".venv", "node_modules", "__pycache__", "migrations"}
+
+
+@dataclass
+class RouteParameter:
+    name: str
+    location: str                       # "path", "query", "body", "form" or "file"
+    type: str = "string"
+    sample: Any = "test"
+
+
+@dataclass
+class FlaskRoute:
+    path: str
+    methods: List[str]
+    function: str
+    source_file: str
+    line: int
+    parameters: List[RouteParameter] = field(default_factory=list)
+
+    def params_in(self, location: str) -> List[RouteParameter]:
+        return [p for p in self.parameters if p.location == location]
+
+    @property
+    def openapi_path(self) -> str:
+        return PATH_PARAM_PATTERN.sub(lambda m: "{" + m.group("name") + "}", self.path)
+
+    def sample_path(self) -> str:
+        """Concrete path with every path parameter replaced by a sample value."""
+        samples = {p.name: p.sample for p in self.params_in("path")}
+        return PATH_PARAM_PATTERN.sub(lambda m: str(samples.get(m.group("name"), "test")), self.path)
+
+    def sample_query(self) -> Dict[str, Any]:
+        return {p.name: p.sample for p in self.params_in("query")}
+
+    def sample_body(self) -> Dict[str, Any]:
+        return {p.name: p.sample for p in self.params_in("body")}
+
+    def sample_form(self) -> Dict[str, Any]:
+        return {p.name: p.sample for p in self.params_in("form")}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _RequestUsageVisitor(ast.NodeVisitor):
+    """Collect query/body/form/file parameter names a view function reads from ``request``."""
+
+    ACCESSORS = {"args": "query", "json": "body", "form": "form", "files": "file", "values": "query"}
+
+    def __init__(self):
+        self.parameters: Dict[Tuple[str, str], RouteParameter] = {}
+        self.body_aliases: Set[str] = set()
+
+    def _add(self, name: Any, location: str, sample: Any = "test"):
+        if not isinstance(name, str) or not name:
+            return
+        param_type = "integer" if isinstance(sample, int) and not isinstance(sample, bool) else "string"
+        self.parameters.setdefault((location, name), RouteParameter(name, location, param_type, sample))
+
+    def _location_of(self, node: ast.AST) -> Optional[str]:
+        # request.args / request.json / request.form / request.files
+        if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                and node.value.id == "request" and node.attr in self.ACCESSORS):
+            return self.ACCESSORS[node.attr]
+        # request.get_json(...)
+        if self._is_get_json(node):
+            return "body"
+        # data = request.get_json(); data[...]
+        if isinstance(node, ast.Name) and node.id in self.body_aliases:
+            return "body"
+        return None
+
+    @staticmethod
+    def _is_get_json(node: ast.AST) -> bool:
+        return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "get_json" and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == "request")
+
+    def visit_Assign(self, node: ast.Assign):
+        value = node.value
+        # "data = request.get_json() or {}" is as common as the bare call
+        if isinstance(value, ast.BoolOp):
+            value = value.values[0]
+        if self._is_get_json(value) or self._location_of(value) == "body":
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.body_aliases.add(target.id)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript):
+        location = self._location_of(node.value)
+        key = node.slice.value if isinstance(node.slice, ast.Constant) else None
+        if location:
+            self._add(key, location)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        if isinstance(node.func, ast.Attribute) and node.func.attr == "get" and node.args:
+            location = self._location_of(node.func.value)
+            key = node.args[0].value if isinstance(node.args[0], ast.Constant) else None
+            if location:
+                sample: Any = "test"
+                default = node.args[1] if len(node.args) > 1 else None
+                if isinstance(default, ast.Constant) and default.value not in (None, ""):
+                    sample = default.value
+                for keyword in node.keywords:
+                    if keyword.arg == "type" and isinstance(keyword.value, ast.Name) and keyword.value.id == "int":
+                        sample = sample if isinstance(sample, int) else 1
+                self._add(key, location, sample)
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare):
+        # "'file' not in request.files"
+        if isinstance(node.left, ast.Constant):
+            for comparator in node.comparators:
+                location = self._location_of(comparator)
+                if location:
+                    self._add(node.left.value, location)
+        self.generic_visit(node)
+
+
+class FlaskRouteExtractor(ast.NodeVisitor):
+    """Find ``@app.route`` / ``@bp.get``-style views in one module without importing it."""
+
+    def __init__(self, source_file: str):
+        self.source_file = source_file
+        self.routes: List[FlaskRoute] = []
+        self.blueprint_prefixes: Dict[str, str] = {}
+
+    def collect_blueprint_prefixes(self, tree: ast.AST):
+        """
+        Record blueprint URL prefixes before visiting views; register_blueprint
+        usually comes after the decorated functions.
+        """
+        for node in ast.walk(tree):
+            # bp = Blueprint("name", __name__, url_prefix="/api")
+            if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+                    and isinstance(node.value.func, ast.Name) and node.value.func.id == "Blueprint"):
+                prefix = self._keyword(node.value, "url_prefix") or ""
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.blueprint_prefixes.setdefault(target.id, prefix)
+            # app.register_blueprint(bp, url_prefix="/api") overrides the Blueprint prefix
+            elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == "register_blueprint" and node.args
+                    and isinstance(node.args[0], ast.Name)):
+                prefix = self._keyword(node, "url_prefix")
+                if prefix is not None:
+                    self.blueprint_prefixes[node.args[0].id] = prefix
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        for decorator in node.decorator_list:
+            route = self._route_from_decorator(decorator)
+            if route is None:
+                continue
+            owner, path, methods = route
+            usage = _RequestUsageVisitor()
+            usage.visit(node)
+            self.routes.append(FlaskRoute(
+                path=self._join(owner, path),
+                methods=methods,
+                function=node.name,
+                source_file=self.source_file,
+                line=node.lineno,
+                parameters=self._path_parameters(path) + list(usage.parameters.values()),
+            ))
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    @staticmethod
+    def _keyword(call: ast.Call, name: str) -> Optional[str]:
+        for keyword in call.keywords:
+            if keyword.arg == name and isinstance(keyword.value, ast.Constant):
+                return keyword.value.value
+        return None
+
+    def _route_from_decorator(self, decorator: ast.AST) -> Optional[Tuple[str, str, List[str]]]:
+        if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                and isinstance(decorator.func.value, ast.Name) and decorator.args
+                and isinstance(decorator.args[0], ast.Constant) and isinstance(decorator.args[0].value, str)):
+            return None
+        owner = decorator.func.value.id
+        attr = decorator.func.attr
+        path = decorator.args[0].value
+        if attr == "route":
+            methods = ["GET"]
+            for keyword in decorator.keywords:
+                if keyword.arg == "methods" and isinstance(keyword.value, (ast.List, ast.Tuple, ast.Set)):
+                    methods = [elt.value.upper() for elt in keyword.value.elts
+                               if isinstance(elt, ast.Constant) and isinstance(elt.value, str)]
+            return owner, path, [m for m in methods if m in HTTP_METHODS] or ["GET"]
+        if attr.upper() in HTTP_METHODS:
+            return owner, path, [attr.upper()]
+        return None
+
+    def _join(self, owner: str, path: str) -> str:
+        prefix = self.blueprint_prefixes.get(owner, "")
+        if not prefix:
+            return path
+        return prefix.rstrip("/") + "/" + path.lstrip("/") if path != "/" else prefix
+
+    @staticmethod
+    def _path_parameters(path: str) -> List[RouteParameter]:
+        parameters = []
+        for match in PATH_PARAM_PATTERN.finditer(path):
+            param_type, sample = CONVERTER_TYPES.get(match.group("converter"), CONVERTER_TYPES[None])
+            parameters.append(RouteParameter(match.group("name"), "path", param_type, sample))
+        return parameters
+
+
+_route_cache: Dict[str, Tuple[float, List[FlaskRoute]]] = {}
+_route_cache_lock = threading.Lock()
+
+
+def extract_routes(source_file: Union[str, Path]) -> List[FlaskRoute]:
+    """Parse one Flask module and return its routes; results are cached by mtime."""
+    source_file = Path(source_file)
+    key = str(source_file.resolve())
+    mtime = source_file.stat().st_mtime
+    with _route_cache_lock:
+        cached = _route_cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    try:
+        tree = ast.parse(source_file.read_text(encoding="utf-8", errors="replace"), filename=str(source_file))
+    except SyntaxError as e:
+        logger.warning(f"Could not parse {source_file}: {e}")
+        return []
+    extractor = FlaskRouteExtractor(str(source_file))
+    extractor.collect_blueprint_prefixes(tree)
+    extractor.visit(tree)
+    with _route_cache_lock:
+        _route_cache[key] = (mtime, extractor.routes)
+    return extractor.routes
+
+
+def extract_app_routes(app_dir: Union[str, Path]) -> List[FlaskRoute]:
+    """Collect routes from every Python module in an app's backend directory."""
+    app_dir = Path(app_dir)
+    routes: List[FlaskRoute] = []
+    for source_file in sorted(app_dir.glob(BACKEND_SOURCE_GLOB)):
+        if SKIP_DIRS.intersection(source_file.relative_to(app_dir).parts):
+            continue
+        routes.extend(extract_routes(source_file))
+    logger.info(f"Extracted {len(routes)} Flask routes from {app_dir}")
+    return routes
+
+
+def build_openapi_spec(routes: List[FlaskRoute], server_url: str, title: str = "Generated Flask API") -> Dict[str, Any]:
+    """Build an OpenAPI 3.0 document describing the extracted routes."""
+    paths: Dict[str, Dict[str, Any]] = {}
+    for route in routes:
+        for method in route.methods:
+            if method in ("HEAD", "OPTIONS"):
+                continue
+            operation: Dict[str, Any] = {
+                "operationId": f"{route.function}_{method.lower()}",
+                "parameters": [
+                    {
+                        "name": p.name,
+                        "in": p.location,
+                        "required": p.location == "path",
+                        "schema": {"type": p.type},
+                        "example": p.sample,
+                    }
+                    for p in route.parameters if p.location in ("path", "query")
+                ],
+                "responses": {"200": {"description": "OK"}},
+            }
+            body = route.params_in("body")
+            form = route.params_in("form") + route.params_in("file")
+            if method in ("POST", "PUT", "PATCH") and (body or form):
+                content = {}
+                if body:
+                    content["application/json"] = {"schema": {
+                        "type": "object",
+                        "properties": {p.name: {"type": p.type, "example": p.sample} for p in body},
+                    }}
+                if form:
+                    content["multipart/form-data"] = {"schema": {
+                        "type": "object",
+                        "properties": {
+                            p.name: {"type": "string", "format": "binary"} if p.location == "file"
+                            else {"type": p.type, "example": p.sample}
+                            for p in form
+                        },
+                    }}
+                operation["requestBody"] = {"content": content}
+            paths.setdefault(route.openapi_path, {})[method.lower()] = operation
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": title, "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": paths,
+    }
+
+
+def routes_to_locust_endpoints(routes: List[FlaskRoute]) -> List[Dict[str, Any]]:
+    """Convert routes into endpoint configs understood by ``UserGenerator``."""
+    endpoints = []
+    for route in routes:
+        for method in route.methods:
+            if method in ("HEAD", "OPTIONS"):
+                continue
+            endpoint: Dict[str, Any] = {
+                "path": route.sample_path(),
+                "method": method,
+                "weight": 3 if method == "GET" else 1,
+                "request_name": route.path,
+            }
+            if route.sample_query():
+                endpoint["params"] = route.sample_query()
+            if method in ("POST", "PUT", "PATCH"):
+                if route.sample_body():
+                    endpoint["json"] = route.sample_body()
+                elif route.sample_form():
+                    endpoint["data"] = route.sample_form()
+            endpoints.append(endpoint)
+    return endpoints
@@ -9,7 +9,7 @@ from dataclasses import asdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, TypeVar, cast
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, TypeVar, cast
 from functools import wraps
 
 try:
@@ -19,31 +19,38 @@ except ImportError:
 
 from flask import (
     Blueprint, Response, current_app, flash, jsonify,
-    redirect, render_template, request, url_for, send_file, g
+    redirect, render_template, request, url_for, send_file, g,
+    stream_with_context
 )
 from werkzeug.exceptions import BadRequest, HTTPException, InternalServerError, NotFound
 
 from logging_service import create_logger_for_component
 from services import (
-    DockerManager, ScanManager, SystemHealthMonitor, call_ai_service,
-    create_scanner
+    DockerManager, ScanManager, SystemHealthMonitor, ZapScanScheduler,
+    call_ai_service, create_scanner
 )
 from utils import (
     AIModel, AI_MODELS, APIResponse,
     _AJAX_REQUEST_HEADER_NAME, _AJAX_REQUEST_HEADER_VALUE,
     ajax_compatible, get_all_apps, get_app_container_statuses,
-    get_app_directory, get_app_info, get_apps_for_model,
-    get_container_names, get_model_index, get_scan_manager,
+    get_app_directory, get_apps_for_model,
+    get_container_names, get_model_index, get_progress_broker, get_scan_manager,
     handle_docker_action, process_security_analysis, stop_zap_scanners,
     verify_container_health, PortManager
 )
-from zap_scanner import CodeContext, ZapVulnerability
+from performance_analysis import CampaignRunner, CampaignTarget
+from route_extractor import build_openapi_spec, extract_app_routes, routes_to_locust_endpoints
+from load_scenarios import build_scenarios, is_scenario, load_app_requirements
+from zap_scanner import (
+    SCAN_PROFILES, AlertGrouper, ZAPConfig, ZAPScanner, get_profile_statistics
+)
 
 T = TypeVar('T')
 
 
 class ScanState(Enum):
     NOT_RUN = "Not Run"
+    QUEUED = "Queued"
     STARTING = "Starting"
     SPIDERING = "Spidering"
     SCANNING = "Scanning"
@@ -53,6 +60,11 @@ class ScanState(Enum):
     STOPPED = "Stopped"
 
 
+ACTIVE_SCAN_STATES = {
+    ScanState.QUEUED.value, ScanState.STARTING.value,
+    ScanState.SPIDERING.value, ScanState.SCANNING.value
+}
+
 main_bp = Blueprint("main", __name__)
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 analysis_bp = Blueprint("analysis", __name__, url_prefix="/analysis")
@@ -221,6 +233,29 @@ def route_error_handler(route_logger, redirect_url=None):
     return decorator
 
 
+def event_stream_response(
+    channel: str, 
+    snapshot: Optional[Callable[[], Optional[Tuple[Dict[str, Any], bool]]]] = None
+) -> Response:
+    """
+    Stream a progress channel to the client as Server-Sent Events.
+    
+    Args:
+        channel: ProgressBroker channel, e.g. "zap/<scan_id>"
+        snapshot: Optional callable returning the current (data, final) state,
+            sent before any published events
+        
+    Returns:
+        Streaming text/event-stream response
+    """
+    broker = get_progress_broker()
+    return Response(
+        stream_with_context(broker.stream(channel, snapshot=snapshot)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @main_bp.route("/")
 @ajax_compatible
 def index():
@@ -689,6 +724,39 @@ def get_model_info():
         return handle_route_error(e, api_logger)
 
 
+@api_bp.route("/routes/<string:model>/<int:app_num>")
+@ajax_compatible
+def get_app_routes(model: str, app_num: int):
+    """List backend routes parsed from an app's Flask source, optionally as OpenAPI."""
+    api_logger.debug(f"Route extraction requested for {model}/app{app_num}")
+    try:
+        app_dir = get_app_directory(current_app, model, app_num)
+        routes = extract_app_routes(app_dir)
+        if request.args.get("format") == "openapi":
+            backend_port = PortManager.get_app_ports(get_model_index(model), app_num)["backend"]
+            return build_openapi_spec(routes, f"http://localhost:{backend_port}", title=f"{model}/app{app_num}")
+        return {"routes": [route.to_dict() for route in routes], "total": len(routes)}
+    except Exception as e:
+        return handle_route_error(e, api_logger)
+
+
+@api_bp.route("/events")
+@ajax_compatible
+def list_event_channels():
+    """List progress channels that have published events and their subscriber counts."""
+    try:
+        return {"channels": get_progress_broker().channels()}
+    except Exception as e:
+        return handle_route_error(e, api_logger)
+
+
+@api_bp.route("/events/<path:channel>")
+def stream_events(channel: str):
+    """Stream any progress channel (zap/<scan_id>, batch/<job_id>, perf/<test_name>)."""
+    api_logger.debug(f"Event stream opened for channel {channel}")
+    return event_stream_response(channel)
+
+
 @api_bp.route("/log-client-error", methods=["POST"])
 @ajax_compatible
 def log_client_error():
@@ -797,21 +865,20 @@ def zap_scan_page(model: str, app_num: int):
                             results_exist=False
                         )
                         
-                if "alerts" in data and isinstance(data["alerts"], list):
-                    alerts = data["alerts"]
+                if isinstance(data.get("alerts"), list) or isinstance(data.get("groups"), list):
+                    # One entry per group of near-identical alerts; counts still cover every instance
+                    alerts = AlertGrouper.display_groups(data)
                     for alert in alerts:
                         risk = alert.get('risk', '')
-                        if risk == 'High': summary["high"] += 1
-                        elif risk == 'Medium': summary["medium"] += 1
-                        elif risk == 'Low': summary["low"] += 1
-                        elif risk in ('Info', 'Informational'): summary["info"] += 1
+                        if risk == 'High': summary["high"] += alert["count"]
+                        elif risk == 'Medium': summary["medium"] += alert["count"]
+                        elif risk == 'Low': summary["low"] += alert["count"]
+                        elif risk in ('Info', 'Informational'): summary["info"] += alert["count"]
                         
-                        if alert.get('affected_code') and alert['affected_code'] is not None:
-                            if isinstance(alert['affected_code'], dict) and 'snippet' in alert['affected_code'] and alert['affected_code']['snippet']:
-                                summary["vulnerabilities_with_code"] += 1
+                        summary["vulnerabilities_with_code"] += alert["code_count"]
                                 
                     zap_logger.info(
-                        f"Loaded {len(alerts)} alerts: "
+                        f"Loaded {sum(alert['count'] for alert in alerts)} alerts in {len(alerts)} groups: "
                         f"H={summary['high']}, M={summary['medium']}, L={summary['low']}, "
                         f"I={summary['info']}, with_code={summary['vulnerabilities_with_code']}"
                     )
@@ -840,151 +907,320 @@ def zap_scan_page(model: str, app_num: int):
         return handle_route_error(e, zap_logger)
 
 
+def _execute_zap_scan(app, scan_id_thread: str, model_thread: str, app_num_thread: int,
+                      quick_scan: bool = False, incremental: bool = False,
+                      profile: Optional[str] = None) -> bool:
+    """
+    Run one ZAP scan to completion and record its outcome in the ScanManager.
+    
+    Args:
+        app: Flask application object
+        scan_id_thread: Scan ID created by the ScanManager
+        model_thread: Model name
+        app_num_thread: Application number
+        quick_scan: Whether to run a quick scan
+        incremental: Whether to reuse the previous scan's discovery
+        profile: Scan profile name (defaults from quick_scan)
+        
+    Returns:
+        True if the scan completed successfully
+    """
+    with app.app_context():
+        scan_thread_logger = create_logger_for_component(f'zap.thread.{model_thread}-{app_num_thread}')
+        scan_thread_logger.info(f"Background scan thread starting for scan ID: {scan_id_thread}")
+        scanner = None
+        succeeded = False
+        try:
+            base_dir_thread = Path(current_app.config["BASE_DIR"])
+            app_dir_thread = get_app_directory(current_app, model_thread, app_num_thread)
+            scan_thread_logger.info(f"Initializing ZAP scanner instance for {model_thread}/app{app_num_thread}")
+            scanner = create_scanner(base_dir_thread)
+            scan_thread_logger.info(f"Setting source code root directory to {app_dir_thread}")
+            scanner.set_source_code_root(str(app_dir_thread))
+            current_scan_manager = get_scan_manager()
+            current_scan_manager.update_scan(
+                scan_id_thread, 
+                scanner=scanner, 
+                status=ScanState.STARTING.value, 
+                progress=0, 
+                spider_progress=0, 
+                passive_progress=0, 
+                active_progress=0, 
+                ajax_progress=0, 
+                start_time=datetime.now().isoformat(), 
+                end_time=None, 
+                results=None
+            )
+            scanner.progress_callback = lambda **fields: current_scan_manager.update_scan(scan_id_thread, **fields)
+            scan_thread_logger.info(f"Starting comprehensive ZAP scan for {model_thread}/app{app_num_thread}")
+            success = scanner.start_scan(
+                model_thread, app_num_thread, 
+                quick_scan=quick_scan, incremental=incremental, profile=profile
+            )
+            scan_thread_logger.info(f"Scan finished for {scan_id_thread}. Success reported by scanner: {success}")
+            
+            # Check for error state
+            current_state = current_scan_manager.get_scan_details(scan_id_thread)
+            if current_state and current_state.get("status") in (ScanState.ERROR.value, ScanState.STOPPED.value):
+                final_status = current_state["status"]
+            else:
+                final_status = ScanState.COMPLETE.value if success else ScanState.FAILED.value
+                
+            succeeded = final_status == ScanState.COMPLETE.value
+            final_progress = 100
+            
+            # Ensure the report directory exists and get file paths
+            zap_reports_dir = base_dir_thread / "zap_reports" / model_thread / f"app{app_num_thread}"
+            zap_reports_dir.mkdir(parents=True, exist_ok=True)
+            results_file = zap_reports_dir / ".zap_results.json"
+            
+            # Extract metrics from the results file
+            summary_data = {}
+            risk_counts = {}
+            duration = None
+            vuln_with_code = 0
+            
+            if results_file.exists() and results_file.stat().st_size > 10:
+                try:
+                    with open(results_file, 'r', encoding='utf-8') as f: 
+                        results_json = json.load(f)
+                    summary_data = results_json.get("summary", {})
+                    risk_counts = summary_data.get("risk_counts", {})
+                    duration = summary_data.get("duration_seconds")
+                    vuln_with_code = summary_data.get("vulnerabilities_with_code", 0)
+                except Exception as read_err:
+                    scan_thread_logger.error(f"Failed to read final summary from results file {results_file}: {read_err}")
+            
+            # Update the scan with final status and metrics
+            current_scan_manager.update_scan(
+                scan_id_thread, 
+                status=final_status, 
+                progress=final_progress, 
+                spider_progress=final_progress, 
+                passive_progress=final_progress, 
+                active_progress=final_progress, 
+                ajax_progress=final_progress, 
+                end_time=datetime.now().isoformat(), 
+                duration_seconds=duration, 
+                vulnerabilities_with_code=vuln_with_code, 
+                high_count=risk_counts.get("High", 0), 
+                medium_count=risk_counts.get("Medium", 0), 
+                low_count=risk_counts.get("Low", 0), 
+                info_count=risk_counts.get("Info", 0)
+            )
+            scan_thread_logger.info(f"Scan {scan_id_thread} final status updated to {final_status}")
+            
+            # Handle code report
+            legacy_report_file = app_dir_thread / ".zap_code_report.md"
+            new_report_file = zap_reports_dir / ".zap_code_report.md"
+            if legacy_report_file.exists() and not new_report_file.exists():
+                try:
+                    shutil.copy2(legacy_report_file, new_report_file)
+                    scan_thread_logger.info(f"Copied legacy code report to new location: {new_report_file}")
+                except Exception as copy_err:
+                    scan_thread_logger.error(f"Failed to copy legacy code report: {copy_err}")
+        except FileNotFoundError as e:
+            scan_thread_logger.error(f"Cannot start scan {scan_id_thread}, directory not found: {e}")
+            get_scan_manager().update_scan(
+                scan_id_thread, 
+                status=ScanState.ERROR.value, 
+                progress=0, 
+                error=f"Directory not found: {e}"
+            )
+        except Exception as e:
+            scan_thread_logger.exception(f"Error during background scan {scan_id_thread}: {e}")
+            get_scan_manager().update_scan(
+                scan_id_thread, 
+                status=ScanState.ERROR.value, 
+                progress=0, 
+                error=str(e)
+            )
+        finally:
+            # Clean up old scans
+            get_scan_manager().cleanup_old_scans()
+            scan_thread_logger.info(f"Background scan thread finished for scan ID: {scan_id_thread}")
+    return succeeded
+
+
+def get_zap_scheduler() -> ZapScanScheduler:
+    """
+    Get or initialize the ZAP scan scheduler on the current application.
+    
+    Returns:
+        ZapScanScheduler instance
+    """
+    if not getattr(current_app, 'zap_scheduler', None):
+        app = current_app._get_current_object()
+        # Each concurrent scan needs its own pooled daemon; without the pool scans must run serially
+        max_concurrency = ZAPConfig.DEFAULT_POOL_SIZE if ZAPConfig.USE_DAEMON_POOL else 1
+        current_app.zap_scheduler = ZapScanScheduler(
+            runner=lambda job: _execute_zap_scan(app, job.scan_id, job.model, job.app_num,
+                                                 job.quick_scan, job.incremental, job.profile),
+            max_concurrency=max_concurrency
+        )
+        current_app.zap_scheduler.start()
+    return current_app.zap_scheduler
+
+
+def _queue_zap_scan(model: str, app_num: int, quick_scan: bool = False,
+                    incremental: bool = False, profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Create a ScanManager entry for an app and queue it on the scheduler.
+    
+    Args:
+        model: Model name
+        app_num: Application number
+        quick_scan: Whether to run a quick scan
+        incremental: Whether to reuse the previous scan's discovery
+        profile: Scan profile name (defaults from quick_scan)
+        
+    Returns:
+        Dictionary with scan ID, status and queue position
+    """
+    scan_manager = get_scan_manager()
+    latest_scan_info = scan_manager.get_latest_scan_for_app(model, app_num)
+    if latest_scan_info:
+        latest_scan_id, latest_scan = latest_scan_info
+        if latest_scan.get("status") in ACTIVE_SCAN_STATES:
+            return {
+                "scan_id": latest_scan_id,
+                "status": latest_scan.get("status"),
+                "queue_position": get_zap_scheduler().queue_position(latest_scan_id),
+                "already_active": True
+            }
+    
+    scan_id = scan_manager.create_scan(
+        model, app_num, {"quick_scan": quick_scan, "incremental": incremental, "profile": profile}
+    )
+    scan_manager.update_scan(scan_id, status=ScanState.QUEUED.value)
+    scheduler = get_zap_scheduler()
+    job = scheduler.submit(scan_id, model, app_num, quick_scan=quick_scan, incremental=incremental, profile=profile)
+    if job.scan_id != scan_id:
+        # The scheduler already holds a job for this app; don't leave our entry stuck in QUEUED
+        scan_manager.delete_scan(scan_id)
+        return {
+            "scan_id": job.scan_id,
+            "status": job.state,
+            "queue_position": scheduler.queue_position(job.scan_id),
+            "already_active": True
+        }
+    return {
+        "scan_id": scan_id,
+        "status": ScanState.QUEUED.value,
+        "queue_position": scheduler.queue_position(scan_id),
+        "already_active": False
+    }
+
+
 @zap_bp.route("/scan/<string:model>/<int:app_num>", methods=["POST"])
 @ajax_compatible
 def start_zap_scan(model: str, app_num: int):
     log_client_request(zap_logger, "Start ZAP scan", model, app_num)
     try:
-        scan_manager = get_scan_manager()
-        
-        # Get latest scan info and check for already running scans
-        latest_scan_info = scan_manager.get_latest_scan_for_app(model, app_num)
-        if latest_scan_info:
-            _, latest_scan = latest_scan_info
-            active_statuses = {ScanState.STARTING.value, ScanState.SPIDERING.value, ScanState.SCANNING.value}
-            if latest_scan.get("status") in active_statuses:
-                zap_logger.warning(f"ZAP scan already in progress for {model}/app{app_num}: Status={latest_scan['status']}")
-                return APIResponse(
-                    success=False, 
-                    error="A scan is already running for this app.", 
-                    code=http.HTTPStatus.CONFLICT
-                )
-        
-        # Create a new scan
-        scan_id = scan_manager.create_scan(model, app_num, {})
-        zap_logger.info(f"Created new scan entry with ID: {scan_id}")
+        data = request.get_json(silent=True) or {}
+        profile = data.get("profile")
+        if profile and profile not in SCAN_PROFILES:
+            return APIResponse(
+                success=False, 
+                error=f"Unknown scan profile '{profile}'. Available: {', '.join(SCAN_PROFILES)}", 
+                code=http.HTTPStatus.BAD_REQUEST
+            )
+        queued = _queue_zap_scan(
+            model, app_num, 
+            quick_scan=bool(data.get("quick_scan", False)), 
+            incremental=bool(data.get("incremental", False)), 
+            profile=profile
+        )
+        if queued["already_active"]:
+            zap_logger.warning(f"ZAP scan already in progress for {model}/app{app_num}: Status={queued['status']}")
+            return APIResponse(
+                success=False, 
+                error="A scan is already running for this app.", 
+                code=http.HTTPStatus.CONFLICT
+            )
+        zap_logger.info(f"Queued scan {queued['scan_id']} at position {queued['queue_position']}")
+        return {"status": "started", "scan_id": queued["scan_id"], "queue_position": queued["queue_position"]}
+    except Exception as e:
+        return handle_route_error(e, zap_logger)
+
+
+@zap_bp.route("/scan_batch", methods=["POST"])
+@ajax_compatible
+def start_zap_scan_batch():
+    """Queue ZAP scans for a list of apps, a whole model, or every app in the corpus."""
+    try:
+        data = request.get_json(silent=True) or {}
+        model = data.get("model")
+        quick_scan = bool(data.get("quick_scan", False))
+        incremental = bool(data.get("incremental", False))
+        profile = data.get("profile")
+        if profile and profile not in SCAN_PROFILES:
+            return APIResponse(
+                success=False, 
+                error=f"Unknown scan profile '{profile}'. Available: {', '.join(SCAN_PROFILES)}", 
+                code=http.HTTPStatus.BAD_REQUEST
+            )
+        zap_logger.info(f"Batch ZAP scan requested (model={model or 'all'}, apps={data.get('apps')})")
         
-        def run_scan_thread(app_context, scan_id_thread, model_thread, app_num_thread):
-            with app_context:
-                scan_thread_logger = create_logger_for_component(f'zap.thread.{model_thread}-{app_num_thread}')
-                scan_thread_logger.info(f"Background scan thread starting for scan ID: {scan_id_thread}")
-                scanner = None
-                try:
-                    base_dir_thread = Path(current_app.config["BASE_DIR"])
-                    app_dir_thread = get_app_directory(current_app, model_thread, app_num_thread)
-                    scan_thread_logger.info(f"Initializing ZAP scanner instance for {model_thread}/app{app_num_thread}")
-                    scanner = create_scanner(base_dir_thread)
-                    scan_thread_logger.info(f"Setting source code root directory to {app_dir_thread}")
-                    scanner.set_source_code_root(str(app_dir_thread))
-                    current_scan_manager = get_scan_manager()
-                    current_scan_manager.update_scan(
-                        scan_id_thread, 
-                        scanner=scanner, 
-                        status=ScanState.STARTING.value, 
-                        progress=0, 
-                        spider_progress=0, 
-                        passive_progress=0, 
-                        active_progress=0, 
-                        ajax_progress=0, 
-                        start_time=datetime.now().isoformat(), 
-                        end_time=None, 
-                        results=None
-                    )
-                    scan_thread_logger.info(f"Starting comprehensive ZAP scan for {model_thread}/app{app_num_thread}")
-                    success = scanner.start_scan(model_thread, app_num_thread)
-                    scan_thread_logger.info(f"Scan finished for {scan_id_thread}. Success reported by scanner: {success}")
-                    
-                    # Check for error state
-                    current_state = current_scan_manager.get_scan_details(scan_id_thread)
-                    if current_state and current_state.get("status") == ScanState.ERROR.value:
-                        final_status = ScanState.ERROR.value
-                    else:
-                        final_status = ScanState.COMPLETE.value if success else ScanState.FAILED.value
-                        
-                    final_progress = 100
-                    
-                    # Ensure the report directory exists and get file paths
-                    zap_reports_dir = base_dir_thread / "zap_reports" / model_thread / f"app{app_num_thread}"
-                    zap_reports_dir.mkdir(parents=True, exist_ok=True)
-                    results_file = zap_reports_dir / ".zap_results.json"
-                    
-                    # Extract metrics from the results file
-                    summary_data = {}
-                    risk_counts = {}
-                    duration = None
-                    vuln_with_code = 0
-                    
-                    if results_file.exists() and results_file.stat().st_size > 10:
-                        try:
-                            with open(results_file, 'r', encoding='utf-8') as f: 
-                                results_json = json.load(f)
-                            summary_data = results_json.get("summary", {})
-                            risk_counts = summary_data.get("risk_counts", {})
-                            duration = summary_data.get("duration_seconds")
-                            vuln_with_code = summary_data.get("vulnerabilities_with_code", 0)
-                        except Exception as read_err:
-                            scan_thread_logger.error(f"Failed to read final summary from results file {results_file}: {read_err}")
-                    
-                    # Update the scan with final status and metrics
-                    current_scan_manager.update_scan(
-                        scan_id_thread, 
-                        status=final_status, 
-                        progress=final_progress, 
-                        spider_progress=final_progress, 
-                        passive_progress=final_progress, 
-                        active_progress=final_progress, 
-                        ajax_progress=final_progress, 
-                        end_time=datetime.now().isoformat(), 
-                        duration_seconds=duration, 
-                        vulnerabilities_with_code=vuln_with_code, 
-                        high_count=risk_counts.get("High", 0), 
-                        medium_count=risk_counts.get("Medium", 0), 
-                        low_count=risk_counts.get("Low", 0), 
-                        info_count=risk_counts.get("Info", 0)
-                    )
-                    scan_thread_logger.info(f"Scan {scan_id_thread} final status updated to {final_status}")
-                    
-                    # Handle code report
-                    legacy_report_file = app_dir_thread / ".zap_code_report.md"
-                    new_report_file = zap_reports_dir / ".zap_code_report.md"
-                    if legacy_report_file.exists() and not new_report_file.exists():
-                        try:
-                            shutil.copy2(legacy_report_file, new_report_file)
-                            scan_thread_logger.info(f"Copied legacy code report to new location: {new_report_file}")
-                        except Exception as copy_err:
-                            scan_thread_logger.error(f"Failed to copy legacy code report: {copy_err}")
-                except FileNotFoundError as e:
-                    scan_thread_logger.error(f"Cannot start scan {scan_id_thread}, directory not found: {e}")
-                    get_scan_manager().update_scan(
-                        scan_id_thread, 
-                        status=ScanState.ERROR.value, 
-                        progress=0, 
-                        error=f"Directory not found: {e}"
-                    )
-                except Exception as e:
-                    scan_thread_logger.exception(f"Error during background scan {scan_id_thread}: {e}")
-                    get_scan_manager().update_scan(
-                        scan_id_thread, 
-                        status=ScanState.ERROR.value, 
-                        progress=0, 
-                        error=str(e)
-                    )
-                finally:
-                    # Clean up old scans
-                    get_scan_manager().cleanup_old_scans()
-                    scan_thread_logger.info(f"Background scan thread finished for scan ID: {scan_id_thread}")
+        if model and data.get("apps"):
+            targets = [(model, int(app_num)) for app_num in data["apps"]]
+        elif model:
+            targets = [(model, app["app_num"]) for app in get_apps_for_model(model)]
+        elif data.get("all"):
+            targets = [(app["model"], app["app_num"]) for app in get_all_apps()]
+        else:
+            return APIResponse(
+                success=False, 
+                error="Specify 'model' (optionally with 'apps') or set 'all' to true.", 
+                code=http.HTTPStatus.BAD_REQUEST
+            )
         
-        # Start the scan thread
-        thread = threading.Thread(
-            target=run_scan_thread, 
-            args=(current_app.app_context(), scan_id, model, app_num), 
-            daemon=True
-        )
-        thread.name = f"zap-scan-{model}-{app_num}"
-        thread.start()
-        zap_logger.info(f"Background scan thread '{thread.name}' started for scan ID {scan_id}.")
+        queued = []
+        for target_model, target_app in targets:
+            result = _queue_zap_scan(
+                target_model, target_app, 
+                quick_scan=quick_scan, incremental=incremental, profile=profile
+            )
+            queued.append({"model": target_model, "app_num": target_app, **result})
         
-        return {"status": "started", "scan_id": scan_id}
+        zap_logger.info(f"Batch ZAP scan queued {sum(1 for q in queued if not q['already_active'])} new scans")
+        return {"status": "queued", "scans": queued, "total": len(queued)}
+    except Exception as e:
+        return handle_route_error(e, zap_logger)
+
+
+@zap_bp.route("/profiles")
+@ajax_compatible
+def zap_scan_profiles():
+    """List scan profiles with their recorded wall-clock and alert-yield statistics."""
+    try:
+        return get_profile_statistics(Path(current_app.config["BASE_DIR"]))
+    except Exception as e:
+        return handle_route_error(e, zap_logger)
+
+
+@zap_bp.route("/queue")
+@ajax_compatible
+def zap_scan_queue():
+    """Report queued, running and recently finished scheduled ZAP scans."""
+    try:
+        return get_zap_scheduler().status()
+    except Exception as e:
+        return handle_route_error(e, zap_logger)
+
+
+@zap_bp.route("/scan/<string:model>/<int:app_num>/events")
+def zap_scan_events(model: str, app_num: int):
+    """Stream phase, progress and alert-count updates for the app's latest scan."""
+    try:
+        latest_scan_info = get_scan_manager().get_latest_scan_for_app(model, app_num)
+        if not latest_scan_info:
+            return APIResponse(
+                success=False, 
+                error=f"No scan found for {model}/app{app_num}", 
+                code=http.HTTPStatus.NOT_FOUND
+            )
+        return event_stream_response(f"zap/{latest_scan_info[0]}")
     except Exception as e:
         return handle_route_error(e, zap_logger)
 
@@ -1025,6 +1261,8 @@ def zap_scan_status(model: str, app_num: int):
         response = default_status.copy()
         response.update({key: scan_state.get(key) for key in default_status if key in scan_state})
         response["scan_id"] = scan_id
+        if response["status"] == ScanState.QUEUED.value:
+            response["queue_position"] = get_zap_scheduler().queue_position(scan_id)
         
         # For completed scans, try to get final counts from results file
         terminal_states = {
@@ -1092,9 +1330,8 @@ def stop_zap_scan(model: str, app_num: int):
             )
             
         scan_id, scan_state = latest_scan_info
-        active_statuses = {ScanState.STARTING.value, ScanState.SPIDERING.value, ScanState.SCANNING.value}
         
-        if scan_state.get("status") not in active_statuses:
+        if scan_state.get("status") not in ACTIVE_SCAN_STATES:
             current_status = scan_state.get("status", "Unknown")
             zap_logger.warning(f"Stop request ignored: Scan {scan_id} is not running (status: {current_status})")
             return APIResponse(
@@ -1104,8 +1341,13 @@ def stop_zap_scan(model: str, app_num: int):
             )
             
         zap_logger.info(f"Attempting to stop scan ID {scan_id} ({model}/app{app_num})")
-        zap_scans = current_app.config.get("ZAP_SCANS", {})
-        stop_zap_scanners(zap_scans)
+        if scan_state.get("status") == ScanState.QUEUED.value:
+            get_zap_scheduler().cancel(scan_id)
+        elif scan_state.get("scanner") is not None:
+            scan_state["scanner"].stop_scan(model=model, app_num=app_num)
+        else:
+            zap_scans = current_app.config.get("ZAP_SCANS", {})
+            stop_zap_scanners(zap_scans)
         
         scan_manager.update_scan(
             scan_id, 
@@ -1155,6 +1397,51 @@ def download_code_report(model: str, app_num: int):
         return handle_route_error(e, zap_logger, url_for('zap.zap_scan_page', model=model, app_num=app_num))
 
 
+def _get_report_scanner(model: str, app_num: int) -> ZAPScanner:
+    """
+    Scanner used to render code reports: the app's latest scan scanner if it
+    is still held by the ScanManager, otherwise one shared instance per app.
+    
+    Args:
+        model: Model name
+        app_num: Application number
+        
+    Returns:
+        ZAPScanner instance (no ZAP daemon is needed for reporting)
+    """
+    latest_scan_info = get_scan_manager().get_latest_scan_for_app(model, app_num)
+    if latest_scan_info and latest_scan_info[1].get("scanner") is not None:
+        return latest_scan_info[1]["scanner"]
+    if not getattr(current_app, 'zap_report_scanner', None):
+        current_app.zap_report_scanner = ZAPScanner(Path(current_app.config["BASE_DIR"]))
+    return current_app.zap_report_scanner
+
+
+_code_report_jobs: Set[str] = set()
+_code_report_jobs_lock = threading.Lock()
+
+
+def _run_code_report_job(scanner: ZAPScanner, broker, channel: str, results_file: Path,
+                         report_file: Path, force: bool) -> None:
+    """Background worker for regenerate_code_report; reports progress on channel."""
+    try:
+        broker.publish(channel, "progress", {"status": "running", "groups_written": 0})
+        meta = scanner.regenerate_code_report(
+            results_file, report_file, force=force,
+            progress_callback=lambda **fields: broker.publish(channel, "progress", dict(fields, status="running"))
+        )
+        broker.publish(channel, "complete", dict(meta, status="complete"), final=True)
+        zap_logger.info(
+            f"Code report written to '{report_file}' with {meta.get('vulnerabilities_with_code', 0)} code-related findings."
+        )
+    except Exception as e:
+        zap_logger.exception(f"Code report generation failed for {report_file}: {e}")
+        broker.publish(channel, "error", {"status": "error", "error": str(e)}, final=True)
+    finally:
+        with _code_report_jobs_lock:
+            _code_report_jobs.discard(channel)
+
+
 @zap_bp.route("/regenerate_code_report/<string:model>/<int:app_num>", methods=["POST"])
 @ajax_compatible
 def regenerate_code_report(model: str, app_num: int):
@@ -1164,7 +1451,8 @@ def regenerate_code_report(model: str, app_num: int):
         report_dir = get_safe_path(base_dir, "zap_reports", model, f"app{app_num}")
         report_dir.mkdir(parents=True, exist_ok=True)
         results_file = get_safe_path(report_dir, ".zap_results.json")
-        report_file_path = get_safe_path(report_dir, ".zap_code_report.md")
+        report_file_path = get_safe_path(report_dir, ZAPConfig.CODE_REPORT_FILE)
+        force = (request.get_json(silent=True) or {}).get("force", request.args.get("force") == "true")
         
         # Look for results file in various locations
         if not results_file.is_file() or results_file.stat().st_size < 10:
@@ -1182,67 +1470,56 @@ def regenerate_code_report(model: str, app_num: int):
                     code=http.HTTPStatus.NOT_FOUND
                 )
                 
-        zap_logger.info(f"Reading scan results from {results_file}")
+        scanner = _get_report_scanner(model, app_num)
+        if not force:
+            cached = scanner.cached_code_report(results_file, report_file_path)
+            if cached:
+                zap_logger.info(f"Code report for {model}/app{app_num} is current, not regenerating")
+                return {
+                    "success": True, 
+                    "cached": True, 
+                    "message": f"Code report is up to date with {cached.get('vulnerabilities_with_code', 0)} code-related findings.", 
+                    "vulnerabilities_with_code": cached.get("vulnerabilities_with_code", 0)
+                }
         
-        try:
-            with open(results_file, 'r', encoding='utf-8') as f: 
-                data = json.load(f)
-        except json.JSONDecodeError as json_err:
-            zap_logger.error(f"Failed to parse JSON from results file: {json_err}")
-            return APIResponse(
-                success=False, 
-                error=f"Invalid JSON in results file: {json_err}", 
-                code=http.HTTPStatus.INTERNAL_SERVER_ERROR
-            )
-        except Exception as read_err:
-            zap_logger.error(f"Error reading results file: {read_err}")
-            return APIResponse(
-                success=False, 
-                error=f"Error reading results file: {read_err}", 
-                code=http.HTTPStatus.INTERNAL_SERVER_ERROR
+        channel = f"report/{model}/app{app_num}"
+        with _code_report_jobs_lock:
+            already_running = channel in _code_report_jobs
+            _code_report_jobs.add(channel)
+        if not already_running:
+            zap_logger.info(f"Generating code report for {model}/app{app_num} from {results_file} in the background")
+            worker = threading.Thread(
+                target=_run_code_report_job,
+                args=(scanner, get_progress_broker(), channel, results_file, report_file_path, force),
+                name=f"code-report-{model}-{app_num}",
+                daemon=True
             )
-        
-        alerts_raw = data.get("alerts", [])
-        if not alerts_raw and "summary" in data and "alerts" in data["summary"]:
-            alerts_raw = data["summary"]["alerts"]
-            
-        if not alerts_raw: 
-            zap_logger.warning(f"No alerts array found in scan results for {model}/app{app_num}")
-            
-        vulnerabilities_obj = []
-        for alert_dict in alerts_raw:
-            try:
-                affected_code_dict = alert_dict.get("affected_code")
-                affected_code_obj = None
-                if affected_code_dict and isinstance(affected_code_dict, dict):
-                    affected_code_obj = CodeContext(**affected_code_dict)
-                alert_dict_copy = alert_dict.copy()
-                alert_dict_copy.pop("affected_code", None)
-                vuln_obj = ZapVulnerability(affected_code=affected_code_obj, **alert_dict_copy)
-                vulnerabilities_obj.append(vuln_obj)
-            except TypeError as te: 
-                zap_logger.warning(f"Skipping alert due to TypeError during reconstruction: {te} | Alert data: {alert_dict}")
-            except Exception as recon_err: 
-                zap_logger.warning(f"Skipping alert due to unexpected error during reconstruction: {recon_err} | Alert data: {alert_dict}")
-                
-        if not vulnerabilities_obj: 
-            zap_logger.warning(f"No valid vulnerabilities could be reconstructed for {model}/app{app_num}")
-            
-        scanner = create_scanner(base_dir)
-        zap_logger.info(f"Generating code report content for {model}/app{app_num}")
-        report_content = scanner.generate_affected_code_report(vulnerabilities_obj, str(report_file_path))
-        vulnerabilities_with_code = sum(1 for v in vulnerabilities_obj if v.affected_code and v.affected_code.snippet)
-        
-        zap_logger.info(f"Code report regenerated to '{report_file_path}' with {vulnerabilities_with_code} code-related findings.")
+            worker.start()
         return {
             "success": True, 
-            "message": f"Code report regenerated successfully with {vulnerabilities_with_code} code-related findings.", 
-            "vulnerabilities_with_code": vulnerabilities_with_code
+            "cached": False, 
+            "status": "running", 
+            "message": "Code report generation already in progress." if already_running else "Code report generation started.", 
+            "channel": channel, 
+            "status_url": url_for('zap.code_report_status', model=model, app_num=app_num)
         }
     except Exception as e:
         return handle_route_error(e, zap_logger)
 
 
+@zap_bp.route("/code_report/<string:model>/<int:app_num>/status")
+@ajax_compatible
+def code_report_status(model: str, app_num: int):
+    """Latest progress event of the background code report job for an app."""
+    try:
+        latest = get_progress_broker().latest(f"report/{model}/app{app_num}")
+        if not latest:
+            return {"status": "idle"}
+        return dict(latest["data"], time=latest["time"])
+    except Exception as e:
+        return handle_route_error(e, zap_logger)
+
+
 @analysis_bp.route("/backend-security/<string:model>/<int:app_num>")
 @ajax_compatible
 def security_analysis(model: str, app_num: int):
@@ -1478,28 +1755,24 @@ def get_tester():
     return current_app.performance_tester
 
 
-def get_app_info(port: int) -> Dict[str, Any]:
+def _port_app_info(model: str, port: int) -> Dict[str, Any]:
     """
-    Get application info from a port number.
+    Resolve the app behind a performance route's port.
     
     Args:
-        port: Port number
+        model: Model name; ports are allocated in per-model blocks
+        port: Frontend or backend port of the app
         
     Returns:
-        Dictionary with app info
+        Dictionary with app_num (None if the port is outside the model's block) and base_dir
     """
     base_dir = Path(current_app.config.get("BASE_DIR", "."))
-    app_num = None
-    base_port = current_app.config.get("BASE_FRONTEND_PORT", 5501)
-    ports_per_app = current_app.config.get("PORTS_PER_APP", 2)
-    
-    port_offset = port - base_port
-    if port_offset >= 0:
-        app_num = (port_offset // ports_per_app) + 1
-        perf_logger.debug(f"Derived app_num={app_num} from port={port}")
+    model_idx = get_model_index(model)
+    app_num = PortManager.get_app_num_for_port(model_idx, port) if model_idx is not None else None
+    if app_num:
+        perf_logger.debug(f"Derived app_num={app_num} from {model} port={port}")
     else:
-        perf_logger.warning(f"Port {port} is below base port {base_port}, cannot derive app_num")
-        
+        perf_logger.warning(f"Port {port} is not in the port block of model {model}, cannot derive app_num")
     return {"app_num": app_num, "base_dir": base_dir}
 
 
@@ -1512,7 +1785,7 @@ def performance_test(model: str, port: int):
         try:
             # Get required services and info
             tester = get_tester()
-            app_info = get_app_info(port)
+            app_info = _port_app_info(model, port)
             app_num = app_info["app_num"]
             
             # Parse JSON input and validate
@@ -1530,21 +1803,37 @@ def performance_test(model: str, port: int):
                 num_users = int(data.get("num_users", 10))
                 duration = int(data.get("duration", 30))
                 spawn_rate = int(data.get("spawn_rate", 1))
+                # Local Locust worker processes; "auto" sizes to the CPU count
+                workers = data.get("workers", 0)
+                workers = -1 if workers == "auto" else int(workers or 0)
             except (ValueError, TypeError) as err:
                 raise BadRequest(f"Invalid numeric parameter: {err}")
                 
             if not (num_users > 0 and duration > 0 and spawn_rate > 0):
                 raise BadRequest("Test parameters must be positive integers")
                 
-            # Get and validate endpoints
+            # Get and validate endpoints; "routes" targets every backend route parsed from the app source,
+            # "scenarios" runs multi-step user flows derived from those routes and requirements.json
+            host_url = f"http://localhost:{port}"
             endpoints_raw = data.get("endpoints", [{"path": "/", "method": "GET", "weight": 1}])
+            if data.get("use_scenarios"):
+                endpoints_raw = "scenarios"
+            if endpoints_raw in ("routes", "scenarios") or data.get("use_routes"):
+                if not app_num:
+                    raise BadRequest(f"Cannot determine app number from port {port}")
+                endpoints_raw = _app_load_endpoints(model, app_num, endpoints_raw)
+                backend_port = PortManager.get_app_ports(get_model_index(model), app_num)["backend"]
+                host_url = f"http://localhost:{backend_port}"
+                perf_logger.info(f"Using {len(endpoints_raw)} endpoints extracted from Flask routes against {host_url}")
             if not endpoints_raw:
                 raise BadRequest("At least one endpoint must be provided")
                 
             # Format endpoints
             formatted_endpoints = []
             for ep in endpoints_raw:
-                if isinstance(ep, dict) and "path" in ep:
+                if isinstance(ep, dict) and is_scenario(ep) and isinstance(ep["steps"], list):
+                    formatted_endpoints.append(ep)
+                elif isinstance(ep, dict) and "path" in ep:
                     ep_copy = ep.copy()
                     ep_copy['method'] = ep_copy.get('method', 'GET').upper()
                     try:
@@ -1557,20 +1846,31 @@ def performance_test(model: str, port: int):
             
             # Run the test
             test_name = f"{model}_{port}"
-            host_url = f"http://localhost:{port}"
             
-            perf_logger.info(f"Running test with {num_users} users, {spawn_rate} spawn rate, {duration}s duration")
-            result = tester.run_test_library(
-                test_name=test_name, 
-                host=host_url, 
-                endpoints=formatted_endpoints, 
-                user_count=num_users, 
-                spawn_rate=spawn_rate, 
-                run_time=duration, 
-                generate_graphs=True, 
-                model=model, 
-                app_num=app_num
+            perf_logger.info(
+                f"Running test with {num_users} users, {spawn_rate} spawn rate, {duration}s duration, "
+                f"{tester.resolve_worker_count(workers)} workers"
             )
+            broker = get_progress_broker()
+            channel = f"perf/{test_name}"
+            try:
+                result = tester.run_test_library(
+                    test_name=test_name, 
+                    host=host_url, 
+                    endpoints=formatted_endpoints, 
+                    user_count=num_users, 
+                    spawn_rate=spawn_rate, 
+                    run_time=duration, 
+                    generate_graphs=True, 
+                    model=model, 
+                    app_num=app_num, 
+                    progress_callback=lambda stats: broker.publish(channel, "progress", stats), 
+                    workers=workers
+                )
+            except Exception as run_err:
+                broker.publish(channel, "error", {"error": str(run_err)}, final=True)
+                raise
+            broker.publish(channel, "complete", tester.get_performance_summary(result), final=True)
             
             return {
                 "status": "success", 
@@ -1583,7 +1883,7 @@ def performance_test(model: str, port: int):
     # GET request - show form
     try:
         log_client_request(perf_logger, "Performance test form", model)
-        app_info = get_app_info(port)
+        app_info = _port_app_info(model, port)
         app_num = app_info["app_num"]
         base_dir = app_info["base_dir"]
         last_result = None
@@ -1610,12 +1910,405 @@ def performance_test(model: str, port: int):
         return handle_route_error(e, perf_logger)
 
 
+def get_campaign_runner() -> CampaignRunner:
+    """Get or initialize the load-test campaign runner on the current application."""
+    if not getattr(current_app, 'performance_campaigns', None):
+        broker = get_progress_broker()
+        current_app.performance_campaigns = CampaignRunner(
+            output_dir=get_tester().output_dir,
+            publish=lambda channel, event, data, final: broker.publish(channel, event, data, final=final)
+        )
+    return current_app.performance_campaigns
+
+
+def _parse_app_numbers(apps: Any) -> List[int]:
+    """Accept a list of app numbers or a range string such as "1-5,8"."""
+    if isinstance(apps, list):
+        return sorted({int(app) for app in apps})
+    app_nums: Set[int] = set()
+    for part in str(apps).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = sorted(map(int, part.split("-", 1)))
+            app_nums.update(range(start, end + 1))
+        else:
+            app_nums.add(int(part))
+    return sorted(app_nums)
+
+
+def _app_load_endpoints(model: str, app_num: int, mode: str) -> List[Dict[str, Any]]:
+    """
+    Endpoint configs for an app built from its backend source.
+    
+    Args:
+        model: Model name
+        app_num: Application number
+        mode: "scenarios" for multi-step user flows, anything else for one task per route
+        
+    Returns:
+        Endpoint configs understood by UserGenerator
+    """
+    app_dir = get_app_directory(current_app, model, app_num)
+    routes = extract_app_routes(app_dir)
+    if mode == "scenarios":
+        scenarios = build_scenarios(routes, load_app_requirements(app_dir, app_num))
+        # Setup-only profiles (e.g. just register/login) still need a task to run
+        if any(not scenario.get("on_start") for scenario in scenarios):
+            return scenarios
+        return scenarios + routes_to_locust_endpoints(routes)
+    return routes_to_locust_endpoints(routes)
+
+
+def _resolve_campaign_targets(target_specs: List[Dict[str, Any]], endpoints: Any) -> List[CampaignTarget]:
+    """
+    Turn campaign target specs into backend hosts and endpoint lists.
+    
+    Args:
+        target_specs: [{"model": ..., "apps": [..] or "1-5"}]; apps defaults to every app of the model
+        endpoints: Endpoint configs for every app, "routes" to use each app's extracted Flask routes,
+            or "scenarios" for user flows derived from them
+        
+    Returns:
+        List of CampaignTarget
+    """
+    targets = []
+    for spec in target_specs:
+        model = spec.get("model")
+        model_index = get_model_index(model) if model else None
+        if model_index is None:
+            raise BadRequest(f"Unknown model: {model}")
+        if spec.get("apps"):
+            app_nums = _parse_app_numbers(spec["apps"])
+        else:
+            app_nums = sorted(app["app_num"] for app in get_apps_for_model(model))
+        for app_num in app_nums:
+            target_endpoints = endpoints
+            if endpoints in ("routes", "scenarios"):
+                target_endpoints = _app_load_endpoints(model, app_num, endpoints)
+            backend_port = PortManager.get_app_ports(model_index, app_num)["backend"]
+            targets.append(CampaignTarget(
+                model=model,
+                app_num=app_num,
+                host=f"http://localhost:{backend_port}",
+                endpoints=target_endpoints or [{"path": "/", "method": "GET", "weight": 1}]
+            ))
+    return targets
+
+
+def _parse_capacity_params(data: Any) -> Dict[str, Any]:
+    """Validate capacity-search settings (run_capacity_search keyword arguments)."""
+    if data is True:
+        data = {}
+    if not isinstance(data, dict):
+        raise BadRequest("'capacity' must be an object of search settings")
+    try:
+        params = {
+            "slo_p95_ms": float(data.get("slo_p95_ms", 500)),
+            "slo_failure_rate": float(data.get("slo_failure_rate", 1.0)),
+            "start_users": int(data.get("start_users", 5)),
+            "step_users": int(data.get("step_users", 5)),
+            "step_duration": int(data.get("step_duration", 15)),
+            "max_users": int(data.get("max_users", 200)),
+        }
+    except (ValueError, TypeError) as err:
+        raise BadRequest(f"Invalid capacity parameter: {err}")
+    if min(params.values()) <= 0 or params["max_users"] < params["start_users"]:
+        raise BadRequest("Capacity parameters must be positive and max_users >= start_users")
+    if params["step_duration"] < 4:
+        raise BadRequest("step_duration must be at least 4 seconds")
+    return params
+
+
+@performance_bp.route("/<string:model>/<int:port>/capacity", methods=["POST"])
+@ajax_compatible
+def performance_capacity(model: str, port: int):
+    """
+    Ramp users in steps until p95 latency or failures break the SLO, or throughput
+    stops growing, and report the max sustainable RPS for this app.
+    
+    The search can take many minutes, so it runs as a single-app capacity campaign
+    in the background; follow it on the returned channel or the campaign URL.
+    """
+    log_client_request(perf_logger, "Capacity search", model)
+    try:
+        app_num = _port_app_info(model, port)["app_num"]
+        if not app_num:
+            raise BadRequest(f"Cannot determine app number from port {port}")
+        data = request.get_json(silent=True) or {}
+        params = _parse_capacity_params(data)
+        targets = _resolve_campaign_targets(
+            [{"model": model, "apps": [app_num]}], data.get("endpoints", "routes")
+        )
+        if not targets:
+            raise BadRequest(f"No app {model}/app{app_num} found")
+        
+        runner = get_campaign_runner()
+        campaign = runner.create(targets[:1], capacity=params)
+        runner.start(campaign)
+        perf_logger.info(f"Started capacity search for {model}/app{app_num} as campaign {campaign.id}")
+        return {
+            "success": True, 
+            "message": f"Capacity search started for {model}/app{app_num}", 
+            "campaign": campaign.to_dict(include_rows=False), 
+            "channel": f"campaign/{campaign.id}", 
+            "status_url": url_for('performance.get_performance_campaign', campaign_id=campaign.id)
+        }
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/capacity", methods=["GET"])
+@ajax_compatible
+def performance_capacity_overview():
+    """Latest max sustainable RPS per app, with a per-model comparison."""
+    try:
+        tester = get_tester()
+        results = tester.load_capacity_results()
+        return {
+            "apps": [
+                {k: r.get(k) for k in (
+                    "model", "app_num", "max_sustainable_rps", "max_sustainable_users", "knee_users",
+                    "stop_reason", "slo_p95_ms", "slo_failure_rate", "end_time", "test_name"
+                )}
+                for r in results
+            ],
+            "models": tester.summarize_capacity(results)
+        }
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/campaign", methods=["POST"])
+@ajax_compatible
+def start_performance_campaign():
+    """Run one load profile across many apps; results land in one consolidated table."""
+    perf_logger.info("Performance campaign requested")
+    try:
+        data = request.get_json(silent=True) or {}
+        target_specs = data.get("targets") or [{"model": model} for model in data.get("models", [])]
+        if not target_specs:
+            raise BadRequest("Provide 'targets' ([{model, apps}]) or 'models'")
+        try:
+            num_users = int(data.get("num_users", 10))
+            duration = int(data.get("duration", 30))
+            spawn_rate = int(data.get("spawn_rate", 1))
+            concurrency = int(data.get("concurrency", 1))
+            workers = data.get("workers", 0)
+            workers = -1 if workers == "auto" else int(workers or 0)
+        except (ValueError, TypeError) as err:
+            raise BadRequest(f"Invalid numeric parameter: {err}")
+        if not (num_users > 0 and duration > 0 and spawn_rate > 0 and concurrency > 0):
+            raise BadRequest("Campaign parameters must be positive integers")
+            
+        try:
+            targets = _resolve_campaign_targets(target_specs, data.get("endpoints", "routes"))
+        except ValueError as err:
+            raise BadRequest(f"Invalid app selection: {err}")
+        if not targets:
+            raise BadRequest("No apps matched the campaign targets")
+            
+        capacity = _parse_capacity_params(data["capacity"]) if data.get("capacity") else None
+        runner = get_campaign_runner()
+        campaign = runner.create(
+            targets, user_count=num_users, spawn_rate=spawn_rate, run_time=duration,
+            concurrency=concurrency, workers=workers, capacity=capacity
+        )
+        runner.start(campaign)
+        perf_logger.info(f"Started campaign {campaign.id} over {len(targets)} apps (concurrency {campaign.concurrency})")
+        return {
+            "success": True, 
+            "campaign": campaign.to_dict(include_rows=False), 
+            "channel": f"campaign/{campaign.id}"
+        }
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/campaigns", methods=["GET"])
+@ajax_compatible
+def list_performance_campaigns():
+    try:
+        return {"campaigns": get_campaign_runner().list_campaigns()}
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/campaign/<string:campaign_id>", methods=["GET"])
+@ajax_compatible
+def get_performance_campaign(campaign_id: str):
+    """Campaign status, per-app results table and per-model comparison."""
+    try:
+        campaign = get_campaign_runner().get(campaign_id)
+        if not campaign:
+            return APIResponse(
+                success=False, 
+                error=f"Campaign {campaign_id} not found", 
+                code=http.HTTPStatus.NOT_FOUND
+            )
+        return {"campaign": campaign.to_dict()}
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/campaign/<string:campaign_id>/cancel", methods=["POST"])
+@ajax_compatible
+def cancel_performance_campaign(campaign_id: str):
+    try:
+        if not get_campaign_runner().cancel(campaign_id):
+            return APIResponse(
+                success=False, 
+                error=f"Campaign {campaign_id} is not running", 
+                code=http.HTTPStatus.BAD_REQUEST
+            )
+        return {"success": True, "message": "Remaining apps will be skipped."}
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/<string:model>/<int:port>/events", methods=["GET"])
+def performance_test_events(model: str, port: int):
+    """Stream live Locust statistics for the test running against this port."""
+    return event_stream_response(f"perf/{model}_{port}")
+
+
+@performance_bp.route("/<string:model>/<int:port>/latency", methods=["GET"])
+@ajax_compatible
+def performance_latency(model: str, port: int):
+    """
+    Arbitrary latency percentiles from stored histograms, without re-running tests.
+    
+    Query parameters: p (comma-separated percentiles), endpoint ("<METHOD> <name>",
+    default all series) and runs (comma-separated report ids to merge; default latest run).
+    """
+    try:
+        tester = get_tester()
+        app_num = _port_app_info(model, port)["app_num"]
+        try:
+            percentiles = [float(p) for p in request.args.get("p", "50,90,95,99,99.9").split(",") if p.strip()]
+        except ValueError as err:
+            raise BadRequest(f"Invalid percentile: {err}")
+        if any(not 0 <= p <= 100 for p in percentiles):
+            raise BadRequest("Percentiles must be between 0 and 100")
+        report_ids = [r for r in request.args.get("runs", "").split(",") if r.strip()]
+        
+        histograms = tester.load_latency_histograms(model, app_num, report_ids or None)
+        if histograms is None:
+            return APIResponse(
+                success=False, 
+                error="No latency histograms stored for this app", 
+                code=http.HTTPStatus.NOT_FOUND
+            )
+        endpoint = request.args.get("endpoint")
+        if endpoint:
+            histogram = histograms.get(endpoint)
+            if histogram is None:
+                return APIResponse(
+                    success=False, 
+                    error=f"No histogram for endpoint '{endpoint}'", 
+                    code=http.HTTPStatus.NOT_FOUND
+                )
+            return {"endpoint": endpoint, "runs": report_ids, **histogram.summary(percentiles)}
+        return {"runs": report_ids, "series": histograms.summary(percentiles)}
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/<string:model>/<int:port>/regressions", methods=["GET"])
+@ajax_compatible
+def performance_regressions(model: str, port: int):
+    """Indexed runs of an app with their regression verdicts; ?profile= limits to one load profile."""
+    try:
+        detector = get_tester().regression_detector
+        app_num = _port_app_info(model, port)["app_num"]
+        if not app_num:
+            raise BadRequest(f"Cannot determine app number from port {port}")
+        runs = detector.history(model, app_num, request.args.get("profile") or None)
+        return {
+            "model": model,
+            "app_num": app_num,
+            "profiles": detector.profiles(model, app_num),
+            "runs": [asdict(run) for run in reversed(runs)]
+        }
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/regression/<string:report_id>", methods=["GET"])
+@ajax_compatible
+def performance_regression(report_id: str):
+    """
+    Compare a stored run with its history.
+
+    Query parameters: baseline (comma-separated report ids; default the preceding
+    runs with the same load profile), count (baseline runs, default 5),
+    threshold (percent change to flag, default 5) and confidence (default 0.95).
+    """
+    try:
+        detector = get_tester().regression_detector
+        record = detector.get(report_id)
+        if record is None:
+            raise NotFound(f"No indexed run '{report_id}'")
+        try:
+            count = int(request.args.get("count", 5))
+            threshold = float(request.args.get("threshold", 5.0))
+            confidence = float(request.args.get("confidence", 0.95))
+        except ValueError as err:
+            raise BadRequest(f"Invalid numeric parameter: {err}")
+        if count < 1 or threshold < 0 or not 0.5 <= confidence < 1:
+            raise BadRequest("count must be positive, threshold non-negative and confidence in [0.5, 1)")
+        baseline_ids = [b for b in request.args.get("baseline", "").split(",") if b.strip()]
+        report = detector.compare(
+            record,
+            baseline_ids=baseline_ids or None,
+            baseline_count=count,
+            threshold_pct=threshold,
+            confidence=confidence
+        )
+        return report.to_dict()
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/charts/<string:report_id>/timeseries", methods=["GET"])
+@ajax_compatible
+def chart_timeseries(report_id: str):
+    """Stored time series of a run, for charts drawn in the browser."""
+    try:
+        timeseries = get_tester().load_timeseries(report_id)
+        if timeseries is None:
+            raise NotFound("No time series stored for this run")
+        return timeseries
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+
+
+@performance_bp.route("/charts/<string:report_id>/<string:chart_id>.png", methods=["GET"])
+def chart_image(report_id: str, chart_id: str):
+    """Serve a run's chart PNG, rendering it in the background on first view."""
+    try:
+        png_path = get_tester().render_chart(report_id, chart_id)
+    except TimeoutError as e:
+        perf_logger.info(str(e))
+        response = jsonify({"success": False, "error": "Chart is still rendering"})
+        response.status_code = http.HTTPStatus.ACCEPTED
+        response.headers["Retry-After"] = "2"
+        return response
+    except Exception as e:
+        return handle_route_error(e, perf_logger)
+    if png_path is None:
+        return jsonify({"success": False, "error": "Chart not found"}), http.HTTPStatus.NOT_FOUND
+    return send_file(png_path, mimetype="image/png", max_age=3600)
+
+
 @performance_bp.route("/<string:model>/<int:port>/reports", methods=["GET"])
 @ajax_compatible
 def list_reports(model: str, port: int):
     log_client_request(perf_logger, "List performance reports", model)
     try:
-        app_info = get_app_info(port)
+        tester = get_tester()
+        app_info = _port_app_info(model, port)
         base_dir = app_info["base_dir"]
         app_num = app_info["app_num"]
         reports_dir = base_dir / "performance_reports"
@@ -1640,9 +2333,10 @@ def list_reports(model: str, port: int):
             except ValueError:
                 pass
                 
-            # Find graph files
-            graphs = []
-            for graph_file in test_dir.glob("*.png"):
+            # Charts come from the stored time series; older runs have pre-rendered PNGs
+            graphs = tester.chart_links(report_id)
+            timeseries_url = url_for('.chart_timeseries', report_id=report_id) if graphs else None
+            for graph_file in ([] if graphs else test_dir.glob("*.png")):
                 try:
                     relative_path = graph_file.relative_to(base_dir)
                     graphs.append({
@@ -1682,6 +2376,7 @@ def list_reports(model: str, port: int):
                 "timestamp_str": timestamp_str, 
                 "created": formatted_time, 
                 "graphs": graphs, 
+                "timeseries_url": timeseries_url, 
                 "has_consolidated_json": json_path is not None, 
                 "results_url": json_url
             })
@@ -1751,7 +2446,7 @@ def _get_report_data(model: str, port: int, report_id: str, strict_validation: b
     Returns:
         The report data, or None if not found
     """
-    app_info = get_app_info(port)
+    app_info = _port_app_info(model, port)
     app_num = app_info.get("app_num")
     base_dir = app_info.get("base_dir")
     
@@ -1838,7 +2533,7 @@ def delete_report(model: str, port: int, report_id: str):
         if not report_id.startswith(expected_prefix) or ".." in report_id or report_id.startswith('/'):
             raise BadRequest("Invalid Report ID")
             
-        app_info = get_app_info(port)
+        app_info = _port_app_info(model, port)
         base_dir = app_info["base_dir"]
         
         # Path validation and deletion
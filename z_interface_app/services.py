@@ -1,6 +1,8 @@
 import enum
+import itertools
 import json
 import os
+import queue
 import sqlite3
 import subprocess
 import threading
@@ -8,12 +10,18 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union, cast, TypeVar, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import OrderedDict, deque
 
 import docker
 from docker.errors import NotFound
 from docker.models.containers import Container
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 from logging_service import create_logger_for_component
 
 # Define TypeVar for generic functions
@@ -71,11 +79,19 @@ class Config:
     PORTS_PER_APP = safe_int_env("PORTS_PER_APP", 2)
     BUFFER_PORTS = safe_int_env("BUFFER_PORTS", 20)
     APPS_PER_MODEL = safe_int_env("APPS_PER_MODEL", 30)
+    ZAP_MAX_CONCURRENT_SCANS = safe_int_env("ZAP_MAX_CONCURRENT_SCANS", 0)  # 0 = derive from resources
+    ZAP_SCAN_MEMORY_MB = safe_int_env("ZAP_SCAN_MEMORY_MB", 3072)
+    ZAP_SCAN_CPUS = safe_int_env("ZAP_SCAN_CPUS", 2)
+    ZAP_SCHEDULER_POLL_SECONDS = safe_int_env("ZAP_SCHEDULER_POLL_SECONDS", 5)
+    PROGRESS_HEARTBEAT_SECONDS = safe_int_env("PROGRESS_HEARTBEAT_SECONDS", 15)
+    PROGRESS_SUBSCRIBER_QUEUE = safe_int_env("PROGRESS_SUBSCRIBER_QUEUE", 256)
+    PROGRESS_FINISHED_RETAINED = safe_int_env("PROGRESS_FINISHED_RETAINED", 256)
 
 
 class ScanStatus(enum.Enum):
     """Enum representing the status of a security scan."""
     NOT_RUN = "Not Run"
+    QUEUED = "Queued"
     STARTING = "Starting"
     SPIDERING = "Spidering"
     SCANNING = "Scanning"
@@ -554,6 +570,15 @@ class PortManager:
         # )
         return ports
 
+    @classmethod
+    def get_app_num_for_port(cls, model_idx: int, port: int) -> Optional[int]:
+        """Get the 1-based app number owning a frontend or backend port within a model's block."""
+        rng = cls.get_port_range(model_idx)
+        for side in ("frontend", "backend"):
+            if rng[side]["start"] <= port < rng[side]["end"]:
+                return (port - rng[side]["start"]) // Config.PORTS_PER_APP + 1
+        return None
+
     @classmethod
     def set_model_index_cache(cls, model_name_to_index: Dict[str, int]) -> None:
         """Set the model index cache for more efficient lookups."""
@@ -566,12 +591,143 @@ class PortManager:
         return cls._model_index_cache.get(model_name)
 
 
+class ProgressBroker:
+    """
+    In-process publish/subscribe hub for progress of long-running work.
+
+    Producers (ZAP scans, batch jobs, Locust runs) publish events to a channel
+    such as ``zap/<scan_id>``; each streaming client gets its own bounded queue
+    primed with the channel's latest event. A full queue drops its oldest event,
+    since every event carries a complete snapshot.
+
+    A final event closes its channel: new subscribers are no longer primed
+    with it (channel names such as ``perf/<model>_<port>`` are reused by the
+    next run), and only the last ``finished_retained`` final events are kept
+    for status lookups through latest().
+    """
+    def __init__(self, queue_size: int = Config.PROGRESS_SUBSCRIBER_QUEUE,
+                 finished_retained: int = Config.PROGRESS_FINISHED_RETAINED):
+        self.logger = create_logger_for_component('progress_broker')
+        self._queue_size = queue_size
+        self._finished_retained = finished_retained
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._finished: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sequence = itertools.count(1)
+
+    def _message(self, channel: str, event: str, data: Dict[str, Any], final: bool) -> Dict[str, Any]:
+        return {
+            "id": next(self._sequence),
+            "channel": channel,
+            "event": event,
+            "final": final,
+            "time": datetime.now().isoformat(),
+            "data": data,
+        }
+
+    def publish(self, channel: str, event: str, data: Dict[str, Any], final: bool = False) -> None:
+        """Publish an event to every subscriber of channel."""
+        message = self._message(channel, event, data, final)
+        with self._lock:
+            if final:
+                self._latest.pop(channel, None)
+                self._finished[channel] = message
+                self._finished.move_to_end(channel)
+                while len(self._finished) > self._finished_retained:
+                    self._finished.popitem(last=False)
+            else:
+                self._latest[channel] = message
+                self._finished.pop(channel, None)
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            self._offer(subscriber, message)
+
+    def _offer(self, subscriber: queue.Queue, message: Dict[str, Any]) -> None:
+        while True:
+            try:
+                subscriber.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def subscribe(self, channel: str) -> queue.Queue:
+        subscriber: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(subscriber)
+            latest = self._latest.get(channel)
+        if latest:
+            self._offer(subscriber, latest)
+        return subscriber
+
+    def unsubscribe(self, channel: str, subscriber: queue.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(channel, None)
+
+    def latest(self, channel: str) -> Optional[Dict[str, Any]]:
+        """Latest event of a channel, including its final event if it has finished."""
+        with self._lock:
+            return self._latest.get(channel) or self._finished.get(channel)
+
+    def channels(self) -> Dict[str, int]:
+        """Open channels with their current subscriber counts."""
+        with self._lock:
+            return {channel: len(self._subscribers.get(channel, ())) for channel in self._latest}
+
+    def stream(self, channel: str, heartbeat: float = Config.PROGRESS_HEARTBEAT_SECONDS,
+               snapshot: Optional[Callable[[], Optional[Tuple[Dict[str, Any], bool]]]] = None):
+        """
+        Yield Server-Sent Events for channel until a final event is sent.
+
+        Heartbeat comments keep proxies from closing idle connections.
+        snapshot, if given, returns the producer's current (data, final) state; it is
+        taken after subscribing and sent first as a "progress" event, so a client that
+        connects after the final event still gets the outcome instead of waiting forever.
+        """
+        subscriber = self.subscribe(channel)
+        try:
+            current = snapshot() if snapshot else None
+            if current:
+                data, final = current
+                message = self._message(channel, "progress", data, final)
+                yield f"id: {message['id']}\nevent: {message['event']}\ndata: {json.dumps(message, default=str)}\n\n"
+                if final:
+                    return
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.dumps(message, default=str)
+                yield f"id: {message['id']}\nevent: {message['event']}\ndata: {payload}\n\n"
+                if message.get("final"):
+                    return
+        finally:
+            self.unsubscribe(channel, subscriber)
+
+
 class ScanManager:
     """Manage security scanning operations and their results."""
-    def __init__(self):
+    # Fields that are safe and useful to push to progress streams
+    PROGRESS_FIELDS = (
+        "status", "progress", "phase", "spider_progress", "passive_progress", "active_progress",
+        "ajax_progress", "ajax_urls", "alert_count", "passive_records", "high_count", "medium_count", "low_count",
+        "info_count", "start_time", "end_time", "error", "model", "app_num",
+    )
+
+    def __init__(self, broker: Optional[ProgressBroker] = None):
         self.logger = create_logger_for_component('scan_manager')
         self.scans: Dict[str, Dict[str, Any]] = {}
         self._lock = threading.Lock()
+        self.broker = broker
         self.logger.info("Scan manager initialized")
 
     def create_scan(self, model: str, app_num: int, options: dict) -> str:
@@ -635,6 +791,7 @@ class ScanManager:
                     kwargs.setdefault('end_time', datetime.now().isoformat())
                     
                 self.scans[scan_id].update(kwargs)
+                snapshot = {k: self.scans[scan_id].get(k) for k in self.PROGRESS_FIELDS if k in self.scans[scan_id]}
                 
                 # Log appropriately based on what was updated
                 status_update = kwargs.get('status')
@@ -643,11 +800,25 @@ class ScanManager:
                     self.logger.info(f"Updated scan '{scan_id}' status to: {status_update}")
                 elif progress_update is not None:
                     self.logger.debug(f"Updated scan '{scan_id}' progress to: {progress_update}%")
-                    
-                return True
             else:
                 self.logger.warning(f"Attempted to update non-existent scan ID: {scan_id}")
                 return False
+                
+        if self.broker:
+            terminal = snapshot.get("status") in (
+                ScanStatus.COMPLETE.value, ScanStatus.FAILED.value,
+                ScanStatus.STOPPED.value, ScanStatus.ERROR.value
+            )
+            self.broker.publish(f"zap/{scan_id}", "progress", snapshot, final=terminal)
+        return True
+
+    def delete_scan(self, scan_id: str) -> bool:
+        """Drop a scan entry that never ran (e.g. one deduplicated by the scheduler)."""
+        with self._lock:
+            removed = self.scans.pop(scan_id, None) is not None
+        if removed:
+            self.logger.info(f"Deleted scan '{scan_id}'")
+        return removed
 
     def cleanup_old_scans(self, max_age: timedelta = timedelta(hours=Config.SCAN_CLEANUP_HOURS)) -> int:
         """Remove old completed scans based on maximum age."""
@@ -701,6 +872,194 @@ class ScanManager:
         return cleanup_count
 
 
+@dataclass
+class ScanJob:
+    """A queued or running ZAP scan for one model/app."""
+    scan_id: str
+    model: str
+    app_num: int
+    quick_scan: bool = False
+    incremental: bool = False
+    profile: Optional[str] = None
+    state: str = ScanStatus.QUEUED.value
+    enqueued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scan_id": self.scan_id,
+            "model": self.model,
+            "app_num": self.app_num,
+            "quick_scan": self.quick_scan,
+            "incremental": self.incremental,
+            "profile": self.profile,
+            "state": self.state,
+            "enqueued_at": datetime.fromtimestamp(self.enqueued_at).isoformat(),
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            "finished_at": datetime.fromtimestamp(self.finished_at).isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+class ZapScanScheduler:
+    """
+    FIFO scheduler that runs ZAP scans for many apps concurrently.
+
+    Concurrency is capped by ``max_concurrency`` (normally the ZAP daemon pool size)
+    and further limited at dispatch time by free memory and CPU count.
+    """
+    def __init__(self, runner: Callable[[ScanJob], bool], max_concurrency: int = 1):
+        self.logger = create_logger_for_component('zap_scheduler')
+        self._runner = runner
+        configured = Config.ZAP_MAX_CONCURRENT_SCANS
+        self.max_concurrency = max(1, min(max_concurrency, configured) if configured > 0 else max_concurrency)
+        self._queue: deque = deque()
+        self._running: Dict[str, ScanJob] = {}
+        self._finished: deque = deque(maxlen=200)
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger.info(f"ZAP scan scheduler initialized (max concurrency: {self.max_concurrency})")
+
+    def start(self) -> None:
+        """Start the dispatcher thread if not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="ZapScanScheduler")
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.info("ZAP scan scheduler started")
+
+    def stop(self) -> None:
+        """Stop dispatching; running scans are left to finish."""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def submit(self, scan_id: str, model: str, app_num: int, quick_scan: bool = False,
+               incremental: bool = False, profile: Optional[str] = None) -> ScanJob:
+        """Queue a scan; returns the existing job if the app is already queued or running."""
+        with self._condition:
+            existing = self._find_active_job(model, app_num)
+            if existing:
+                self.logger.info(f"Scan for {model}/app{app_num} already {existing.state.lower()} as {existing.scan_id}")
+                return existing
+            job = ScanJob(scan_id=scan_id, model=model, app_num=app_num, quick_scan=quick_scan,
+                          incremental=incremental, profile=profile)
+            self._queue.append(job)
+            self._condition.notify_all()
+        self.logger.info(f"Queued ZAP scan {scan_id} for {model}/app{app_num} (position {self.queue_position(scan_id)})")
+        self.start()
+        return job
+
+    def cancel(self, scan_id: str) -> bool:
+        """Remove a queued scan. Running scans must be stopped through the scanner."""
+        with self._condition:
+            for job in self._queue:
+                if job.scan_id == scan_id:
+                    self._queue.remove(job)
+                    job.state = ScanStatus.STOPPED.value
+                    job.finished_at = time.time()
+                    self._finished.append(job)
+                    self.logger.info(f"Cancelled queued scan {scan_id}")
+                    return True
+        return False
+
+    def queue_position(self, scan_id: str) -> Optional[int]:
+        """1-based position in the queue, 0 if running, None if unknown or finished."""
+        with self._condition:
+            if scan_id in self._running:
+                return 0
+            for position, job in enumerate(self._queue, start=1):
+                if job.scan_id == scan_id:
+                    return position
+        return None
+
+    def get_job(self, scan_id: str) -> Optional[ScanJob]:
+        with self._condition:
+            if scan_id in self._running:
+                return self._running[scan_id]
+            for job in list(self._queue) + list(self._finished):
+                if job.scan_id == scan_id:
+                    return job
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of queued, running and recently finished jobs."""
+        with self._condition:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "current_limit": self._concurrency_limit(),
+                "running": [job.to_dict() for job in self._running.values()],
+                "queued": [dict(job.to_dict(), position=i) for i, job in enumerate(self._queue, start=1)],
+                "finished": [job.to_dict() for job in self._finished],
+            }
+
+    def _find_active_job(self, model: str, app_num: int) -> Optional[ScanJob]:
+        for job in list(self._running.values()) + list(self._queue):
+            if job.model == model and job.app_num == app_num:
+                return job
+        return None
+
+    def _concurrency_limit(self) -> int:
+        """Slots allowed right now, given the hard cap and free memory/CPU."""
+        running = len(self._running)
+        limit = self.max_concurrency
+        cpu_count = os.cpu_count() or 1
+        limit = min(limit, max(1, cpu_count // max(1, Config.ZAP_SCAN_CPUS)))
+        if psutil is not None:
+            try:
+                available_mb = psutil.virtual_memory().available // (1024 * 1024)
+                # Free memory already excludes running scans, so add slots on top of them
+                limit = min(limit, running + int(available_mb // max(1, Config.ZAP_SCAN_MEMORY_MB)))
+            except Exception as e:
+                self.logger.debug(f"Could not read memory usage: {e}")
+        # Never starve the queue entirely
+        return max(limit, 1 if running == 0 else 0)
+
+    def _dispatch_loop(self) -> None:
+        """Start queued jobs whenever a slot is free."""
+        while not self._stop_event.is_set():
+            with self._condition:
+                while self._queue and len(self._running) < self._concurrency_limit():
+                    job = self._queue.popleft()
+                    job.state = ScanStatus.STARTING.value
+                    job.started_at = time.time()
+                    self._running[job.scan_id] = job
+                    worker = threading.Thread(
+                        target=self._run_job, args=(job,), name=f"zap-scan-{job.model}-{job.app_num}"
+                    )
+                    worker.daemon = True
+                    worker.start()
+                    self.logger.info(
+                        f"Dispatched scan {job.scan_id} ({len(self._running)} running, {len(self._queue)} queued)"
+                    )
+                # Wake on submit/completion, or periodically to re-check resources
+                self._condition.wait(Config.ZAP_SCHEDULER_POLL_SECONDS)
+
+    def _run_job(self, job: ScanJob) -> None:
+        try:
+            success = self._runner(job)
+            job.state = ScanStatus.COMPLETE.value if success else ScanStatus.FAILED.value
+        except Exception as e:
+            self.logger.exception(f"Scan job {job.scan_id} raised: {e}")
+            job.state = ScanStatus.ERROR.value
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            with self._condition:
+                self._running.pop(job.scan_id, None)
+                self._finished.append(job)
+                self._condition.notify_all()
+            self.logger.info(f"Scan job {job.scan_id} finished with state {job.state}")
+
+
 def call_ai_service(model: str, prompt: str) -> str:
     """Call an AI service with a prompt and return the response."""
     ai_logger = create_logger_for_component('ai_service')
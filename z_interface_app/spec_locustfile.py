@@ -0,0 +1,25 @@
+"""
+Static locustfile for CLI runs and distributed workers.
+
+Nothing is generated per run: the user class is built from the JSON endpoint
+spec named by $PERF_ENDPOINT_SPEC, with the same UserGenerator the library
+runner uses, so every mode runs identical user logic.
+"""
+import os
+
+from locust import events
+
+from latency_histogram import attach_histogram_capture
+from locust_users import ENDPOINT_SPEC_ENV, UserGenerator, load_endpoint_spec
+
+if not os.environ.get(ENDPOINT_SPEC_ENV):
+    raise RuntimeError(f"{ENDPOINT_SPEC_ENV} must point to an endpoint spec written by write_endpoint_spec")
+
+_spec = load_endpoint_spec(os.environ[ENDPOINT_SPEC_ENV])
+DynamicHttpUser = UserGenerator.create_http_user(_spec["host"], _spec["endpoints"])
+
+
+@events.init.add_listener
+def _capture_latency(environment, **kwargs):
+    # Ship latency histograms to the master with each worker stats report
+    attach_histogram_capture(environment)
@@ -952,10 +952,24 @@ def get_scan_manager():
         # Import here to avoid circular imports
         from services import ScanManager
         logger.info("Initializing ScanManager on app context")
-        current_app.scan_manager = ScanManager()
+        current_app.scan_manager = ScanManager(broker=get_progress_broker())
     return current_app.scan_manager
 
 
+def get_progress_broker():
+    """
+    Get or initialize the progress broker shared by scans, batch jobs and load tests.
+    
+    Returns:
+        ProgressBroker instance
+    """
+    if not hasattr(current_app, 'progress_broker'):
+        from services import ProgressBroker
+        logger.info("Initializing ProgressBroker on app context")
+        current_app.progress_broker = ProgressBroker()
+    return current_app.progress_broker
+
+
 def process_security_analysis(
     template: str,
     analyzer: Any,
@@ -1,21 +1,30 @@
+import hashlib
 import json
 import logging
 import os
 import re
 import socket
 import subprocess
+import tempfile
 import time
 import shutil
+import threading
+import atexit
+from bisect import bisect_right
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, Callable
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlparse
 
 import requests
 from zapv2 import ZAPv2
 
+from route_extractor import FlaskRoute, build_openapi_spec, extract_app_routes
+
 # Import JsonResultsManager from utils
 from utils import JsonResultsManager
 
@@ -28,6 +37,33 @@ class ZAPConfig:
     DEFAULT_MAX_CHILDREN = 30
     DEFAULT_HEAP_SIZE = '4G'
     DEFAULT_PORT_RANGE = (8090, 8099)
+    # Warm daemon pool (see ZAPDaemonPool)
+    USE_DAEMON_POOL = os.getenv('ZAP_USE_DAEMON_POOL', 'true').lower() == 'true'
+    DEFAULT_POOL_SIZE = int(os.getenv('ZAP_POOL_SIZE', '2'))
+    POOL_HEAP_SIZE = os.getenv('ZAP_POOL_HEAP_SIZE', '2G')
+    POOL_RECYCLE_AFTER_SCANS = int(os.getenv('ZAP_POOL_RECYCLE_AFTER', '20'))
+    POOL_LEASE_TIMEOUT = int(os.getenv('ZAP_POOL_LEASE_TIMEOUT', '3600'))
+    # Readiness and polling
+    STARTUP_TIMEOUT = int(os.getenv('ZAP_STARTUP_TIMEOUT', '120'))
+    POLL_INITIAL_INTERVAL = 0.25
+    POLL_MAX_INTERVAL = 5.0
+    PASSIVE_STALL_SECONDS = int(os.getenv('ZAP_PASSIVE_STALL_SECONDS', '60'))
+    # Incremental scans
+    DISCOVERY_FILE = ".zap_discovery.json"
+    RESULTS_FILE = ".zap_results.json"
+    SESSION_DIR = ".zap_session"
+    # Affected-code report, cached on the hash of the results file it was built from
+    CODE_REPORT_FILE = ".zap_code_report.md"
+    CODE_REPORT_META_FILE = ".zap_code_report.meta.json"
+    CODE_REPORT_VERSION = 2
+    CODE_REPORT_MAX_URLS = 20
+    # Stored results: alerts grouped with shared text in lookup tables (see AlertGrouper)
+    RESULTS_FORMAT = "grouped-v1"
+    # Result retrieval paging
+    SOURCE_INDEX_SKIP_DIRS = {'node_modules', '.git', '__pycache__', '.venv', 'venv', '.svelte-kit'}
+    SOURCE_CONTEXT_LINES = 5
+    ALERT_PAGE_SIZE = int(os.getenv('ZAP_ALERT_PAGE_SIZE', '500'))
+    MESSAGE_PAGE_SIZE = int(os.getenv('ZAP_MESSAGE_PAGE_SIZE', '200'))
     CALLBACK_PORT_RANGE = (8888, 8899)
     SOURCE_CODE_EXTENSIONS = [
         '.js', '.jsx', '.ts', '.tsx', '.php', '.py',
@@ -48,8 +84,20 @@ class ZAPConfig:
         "Server Side": ["Server Side Include", "Server Side Template Injection"],
         "Known Vulnerabilities": ["CVE-", "Log4Shell", "Spring4Shell", "Text4Shell"]
     }
+    # Active scan policy categories (ZAP plugin categories)
+    POLICY_INFO_GATHER = 0
+    POLICY_BROWSER = 1
+    POLICY_SERVER = 2
+    POLICY_MISC = 3
+    POLICY_INJECTION = 4
+    # Scan profiles
+    DEFAULT_PROFILE = os.getenv('ZAP_DEFAULT_PROFILE', 'deep')
+    QUICK_PROFILE = os.getenv('ZAP_QUICK_PROFILE', 'standard')
+    PROFILE_STATS_FILE = "zap_profile_stats.json"
+    PROFILE_STATS_MAX_RUNS = int(os.getenv('ZAP_PROFILE_STATS_MAX_RUNS', '2000'))
     # App port configuration
     BASE_FRONTEND_PORT = 5501
+    BASE_BACKEND_PORT = 5001
     PORTS_PER_APP = 2
     BUFFER_PORTS = 20
     APPS_PER_MODEL = 30
@@ -88,6 +136,326 @@ class ZapVulnerability:
     wascid: Optional[str] = None
     affected_code: Optional[CodeContext] = None
     source_file: Optional[str] = None
+    plugin_id: Optional[str] = None
+
+
+def vulnerability_from_dict(alert: Dict[str, Any]) -> ZapVulnerability:
+    """Rebuild a ZapVulnerability (and its CodeContext) from a stored results entry."""
+    affected_code = None
+    ac_data = alert.get('affected_code')
+    if ac_data and isinstance(ac_data, dict):
+        affected_code = CodeContext(
+            snippet=ac_data.get('snippet', ''),
+            line_number=ac_data.get('line_number'),
+            file_path=ac_data.get('file_path'),
+            start_line=ac_data.get('start_line', 0),
+            end_line=ac_data.get('end_line', 0),
+            vulnerable_lines=ac_data.get('vulnerable_lines', []),
+            highlight_positions=ac_data.get('highlight_positions', [])
+        )
+    return ZapVulnerability(
+        url=alert.get('url', ''),
+        name=alert.get('name', ''),
+        alert=alert.get('alert', ''),
+        risk=alert.get('risk', ''),
+        confidence=alert.get('confidence', ''),
+        description=alert.get('description', ''),
+        solution=alert.get('solution', ''),
+        reference=alert.get('reference', ''),
+        evidence=alert.get('evidence'),
+        cwe_id=alert.get('cwe_id'),
+        parameter=alert.get('parameter'),
+        attack=alert.get('attack'),
+        wascid=alert.get('wascid'),
+        affected_code=affected_code,
+        source_file=alert.get('source_file'),
+        plugin_id=alert.get('plugin_id')
+    )
+
+
+class AlertGrouper:
+    """
+    Collapse near-identical alerts for storage and display.
+
+    Alerts are grouped by (rule text, parameter, normalized path template,
+    evidence hash). Rule text (name, risk, description, solution, reference...)
+    and code contexts are stored once in lookup tables; each group keeps only
+    the per-instance URL, attack and code reference. Grouping is lossless:
+    expand() yields the original flat alerts.
+    """
+    TEXT_FIELDS = (
+        "plugin_id", "name", "alert", "risk", "confidence", "description",
+        "solution", "reference", "cwe_id", "wascid",
+    )
+    # Numeric ids, UUIDs and long hex tokens in a path are treated as one template slot
+    _ID_SEGMENT = re.compile(
+        r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$'
+    )
+
+    def __init__(self):
+        self.texts: Dict[str, Dict[str, Any]] = {}
+        self.codes: Dict[str, Dict[str, Any]] = {}
+        self._groups: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        self.alert_count = 0
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def path_template(cls, url: str) -> str:
+        """scheme://host/path with id-like segments replaced by {id} and query values dropped."""
+        parsed = urlparse(url or "")
+        template = '/'.join("{id}" if cls._ID_SEGMENT.match(segment) else segment for segment in parsed.path.split('/'))
+        if parsed.query:
+            names = sorted({name for name, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+            template += '?' + '&'.join(names)
+        return f"{parsed.scheme}://{parsed.netloc}{template or '/'}" if parsed.netloc else template
+
+    @property
+    def groups(self) -> List[Dict[str, Any]]:
+        return list(self._groups.values())
+
+    def add(self, alert: Dict[str, Any]) -> None:
+        """Add one flat alert (as stored by save_scan_results or asdict(ZapVulnerability))."""
+        text = {name: alert.get(name) for name in self.TEXT_FIELDS}
+        text_id = self._digest(text)
+        self.texts.setdefault(text_id, text)
+        
+        evidence = alert.get('evidence') or ""
+        parameter = alert.get('parameter') or ""
+        path_template = self.path_template(alert.get('url', ''))
+        key = (text_id, parameter, path_template, self._digest(evidence) if evidence else "")
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {
+                "text": text_id,
+                "parameter": parameter,
+                "path_template": path_template,
+                "evidence": evidence,
+                "evidence_hash": key[3],
+                "instances": [],
+            }
+        
+        instance: Dict[str, Any] = {"url": alert.get('url', '')}
+        if alert.get('attack'):
+            instance["attack"] = alert['attack']
+        code = alert.get('affected_code')
+        if code:
+            code_id = self._digest(code)
+            self.codes.setdefault(code_id, code)
+            instance["code"] = code_id
+        source_file = alert.get('source_file')
+        if source_file and source_file != (code or {}).get('file_path'):
+            instance["source_file"] = source_file
+        group["instances"].append(instance)
+        self.alert_count += 1
+
+    def to_results(self) -> Dict[str, Any]:
+        """Grouped representation written to .zap_results.json."""
+        return {
+            "format": ZAPConfig.RESULTS_FORMAT,
+            "alert_count": self.alert_count,
+            "texts": self.texts,
+            "codes": self.codes,
+            "groups": self.groups,
+        }
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Grouped form of any results document; legacy flat files are grouped on the fly."""
+        if results.get("format") == ZAPConfig.RESULTS_FORMAT:
+            return results
+        grouper = cls()
+        for alert in iter_result_alerts(results):
+            grouper.add(alert)
+        return grouper.to_results()
+
+    @staticmethod
+    def expand(results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the flat alerts of a grouped results document."""
+        texts = results.get("texts", {})
+        codes = results.get("codes", {})
+        for group in results.get("groups", []):
+            text = texts.get(group.get("text"), {})
+            for instance in group.get("instances", []):
+                code = codes.get(instance.get("code")) if instance.get("code") else None
+                yield dict(
+                    text,
+                    url=instance.get("url", ""),
+                    parameter=group.get("parameter"),
+                    evidence=group.get("evidence"),
+                    attack=instance.get("attack"),
+                    affected_code=code,
+                    source_file=instance.get("source_file") or (code or {}).get("file_path"),
+                )
+
+    @classmethod
+    def display_groups(cls, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        One entry per group for rendering: the rule text and first instance's
+        fields, plus count, code_count (instances with an affected code
+        snippet) and the distinct URLs of all instances.
+        """
+        grouped = cls.from_results(results)
+        texts = grouped.get("texts", {})
+        codes = grouped.get("codes", {})
+        entries = []
+        for group in grouped.get("groups", []):
+            instances = group.get("instances", [])
+            if not instances:
+                continue
+            code = next((codes[i["code"]] for i in instances if i.get("code") in codes), None)
+            entries.append(dict(
+                texts.get(group.get("text"), {}),
+                url=instances[0].get("url", ""),
+                parameter=group.get("parameter"),
+                evidence=group.get("evidence"),
+                path_template=group.get("path_template"),
+                attack=instances[0].get("attack"),
+                affected_code=code,
+                count=len(instances),
+                code_count=sum(1 for i in instances if (codes.get(i.get("code")) or {}).get("snippet")),
+                urls=list(dict.fromkeys(i.get("url", "") for i in instances)),
+            ))
+        return entries
+
+
+def iter_result_alerts(results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield the alert entries of a loaded .zap_results.json document."""
+    if results.get("format") == ZAPConfig.RESULTS_FORMAT:
+        yield from AlertGrouper.expand(results)
+        return
+    alerts = results.get('alerts')
+    if not alerts and isinstance(results.get('summary'), dict):
+        alerts = results['summary'].get('alerts')
+    yield from alerts or []
+
+
+def iter_result_vulnerabilities(results: Dict[str, Any]) -> Iterator[ZapVulnerability]:
+    """Yield reconstructed vulnerabilities, skipping entries that cannot be rebuilt."""
+    for alert in iter_result_alerts(results):
+        try:
+            yield vulnerability_from_dict(alert)
+        except Exception as e:
+            logger.warning(f"Skipping alert that could not be reconstructed: {str(e)}")
+
+
+@dataclass
+class DiscoveryState:
+    """What a scan discovered for one app; reloaded by the next incremental scan."""
+    source_hash: str = ""
+    file_hashes: Dict[str, str] = field(default_factory=dict)
+    urls: List[str] = field(default_factory=list)
+    endpoint_sources: Dict[str, str] = field(default_factory=dict)
+    session_path: Optional[str] = None
+    scan_time: Optional[str] = None
+    active_scanned: bool = True                 # False when saved by a passive-only profile
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiscoveryState":
+        known = {f for f in cls.__dataclass_fields__}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+@dataclass(frozen=True)
+class ScanProfile:
+    """Named bundle of spider, AJAX spider and active-scan settings."""
+    name: str
+    description: str
+    target: str = "frontend"                    # "frontend" or "backend"
+    spider: bool = True
+    seed_routes: bool = False                   # seed ZAP with routes parsed from the Flask sources
+    spider_max_depth: int = 5
+    max_children: int = ZAPConfig.DEFAULT_MAX_CHILDREN
+    ajax_spider: Optional[str] = "full"         # None, "focused" or "full"
+    ajax_timeout: Optional[int] = None
+    active_scan: bool = True
+    active_policies: Optional[Tuple[int, ...]] = None   # None enables every category
+    attack_strength: str = "HIGH"
+    alert_threshold: str = "LOW"
+    thread_per_host: int = ZAPConfig.DEFAULT_THREAD_COUNT
+    passive_wait: int = 600
+    final_passive_wait: int = 300
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+SCAN_PROFILES: Dict[str, ScanProfile] = {
+    "baseline": ScanProfile(
+        name="baseline",
+        description="Spider plus passive rules only; no attacks",
+        spider_max_depth=3,
+        max_children=10,
+        ajax_spider=None,
+        active_scan=False,
+        passive_wait=120,
+        final_passive_wait=60,
+    ),
+    "api": ScanProfile(
+        name="api",
+        description="Active scan of the Flask backend routes with server-side and injection rules",
+        target="backend",
+        spider=False,
+        seed_routes=True,
+        spider_max_depth=3,
+        max_children=20,
+        ajax_spider=None,
+        active_policies=(ZAPConfig.POLICY_SERVER, ZAPConfig.POLICY_MISC, ZAPConfig.POLICY_INJECTION),
+        attack_strength="MEDIUM",
+        alert_threshold="MEDIUM",
+        passive_wait=120,
+        final_passive_wait=60,
+    ),
+    "standard": ScanProfile(
+        name="standard",
+        description="Spider, focused AJAX crawl and a medium-strength active scan",
+        ajax_spider="focused",
+        ajax_timeout=60,
+        attack_strength="MEDIUM",
+        passive_wait=300,
+        final_passive_wait=120,
+    ),
+    "deep": ScanProfile(
+        name="deep",
+        description="Full AJAX crawl and every active rule at high strength",
+    ),
+}
+
+
+def get_scan_profile(name: Optional[str], quick_scan: bool = False) -> ScanProfile:
+    """Resolve a profile name, falling back to the quick/comprehensive defaults."""
+    if not name:
+        name = ZAPConfig.QUICK_PROFILE if quick_scan else ZAPConfig.DEFAULT_PROFILE
+    if name not in SCAN_PROFILES:
+        raise ValueError(f"Unknown scan profile '{name}'. Available: {', '.join(SCAN_PROFILES)}")
+    return SCAN_PROFILES[name]
+
+
+@dataclass
+class ZAPDaemon:
+    """A running ZAP daemon owned by a ZAPDaemonPool."""
+    port: int
+    zap: ZAPv2
+    process: Optional[subprocess.Popen]
+    log_path: Path
+    home_dir: Path
+    started_at: float = field(default_factory=time.time)
+    scans_served: int = 0
+    leased: bool = False
+    firefox_binary_path: Optional[str] = None
+    oast_configured: bool = False
+    default_options: Dict[str, str] = field(default_factory=dict)   # restored between leases
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "port": self.port,
+            "pid": self.process.pid if self.process else None,
+            "leased": self.leased,
+            "scans_served": self.scans_served,
+            "uptime_seconds": int(time.time() - self.started_at),
+        }
 
 
 @dataclass
@@ -127,6 +495,326 @@ def log_operation(operation_name: str):
     return decorator
 
 
+def poll_until(predicate: Callable[[], bool], timeout: float,
+               initial_interval: float = ZAPConfig.POLL_INITIAL_INTERVAL,
+               max_interval: float = ZAPConfig.POLL_MAX_INTERVAL,
+               backoff: float = 2.0) -> bool:
+    """Poll predicate with exponential backoff until it returns True or timeout elapses."""
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+
+class PhaseTimer:
+    """Records wall-clock duration of named scan phases."""
+
+    def __init__(self, on_start: Optional[Callable[[str], None]] = None):
+        self.timings: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+        self._on_start = on_start
+
+    def start(self, name: str) -> None:
+        self._started[name] = time.monotonic()
+        if self._on_start:
+            self._on_start(name)
+
+    def stop(self, name: str) -> None:
+        start = self._started.pop(name, None)
+        if start is None:
+            return
+        elapsed = time.monotonic() - start
+        self.timings[name] = round(self.timings.get(name, 0.0) + elapsed, 2)
+        logger.info(f"Phase '{name}' took {elapsed:.2f}s")
+
+    @contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+
+def iter_paged(fetch: Callable[[int, int], List[Any]], page_size: int):
+    """Yield items from a ZAP API listing that supports start/count paging."""
+    start = 0
+    while True:
+        page = fetch(start, page_size)
+        if not page:
+            return
+        yield from page
+        if len(page) < page_size:
+            return
+        start += len(page)
+
+
+class MessageIndex:
+    """
+    In-memory index of the HTTP messages ZAP recorded for a target.
+
+    Message summaries are paged in once; response bodies are fetched at most
+    once per message id and shared by alert processing and source collection.
+    """
+
+    def __init__(self, zap: ZAPv2, baseurl: str, page_size: int = ZAPConfig.MESSAGE_PAGE_SIZE):
+        self.zap = zap
+        self.baseurl = baseurl
+        self.page_size = page_size
+        self.ids_by_url: Dict[str, List[str]] = {}
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._bodies: Dict[str, str] = {}
+        self._loaded = False
+        self.api_calls = 0
+
+    @staticmethod
+    def _message_url(message: Dict[str, Any]) -> str:
+        url = message.get('url', '')
+        if url:
+            return url
+        # ZAP messages carry the URL in the request line: "GET http://... HTTP/1.1"
+        request_line = message.get('requestHeader', '').split('\r\n', 1)[0].split('\n', 1)[0]
+        parts = request_line.split(' ')
+        return parts[1] if len(parts) >= 2 else ''
+
+    def _fetch_page(self, start: int, count: int) -> List[Any]:
+        self.api_calls += 1
+        return self.zap.core.messages(baseurl=self.baseurl, start=start, count=count)
+
+    def load(self) -> "MessageIndex":
+        if self._loaded:
+            return self
+        self._loaded = True
+        try:
+            for message in iter_paged(self._fetch_page, self.page_size):
+                if not isinstance(message, dict):
+                    continue
+                message_id = str(message.get('id', ''))
+                url = self._message_url(message)
+                if not message_id or not url:
+                    continue
+                self._messages[message_id] = message
+                self.ids_by_url.setdefault(url, []).append(message_id)
+                if 'responseBody' in message:
+                    self._bodies[message_id] = message.get('responseBody', '')
+        except Exception as e:
+            logger.warning(f"Error indexing ZAP messages for {self.baseurl}: {str(e)}")
+        logger.info(f"Indexed {len(self._messages)} ZAP messages across {len(self.ids_by_url)} URLs")
+        return self
+
+    def body(self, message_id: Any) -> Optional[str]:
+        """Return the response body for a message, fetching it only once."""
+        message_id = str(message_id)
+        if message_id in self._bodies:
+            return self._bodies[message_id]
+        body = None
+        try:
+            self.api_calls += 1
+            full_message = self.zap.core.message(message_id)
+            if isinstance(full_message, dict):
+                body = full_message.get('responseBody')
+        except Exception as e:
+            logger.debug(f"Error retrieving message {message_id}: {str(e)}")
+        self._bodies[message_id] = body
+        return body
+
+    def bodies_for_url(self, url: str):
+        self.load()
+        for message_id in self.ids_by_url.get(url, []):
+            body = self.body(message_id)
+            if body:
+                yield message_id, body
+
+    def find_message(self, url: str, evidence: str, message_id: Any = None) -> Optional[Tuple[str, str]]:
+        """Return (message id, body) of a response for url containing evidence, preferring the alert's message."""
+        if message_id not in (None, ''):
+            body = self.body(message_id)
+            if body and evidence in body:
+                return str(message_id), body
+        for other_id, body in self.bodies_for_url(url):
+            if evidence in body:
+                return other_id, body
+        return None
+
+    def urls(self) -> List[str]:
+        self.load()
+        return list(self.ids_by_url)
+
+
+class EvidenceMatcher:
+    """Aho-Corasick automaton locating the first occurrence of many evidences in one pass."""
+
+    def __init__(self, patterns: Set[str]):
+        self.patterns = [p for p in patterns if p]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for pattern in self.patterns:
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append(pattern)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def first_positions(self, text: str) -> Dict[str, int]:
+        """Map each pattern found in text to the start offset of its first occurrence."""
+        found: Dict[str, int] = {}
+        remaining = len(set(self.patterns))
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for pattern in self._out[node]:
+                if pattern not in found:
+                    found[pattern] = index - len(pattern) + 1
+                    remaining -= 1
+            if not remaining:
+                break
+        return found
+
+
+class SourceText:
+    """Source content with a precomputed line-offset table."""
+
+    def __init__(self, text: str, path: Optional[str] = None):
+        self.text = text
+        self.path = path
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+
+    def line_of(self, offset: int) -> int:
+        return bisect_right(self.line_starts, offset)
+
+    def context(self, start_pos: int, end_pos: int, radius: int = ZAPConfig.SOURCE_CONTEXT_LINES) -> CodeContext:
+        line_number = self.line_of(start_pos)
+        start_line = max(0, line_number - 1 - radius)
+        line_count = len(self.line_starts) - (1 if self.text.endswith('\n') else 0)
+        end_line = min(line_count, line_number + radius)
+        snippet_start = self.line_starts[start_line]
+        snippet_end = self.line_starts[end_line] - 1 if end_line < len(self.line_starts) else len(self.text)
+        snippet = self.text[snippet_start:snippet_end]
+        return CodeContext(
+            snippet=snippet,
+            line_number=line_number,
+            file_path=self.path,
+            start_line=start_line + 1,
+            end_line=end_line,
+            vulnerable_lines=[line_number],
+            highlight_positions=[(max(0, start_pos - snippet_start), min(len(snippet), end_pos - snippet_start))]
+        )
+
+
+class SourceIndex:
+    """
+    Per-app index mapping ZAP URLs to source files.
+
+    The source tree is walked once to build a URL-path -> file map. File
+    contents and line tables are cached, and evidences registered for a
+    source are located with a single Aho-Corasick pass over its text.
+    """
+
+    def __init__(self, root_dir: str, extensions: List[str]):
+        self.root_dir = os.path.abspath(root_dir)
+        self.extensions = list(extensions)
+        self.path_map: Dict[str, str] = {}
+        self._texts: Dict[str, Optional[SourceText]] = {}
+        self._evidence: Dict[str, Set[str]] = {}
+        self._positions: Dict[str, Dict[str, int]] = {}
+        self._build()
+
+    def _build(self):
+        # Lookup precedence mirrors the old probing order: root, then src/,
+        # then public/; exact paths win over extensionless ones.
+        ext_rank = {ext: rank for rank, ext in enumerate(self.extensions)}
+        exact: Dict[str, Tuple[int, str]] = {}
+        extensionless: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        for dirpath, dirnames, filenames in os.walk(self.root_dir):
+            dirnames[:] = [d for d in dirnames if d not in ZAPConfig.SOURCE_INDEX_SKIP_DIRS]
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                relative = os.path.relpath(full_path, self.root_dir).replace(os.sep, '/')
+                for prefix_rank, prefix in enumerate(('', 'src/', 'public/')):
+                    if prefix and not relative.startswith(prefix):
+                        continue
+                    key = relative[len(prefix):]
+                    if key not in exact or exact[key][0] > prefix_rank:
+                        exact[key] = (prefix_rank, full_path)
+                    stem, ext = os.path.splitext(key)
+                    if ext in ext_rank:
+                        rank = (prefix_rank, ext_rank[ext])
+                        if stem not in extensionless or extensionless[stem][0] > rank:
+                            extensionless[stem] = (rank, full_path)
+        self.path_map = {stem: path for stem, (_, path) in extensionless.items()}
+        self.path_map.update({key: path for key, (_, path) in exact.items()})
+        logger.info(f"Indexed {len(exact)} source paths under {self.root_dir}")
+
+    def resolve(self, url: str) -> Optional[str]:
+        path = urlparse(url).path.lstrip('/')
+        if '..' in path:
+            logger.warning(f"Potential path traversal attempt detected in URL: {url}")
+            return None
+        return self.path_map.get(path)
+
+    def register_evidence(self, key: str, evidence: str):
+        if key and evidence:
+            self._evidence.setdefault(key, set()).add(evidence)
+            self._positions.pop(key, None)
+
+    def text_for(self, key: str, loader: Callable[[], Optional[str]],
+                 path: Optional[str] = None) -> Optional[SourceText]:
+        if key not in self._texts:
+            content = loader()
+            self._texts[key] = SourceText(content, path) if content else None
+        return self._texts[key]
+
+    def read_file(self, path: str) -> Optional[SourceText]:
+        def load() -> Optional[str]:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            except Exception as e:
+                logger.debug(f"Error reading source file {path}: {str(e)}")
+                return None
+        return self.text_for(path, load, path)
+
+    def locate(self, key: str, source: SourceText, evidence: str) -> Optional[int]:
+        """Return the first offset of evidence in source, scanning each source once."""
+        if key not in self._positions:
+            patterns = self._evidence.get(key, set()) | {evidence}
+            self._positions[key] = EvidenceMatcher(patterns).first_positions(source.text)
+        positions = self._positions[key]
+        if evidence in positions:
+            return positions[evidence]
+        if evidence in self._evidence.get(key, ()):
+            return None
+        position = source.text.find(evidence)
+        return position if position >= 0 else None
+
+
 class NetworkUtils:
     """Utility class for network operations."""
     
@@ -158,6 +846,15 @@ class NetworkUtils:
         logger.error(error_msg)
         raise RuntimeError(error_msg)
 
+    @staticmethod
+    def is_port_free(port: int) -> bool:
+        """Check whether a local port can be bound."""
+        try:
+            with NetworkUtils.port_check(port):
+                return True
+        except OSError:
+            return False
+
 
 class FileUtils:
     """Utility class for file operations."""
@@ -185,18 +882,57 @@ class FileUtils:
                 
         return None
 
+    @staticmethod
+    def hash_source_tree(root_dir: Union[str, Path]) -> Tuple[str, Dict[str, str]]:
+        """Hash every file under root_dir; returns (tree hash, {relative path: file hash})."""
+        root = Path(root_dir)
+        file_hashes: Dict[str, str] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in ZAPConfig.SOURCE_INDEX_SKIP_DIRS)
+            for filename in sorted(filenames):
+                full_path = Path(dirpath) / filename
+                try:
+                    file_hashes[full_path.relative_to(root).as_posix()] = hashlib.sha256(full_path.read_bytes()).hexdigest()
+                except OSError as e:
+                    logger.debug(f"Could not hash {full_path}: {str(e)}")
+        tree_hash = hashlib.sha256()
+        for relative, digest in sorted(file_hashes.items()):
+            tree_hash.update(f"{relative}:{digest}\n".encode('utf-8'))
+        return tree_hash.hexdigest(), file_hashes
+
+    @staticmethod
+    def hash_file(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+        """SHA-256 of a file, read in chunks."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
 
 class ZAPScanner:
-    def __init__(self, base_path: Path):
+    # Overall progress reported when each scan phase starts
+    PHASE_PROGRESS = {
+        "source_index": 1, "daemon_startup": 2, "restore_discovery": 4, "initial_discovery": 5,
+        "passive_wait_initial": 8, "route_seeding": 10, "spider": 12, "ajax_spider": 25,
+        "passive_wait_discovery": 40, "active_scan": 50, "passive_wait_final": 90,
+        "source_collection": 93, "alert_retrieval": 95, "alert_processing": 97,
+    }
+    ACTIVE_SCAN_PROGRESS_SPAN = 40
+    REPORT_RISK_ORDER = ["High", "Medium", "Low", "Informational"]
+
+    def __init__(self, base_path: Path, proxy_port: Optional[int] = None):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.api_key = os.getenv('ZAP_API_KEY', ZAPConfig.DEFAULT_API_KEY)
         self.proxy_host = "127.0.0.1"
-        self.proxy_port = NetworkUtils.find_free_port(
-            ZAPConfig.DEFAULT_PORT_RANGE[0], 
-            ZAPConfig.DEFAULT_PORT_RANGE[1]
-        )
-        self.zap_log = self.base_path / "zap.log"
+        # Chosen when a dedicated daemon starts; pooled scans use the leased daemon's port
+        self.proxy_port: Optional[int] = proxy_port
+        self.zap_log = self.base_path / (f"zap_{proxy_port}.log" if proxy_port else "zap.log")
+        self.heap_size = ZAPConfig.DEFAULT_HEAP_SIZE
+        self.zap_home_dir: Optional[Path] = None
+        self.daemon_pool: Optional["ZAPDaemonPool"] = None
+        self._daemon_lease: Optional[ZAPDaemon] = None
         self.zap: Optional[ZAPv2] = None
         self.daemon_process: Optional[subprocess.Popen] = None
         self._scans: Dict[str, Dict] = {}
@@ -208,10 +944,12 @@ class ZAPScanner:
         self.active_rule_categories = ZAPConfig.ACTIVE_RULE_CATEGORIES
         self.source_code_mapping = {}
         self.source_root_dir = None
+        self.source_index: Optional[SourceIndex] = None
         self.source_file_extensions = ZAPConfig.SOURCE_CODE_EXTENSIONS
         self.firefox_binary_path = None
         self.oast_service_configured = False
         self.callback_port = None
+        self.progress_callback: Optional[Callable[..., None]] = None
         
 
         if "z_interface_app" in str(self.base_path):
@@ -222,7 +960,7 @@ class ZAPScanner:
         self.results_manager = JsonResultsManager(base_path=self.base_path, module_name="zap_scanner")
         
         logger.info(f"ZAPScanner initialized with base path: {self.base_path}")
-        logger.info(f"ZAP proxy configuration: {self.proxy_host}:{self.proxy_port}")
+        logger.info(f"ZAP proxy configuration: {self.proxy_host}:{self.proxy_port or 'port assigned at daemon start'}")
 
     def _find_firefox_binary(self) -> Optional[str]:
         return FileUtils.find_binary(
@@ -288,7 +1026,7 @@ class ZAPScanner:
 
     def _get_java_opts(self) -> List[str]:
         return [
-            f'-Xmx{ZAPConfig.DEFAULT_HEAP_SIZE}',
+            f'-Xmx{self.heap_size}',
             f'-Djava.io.tmpdir={self.base_path / "tmp"}',
             '-Djava.net.preferIPv4Stack=true',
             '-XX:+UseG1GC',
@@ -301,7 +1039,8 @@ class ZAPScanner:
         Get ZAP command line arguments for optimal configuration.
         All configuration is centralized here.
         """
-        return [
+        home_args = ['-dir', str(self.zap_home_dir)] if self.zap_home_dir else []
+        return home_args + [
             '-daemon', '-port', str(self.proxy_port), '-host', self.proxy_host,
             '-config', f'api.key={self.api_key}',
             '-config', 'api.addrs.addr.name=.*',
@@ -364,45 +1103,20 @@ class ZAPScanner:
                 relative_path = url[len(url_prefix):]
                 return os.path.join(file_path, relative_path)
                 
-        # If no explicit mapping, try inferring from source root
+        # If no explicit mapping, resolve through the source index
         if self.source_root_dir:
             try:
-                from urllib.parse import urlparse
-                parsed = urlparse(url)
-                path = parsed.path
-                
-                # Security: Prevent path traversal by normalizing and validating path
-                if path.startswith('/'):
-                    path = path[1:]
-                # Ensure the path doesn't try to escape with '..'
-                if '..' in path:
-                    logger.warning(f"Potential path traversal attempt detected in URL: {url}")
-                    return None
-                    
-                # Try common locations in source directory
-                possibilities = [
-                    os.path.join(self.source_root_dir, path),
-                    os.path.join(self.source_root_dir, 'src', path),
-                    os.path.join(self.source_root_dir, 'public', path)
-                ]
-                
-                for possibility in possibilities:
-                    # Verify the path is within the source root dir to prevent traversal
-                    if os.path.abspath(possibility).startswith(os.path.abspath(self.source_root_dir)):
-                        if os.path.isfile(possibility):
-                            return possibility
-                        # Try with different extensions if no extension specified
-                        base_path, ext = os.path.splitext(possibility)
-                        if not ext:
-                            for extension in self.source_file_extensions:
-                                path_with_ext = f"{base_path}{extension}"
-                                if os.path.isfile(path_with_ext):
-                                    return path_with_ext
+                return self._get_source_index().resolve(url)
             except Exception as e:
                 logger.debug(f"Error inferring source file from URL {url}: {str(e)}")
                 
         return None
 
+    def _get_source_index(self) -> SourceIndex:
+        if self.source_index is None or self.source_index.root_dir != os.path.abspath(self.source_root_dir):
+            self.source_index = SourceIndex(self.source_root_dir, self.source_file_extensions)
+        return self.source_index
+
     def _fetch_source_from_url(self, url: str) -> Optional[str]:
         try:
             if any(url.endswith(ext) for ext in self.source_file_extensions):
@@ -413,112 +1127,81 @@ class ZAPScanner:
             logger.debug(f"Error fetching source from URL {url}: {str(e)}")
         return None
 
-    def _get_affected_code(self, alert: Dict[str, Any]) -> Optional[CodeContext]:
+    def _register_alert_evidence(self, alerts: List[Dict[str, Any]]):
+        """Register every alert evidence with the source it will be matched against."""
+        if not self.source_root_dir:
+            return
+        index = self._get_source_index()
+        for alert in alerts:
+            url = alert.get('url', '')
+            evidence = alert.get('evidence', '')
+            if not url or not evidence:
+                continue
+            source_file = self._url_to_source_file(url)
+            index.register_evidence(source_file or url, evidence)
+            index.register_evidence(url, evidence)
+
+    def _get_affected_code(self, alert: Dict[str, Any],
+                           message_index: Optional[MessageIndex] = None) -> Optional[CodeContext]:
         url = alert.get('url', '')
         evidence = alert.get('evidence', '')
         if not evidence or not url:
             return None
             
-        # Get source code from file or URL
+        index = self._get_source_index() if self.source_root_dir else None
         source_file = self._url_to_source_file(url)
-        source_code = None
+        source = None
+        source_key = url
         
-        # Try to load source from file
+        # Try to load source from file (cached per scan by the source index)
         if source_file and os.path.isfile(source_file):
-            try:
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    source_code = f.read()
-                logger.debug(f"Loaded source code from: {source_file}")
-            except Exception as e:
-                logger.debug(f"Error reading source file {source_file}: {str(e)}")
-                
-        # If file loading failed, try to fetch from URL
-        if not source_code:
-            source_code = self._fetch_source_from_url(url)
-            if source_code:
-                logger.debug(f"Fetched source code from URL: {url}")
-                
-        # As a last resort, try to extract from ZAP messages
-        if not source_code:
-            try:
-                messages = []
+            if index is not None:
+                source = index.read_file(source_file)
+            else:
                 try:
-                    if hasattr(self.zap.core, 'messages'):
-                        messages = self.zap.core.messages(baseurl=url)
-                        logger.debug(f"Found {len(messages)} messages for URL: {url}")
+                    with open(source_file, 'r', encoding='utf-8') as f:
+                        source = SourceText(f.read(), source_file)
                 except Exception as e:
-                    logger.debug(f"Error getting messages for URL {url}: {str(e)}")
-                    
-                for message in messages:
-                    if isinstance(message, dict) and 'responseBody' in message:
-                        response_body = message.get('responseBody', '')
-                        if evidence in response_body:
-                            source_code = response_body
-                            logger.debug(f"Using response body as source code for URL: {url}")
-                            break
-                    elif hasattr(message, 'get') and callable(message.get):
-                        message_id = message.get('id')
-                        if message_id:
-                            try:
-                                full_message = self.zap.core.message(message_id)
-                                if (full_message and 'responseBody' in full_message):
-                                    response_body = full_message.get('responseBody', '')
-                                    if evidence in response_body:
-                                        source_code = response_body
-                                        logger.debug(f"Found evidence in message ID {message_id}")
-                                        break
-                            except Exception as e:
-                                logger.debug(f"Error retrieving message {message_id}: {str(e)}")
-            except Exception as e:
-                logger.debug(f"Error trying to extract source from ZAP messages: {str(e)}")
+                    logger.debug(f"Error reading source file {source_file}: {str(e)}")
+            if source:
+                source_key = source_file
+                logger.debug(f"Loaded source code from: {source_file}")
+                
+        # If file loading failed, try the recorded ZAP messages, then the live URL.
+        # Responses for one URL differ between messages, so recorded bodies are
+        # cached per message id; only the live fetch is cached per URL.
+        if not source and message_index is not None:
+            match = message_index.find_message(url, evidence, alert.get('messageId'))
+            if match:
+                message_id, body = match
+                source_key = f"{url}#message-{message_id}"
+                source = index.text_for(source_key, lambda: body) if index is not None else SourceText(body)
+        if not source:
+            source_key = url
+            if index is not None:
+                source = index.text_for(url, lambda: self._fetch_source_from_url(url))
+            else:
+                content = self._fetch_source_from_url(url)
+                source = SourceText(content) if content else None
+        if source and source_key != source_file:
+            logger.debug(f"Using response content as source code for URL: {url}")
                 
         # If no source code found, just return the evidence
-        if not source_code:
+        if not source:
             logger.debug(f"No source code available for URL: {url}")
-            if evidence:
-                return CodeContext(snippet=evidence, line_number=None, file_path=source_file, highlight_positions=[(0, len(evidence))])
-            return None
+            return CodeContext(snippet=evidence, line_number=None, file_path=source_file, highlight_positions=[(0, len(evidence))])
             
         # Extract context from source code
         try:
-            pattern = re.escape(evidence)
-            matches = list(re.finditer(pattern, source_code))
-            if not matches:
+            if index is not None:
+                start_pos = index.locate(source_key, source, evidence)
+            else:
+                start_pos = source.text.find(evidence)
+                start_pos = start_pos if start_pos >= 0 else None
+            if start_pos is None:
                 logger.debug(f"Evidence not found in source code for URL: {url}")
                 return CodeContext(snippet=evidence, line_number=None, file_path=source_file, highlight_positions=[(0, len(evidence))])
-                
-            match = matches[0]
-            start_pos, end_pos = match.span()
-            line_number = source_code[:start_pos].count('\n') + 1
-            
-            # Extract code context with surrounding lines
-            lines = source_code.splitlines()
-            start_line = max(0, line_number - 6)
-            end_line = min(len(lines), line_number + 5)
-            context_lines = lines[start_line:end_line]
-            context_snippet = '\n'.join(context_lines)
-            
-            # Adjust highlight position for extracted context
-            if start_line > 0:
-                prefix_length = len('\n'.join(lines[:start_line])) + 1
-                adjusted_start = start_pos - prefix_length
-                adjusted_end = end_pos - prefix_length
-            else:
-                adjusted_start = start_pos
-                adjusted_end = end_pos
-                
-            adjusted_start = max(0, adjusted_start)
-            adjusted_end = min(len(context_snippet), adjusted_end)
-            
-            return CodeContext(
-                snippet=context_snippet, 
-                line_number=line_number, 
-                file_path=source_file, 
-                start_line=start_line + 1, 
-                end_line=end_line, 
-                vulnerable_lines=[line_number], 
-                highlight_positions=[(adjusted_start, adjusted_end)]
-            )
+            return source.context(start_pos, start_pos + len(evidence))
         except Exception as e:
             logger.debug(f"Error extracting code context: {str(e)}")
             return CodeContext(
@@ -529,7 +1212,7 @@ class ZAPScanner:
             )
 
     @log_operation("ZAP process cleanup")
-    def _cleanup_existing_zap(self):
+    def _cleanup_existing_zap(self, kill_strays: bool = True):
         try:
             if self.daemon_process:
                 logger.info("Terminating existing ZAP process...")
@@ -544,8 +1227,11 @@ class ZAPScanner:
                     logger.debug("ZAP process forcibly killed")
                 self.daemon_process = None
                 
+            # Never kill stray processes while pooled daemons are serving other scans
+            if not kill_strays or _pool_has_daemons():
+                logger.debug("Skipping stray ZAP process cleanup")
             # Platform-specific process cleanup
-            if os.name == 'nt':
+            elif os.name == 'nt':
                 logger.debug("Attempting to kill stray ZAP processes on Windows...")
                 for proc in ['java.exe', 'zap.exe']:
                     try:
@@ -561,7 +1247,9 @@ class ZAPScanner:
                 except Exception as e:
                     logger.debug(f"Error running pkill: {str(e)}")
                     
-            time.sleep(5)
+            # Wait only as long as the OS needs to release the proxy port
+            if self.proxy_port and not poll_until(lambda: NetworkUtils.is_port_free(self.proxy_port), timeout=10):
+                logger.warning(f"Port {self.proxy_port} still in use after cleanup")
             logger.info("ZAP process cleanup complete")
         except Exception as e:
             logger.warning(f"Error during ZAP cleanup: {str(e)}")
@@ -713,11 +1401,16 @@ class ZAPScanner:
             return False
 
     @log_operation("ZAP daemon startup")
-    def _start_zap_daemon(self) -> bool:
+    def _start_zap_daemon(self, kill_strays: bool = True) -> bool:
         start_time = datetime.now()
         try:
             # Clean up any existing ZAP processes
-            self._cleanup_existing_zap()
+            self._cleanup_existing_zap(kill_strays=kill_strays)
+            if self.proxy_port is None:
+                self.proxy_port = NetworkUtils.find_free_port(
+                    ZAPConfig.DEFAULT_PORT_RANGE[0], 
+                    ZAPConfig.DEFAULT_PORT_RANGE[1]
+                )
             
             # Verify and fix add-ons
             corrupted_addons = self._verify_addons_integrity()
@@ -752,62 +1445,111 @@ class ZAPScanner:
                 )
                 
             logger.debug(f"ZAP process started with PID: {self.daemon_process.pid}")
-            logger.info("Waiting for ZAP to initialize (15 seconds)...")
-            time.sleep(15)
+            self.zap = ZAPv2(
+                apikey=self.api_key, 
+                proxies={
+                    'http': f'http://{self.proxy_host}:{self.proxy_port}', 
+                    'https': f'http://{self.proxy_host}:{self.proxy_port}'
+                }
+            )
+            version = self._wait_for_zap_ready(ZAPConfig.STARTUP_TIMEOUT)
+            logger.info(f"Successfully connected to ZAP {version}")
             
-            # Check if process is still running
-            if self.daemon_process.poll() is not None:
-                with open(self.zap_log, 'r') as f: 
-                    error_log = f.read()
-                error_msg = (f"ZAP failed to start. Exit code: {self.daemon_process.returncode}\n"
-                             f"Log excerpt:\n{error_log[-2000:]}")
-                logger.error(error_msg)
-                raise RuntimeError(error_msg)
+            # Configure browser and OAST service
+            browser_configured = self._configure_browser_settings()
+            if browser_configured: 
+                logger.info("Browser settings configured successfully")
+            else: 
+                logger.warning("No browsers configured. DOM XSS scanning will be limited.")
                 
-            # Try to connect to ZAP API
-            for attempt in range(1, 6):
-                try:
-                    logger.info(f"Connecting to ZAP API (attempt {attempt}/5)...")
-                    self.zap = ZAPv2(
-                        apikey=self.api_key, 
-                        proxies={
-                            'http': f'http://{self.proxy_host}:{self.proxy_port}', 
-                            'https': f'http://{self.proxy_host}:{self.proxy_port}'
-                        }
-                    )
-                    version = self.zap.core.version
-                    logger.info(f"Successfully connected to ZAP {version}")
-                    
-                    # Configure browser and OAST service
-                    browser_configured = self._configure_browser_settings()
-                    if browser_configured: 
-                        logger.info("Browser settings configured successfully")
-                    else: 
-                        logger.warning("No browsers configured. DOM XSS scanning will be limited.")
-                        
-                    oast_configured = self._configure_oast_service()
-                    if oast_configured: 
-                        logger.info("OAST service configured successfully")
-                    else: 
-                        logger.warning("OAST service not configured. Some scanners will be limited.")
-                        
-                    elapsed = (datetime.now() - start_time).total_seconds()
-                    logger.info(f"ZAP startup completed in {elapsed:.2f} seconds")
-                    return True
-                except Exception as e:
-                    logger.warning(f"Connection attempt {attempt} failed: {str(e)}")
-                    if attempt < 5:
-                        logger.info("Waiting 5 seconds before next attempt...")
-                        time.sleep(5)
-                        
-            error_msg = "Failed to connect to ZAP after 5 attempts"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+            oast_configured = self._configure_oast_service()
+            if oast_configured: 
+                logger.info("OAST service configured successfully")
+            else: 
+                logger.warning("OAST service not configured. Some scanners will be limited.")
+                
+            elapsed = (datetime.now() - start_time).total_seconds()
+            logger.info(f"ZAP startup completed in {elapsed:.2f} seconds")
+            return True
         except Exception as e:
             logger.error(f"Failed to start ZAP: {str(e)}")
-            self._cleanup_existing_zap()
+            self._cleanup_existing_zap(kill_strays=kill_strays)
             raise RuntimeError(f"Failed to start ZAP: {str(e)}")
 
+    def _wait_for_zap_ready(self, timeout: float) -> str:
+        """
+        Poll core.version with exponential backoff until the API answers.
+
+        Returns:
+            The ZAP version string
+
+        Raises:
+            RuntimeError: If the process exits or the API does not answer within timeout
+        """
+        logger.info(f"Waiting for ZAP API on port {self.proxy_port} (timeout {timeout}s)...")
+        state: Dict[str, Any] = {"version": None, "attempts": 0}
+
+        def api_ready() -> bool:
+            if self.daemon_process and self.daemon_process.poll() is not None:
+                with open(self.zap_log, 'r', errors='replace') as f: 
+                    error_log = f.read()
+                raise RuntimeError(f"ZAP failed to start. Exit code: {self.daemon_process.returncode}\n"
+                                   f"Log excerpt:\n{error_log[-2000:]}")
+            state["attempts"] += 1
+            try:
+                state["version"] = self.zap.core.version
+                return True
+            except Exception as e:
+                logger.debug(f"ZAP API not ready (attempt {state['attempts']}): {str(e)}")
+                return False
+
+        if not poll_until(api_ready, timeout=timeout):
+            raise RuntimeError(f"ZAP API did not become ready within {timeout} seconds")
+        logger.info(f"ZAP API ready after {state['attempts']} polls")
+        return state["version"]
+
+    def _attach_daemon(self, daemon: ZAPDaemon):
+        """Point this scanner at a leased pool daemon instead of launching its own."""
+        self._daemon_lease = daemon
+        self.zap = daemon.zap
+        self.proxy_port = daemon.port
+        self.daemon_process = None  # Owned by the pool
+        self.firefox_binary_path = daemon.firefox_binary_path
+        self.oast_service_configured = daemon.oast_configured
+        logger.info(f"Attached to pooled ZAP daemon on port {daemon.port} (scans served: {daemon.scans_served})")
+
+    def _release_daemon(self):
+        """Return the leased daemon to its pool."""
+        daemon, self._daemon_lease = self._daemon_lease, None
+        self.zap = None
+        self.proxy_port = None  # The port belongs to the pool daemon
+        if daemon and self.daemon_pool:
+            self.daemon_pool.release(daemon)
+
+    def _halt_active_scans(self):
+        """Stop spider, AJAX spider and active scans on the current daemon without killing it."""
+        if not self.zap:
+            return
+        for description, action in (
+            ("AJAX spider", lambda: self.zap.ajaxSpider.stop()),
+            ("spider scans", lambda: self.zap.spider.stop_all_scans()),
+            ("active scans", lambda: self.zap.ascan.stop_all_scans()),
+        ):
+            try:
+                action()
+            except Exception as e:
+                logger.debug(f"Error stopping {description}: {str(e)}")
+
+    def _report_progress(self, **fields):
+        """Forward progress fields to progress_callback; reporting never interrupts a scan."""
+        if not self.progress_callback:
+            return
+        fields = {k: v for k, v in fields.items() if v is not None}
+        try:
+            self.progress_callback(**fields)
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {str(e)}")
+
     def _log_with_rate_limit(self, message: str, progress: int, elapsed: float,
                              last_logged_progress: int, log_interval: int = 30) -> bool:
         if progress != last_logged_progress or elapsed % log_interval < 5:
@@ -817,9 +1559,11 @@ class ZAPScanner:
 
     def _monitor_scan_progress(
             self, status_func: Callable, scan_id: str, scan_type: str, interval: int = 5):
+        """Poll scan status, starting fast and backing off to interval while progress is flat."""
         logger.info(f"Monitoring {scan_type} progress for scan ID: {scan_id}")
         start_time = datetime.now()
         last_logged_progress = -1
+        poll_interval = ZAPConfig.POLL_INITIAL_INTERVAL
         
         while True:
             try:
@@ -828,12 +1572,20 @@ class ZAPScanner:
                 
                 if self._log_with_rate_limit(f"{scan_type} progress", progress, elapsed, last_logged_progress):
                     last_logged_progress = progress
+                if scan_type == "Spider":
+                    self._report_progress(spider_progress=progress)
+                elif scan_type == "Active scan":
+                    self._report_progress(
+                        active_progress=progress,
+                        progress=self.PHASE_PROGRESS["active_scan"] + progress * self.ACTIVE_SCAN_PROGRESS_SPAN // 100
+                    )
                     
                 if progress >= 100:
                     logger.info(f"{scan_type} scan completed in {elapsed:.1f} seconds")
                     break
                     
-                time.sleep(interval)
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, interval)
             except Exception as e:
                 logger.error(f"Error monitoring {scan_type} progress: {str(e)}")
                 raise
@@ -854,6 +1606,7 @@ class ZAPScanner:
                 if status == "running":
                     current_results = self.zap.ajaxSpider.results()
                     current_count = len(current_results)
+                    self._report_progress(ajax_progress=progress_percent, ajax_urls=current_count)
                     
                     if elapsed % 10 < interval or abs(current_count - last_result_count) > 5:
                         logger.info(f"AJAX Spider running... ({progress_percent}%, {current_count} URLs, elapsed: {elapsed:.1f}s)")
@@ -895,28 +1648,52 @@ class ZAPScanner:
 
     @log_operation("Passive scan completion")
     def _wait_for_passive_scan_completion(self, max_wait_time: int = 300):
-        start_time = datetime.now()
-        max_wait_seconds = max_wait_time
+        """
+        Wait until pscan.records_to_scan reaches zero.
+
+        The poll interval adapts to the observed drain rate (short when the queue is
+        nearly empty, longer while it is large), and the wait ends early if the queue
+        stops shrinking for ZAPConfig.PASSIVE_STALL_SECONDS. max_wait_time is a safety cap.
+        """
+        start = time.monotonic()
         last_records = -1
+        last_change = start
+        last_sample: Optional[Tuple[float, int]] = None
         
         try:
             while True:
                 records_to_scan = int(self.zap.pscan.records_to_scan)
-                elapsed = (datetime.now() - start_time).total_seconds()
+                now = time.monotonic()
+                elapsed = now - start
                 
-                if records_to_scan != last_records or elapsed % 30 < 5:
+                if records_to_scan != last_records:
                     logger.info(f"Passive scan in progress: {records_to_scan} records left to scan (elapsed: {elapsed:.1f}s)")
+                    self._report_progress(passive_records=records_to_scan)
                     last_records = records_to_scan
+                    last_change = now
                     
                 if records_to_scan == 0:
                     logger.info(f"Passive scan completed in {elapsed:.1f} seconds")
                     break
                     
-                if elapsed > max_wait_seconds:
-                    logger.warning(f"Reached maximum wait time ({max_wait_seconds}s) for passive scan. Continuing with {records_to_scan} records left to scan.")
+                if elapsed > max_wait_time:
+                    logger.warning(f"Reached maximum wait time ({max_wait_time}s) for passive scan. Continuing with {records_to_scan} records left to scan.")
                     break
-                    
-                time.sleep(5)
+                
+                if now - last_change > ZAPConfig.PASSIVE_STALL_SECONDS:
+                    logger.warning(f"Passive scan queue stalled at {records_to_scan} records for {ZAPConfig.PASSIVE_STALL_SECONDS}s. Continuing.")
+                    break
+                
+                # Estimate time to drain from the last sample and poll at roughly half of it
+                interval = ZAPConfig.POLL_MAX_INTERVAL
+                if last_sample:
+                    sample_time, sample_records = last_sample
+                    drained = sample_records - records_to_scan
+                    if drained > 0 and now > sample_time:
+                        rate = drained / (now - sample_time)
+                        interval = (records_to_scan / rate) / 2
+                last_sample = (now, records_to_scan)
+                time.sleep(min(max(interval, ZAPConfig.POLL_INITIAL_INTERVAL), ZAPConfig.POLL_MAX_INTERVAL))
         except Exception as e:
             logger.error(f"Error waiting for passive scan: {str(e)}")
             raise
@@ -951,18 +1728,23 @@ class ZAPScanner:
             raise
 
     @log_operation("Active scan configuration")
-    def _configure_active_scanning(self):
+    def _configure_active_scanning(self, profile: Optional[ScanProfile] = None):
+        profile = profile or SCAN_PROFILES["deep"]
         try:
-            logger.info("Enabling ALL active scanners...")
-            self.zap.ascan.enable_all_scanners()
+            if profile.active_policies is None:
+                logger.info("Enabling ALL active scanners...")
+                self.zap.ascan.enable_all_scanners()
+            else:
+                logger.info(f"Enabling active scanners for policy categories {list(profile.active_policies)}...")
+                self.zap.ascan.set_enabled_policies(",".join(str(p) for p in profile.active_policies))
             
-            logger.info("Setting HIGH attack strength for all policies...")
+            logger.info(f"Setting {profile.attack_strength} attack strength for all policies...")
             for policy_id in range(0, 5):
-                self.zap.ascan.set_policy_attack_strength(id=policy_id, attackstrength="HIGH")
+                self.zap.ascan.set_policy_attack_strength(id=policy_id, attackstrength=profile.attack_strength)
                 
-            logger.info("Setting LOW alert threshold for all policies...")
+            logger.info(f"Setting {profile.alert_threshold} alert threshold for all policies...")
             for policy_id in range(0, 5):
-                self.zap.ascan.set_policy_alert_threshold(id=policy_id, alertthreshold="LOW")
+                self.zap.ascan.set_policy_alert_threshold(id=policy_id, alertthreshold=profile.alert_threshold)
                 
             logger.info("Configuring scan policy options...")
             self.zap.ascan.set_option_handle_anti_csrf_tokens(True)
@@ -1040,7 +1822,6 @@ class ZAPScanner:
                 url = f"{base_url}{path}"
                 logger.debug(f"Accessing: {url}")
                 self.zap.core.access_url(url, followredirects=True)
-                time.sleep(0.3)
             except Exception as e:
                 logger.debug(f"Error accessing {url}: {str(e)}")
                 
@@ -1058,7 +1839,7 @@ class ZAPScanner:
                 if current_status == "running":
                     logger.info("Stopping previously running AJAX Spider...")
                     self.zap.ajaxSpider.stop()
-                    time.sleep(2)
+                    poll_until(lambda: self.zap.ajaxSpider.status != "running", timeout=10)
             except Exception as e:
                 logger.warning(f"Error checking AJAX Spider status: {str(e)}")
                 
@@ -1106,30 +1887,209 @@ class ZAPScanner:
             self._attempt_stop_ajax()
             return False
 
-    def _collect_source_files(self, target_url: str) -> Dict[str, str]:
-        logger.info("Collecting source files for code analysis...")
-        collected_files = {}
+    def _seed_flask_routes(self, target_url: str) -> int:
+        """
+        Feed the app's statically extracted Flask routes to ZAP so the API can be
+        scanned without crawling. Uses the OpenAPI add-on, falling back to sending
+        one request per route. Returns the number of routes seeded.
+        """
+        if not self.source_root_dir:
+            return 0
+        routes = extract_app_routes(self.source_root_dir)
+        if not routes:
+            logger.info("No Flask routes found to seed")
+            return 0
+        
+        spec = build_openapi_spec(routes, target_url, title=Path(self.source_root_dir).name)
+        spec_file = None
+        try:
+            with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+                json.dump(spec, f)
+                spec_file = f.name
+            warnings = self.zap.openapi.import_file(spec_file, target=target_url)
+            logger.info(f"Imported OpenAPI definition with {len(routes)} Flask routes")
+            if warnings:
+                logger.debug(f"OpenAPI import warnings: {warnings}")
+            return len(routes)
+        except Exception as e:
+            logger.warning(f"OpenAPI import failed ({str(e)}); seeding routes directly")
+        finally:
+            if spec_file:
+                try:
+                    os.unlink(spec_file)
+                except OSError:
+                    pass
         
-        if hasattr(self.zap, 'core') and hasattr(self.zap.core, 'messages'):
+        for route in routes:
+            for method in route.methods:
+                try:
+                    self._send_route_request(target_url, route, method)
+                except Exception as e:
+                    logger.debug(f"Error seeding {method} {route.path}: {str(e)}")
+        logger.info(f"Seeded {len(routes)} Flask routes directly")
+        return len(routes)
+
+    def _send_route_request(self, target_url: str, route: FlaskRoute, method: str):
+        url = target_url.rstrip("/") + route.sample_path()
+        query = route.sample_query()
+        if query:
+            url += "?" + urlencode(query)
+        if method == "GET":
+            self.zap.core.access_url(url, followredirects=False)
+            return
+        host = url.split("://", 1)[-1].split("/", 1)[0]
+        body = json.dumps(route.sample_body()) if method in ("POST", "PUT", "PATCH") else ""
+        request = (
+            f"{method} {url} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body.encode('utf-8'))}\r\n\r\n"
+            f"{body}"
+        )
+        self.zap.core.send_request(request, followredirects=False)
+
+    @staticmethod
+    def _discovery_file(target: str) -> str:
+        if target == "frontend":
+            return ZAPConfig.DISCOVERY_FILE
+        return ZAPConfig.DISCOVERY_FILE.replace(".json", f"_{target}.json")
+
+    @staticmethod
+    def _results_file(target: str) -> str:
+        if target == "frontend":
+            return ZAPConfig.RESULTS_FILE
+        return ZAPConfig.RESULTS_FILE.replace(".json", f"_{target}.json")
+
+    def _load_discovery_state(self, model: str, app_num: int, target: str = "frontend") -> Optional[DiscoveryState]:
+        try:
+            data = self.results_manager.load_results(model=model, app_num=app_num, file_name=self._discovery_file(target))
+            return DiscoveryState.from_dict(data) if data else None
+        except Exception as e:
+            logger.warning(f"Could not load discovery state for {model}/app{app_num}: {str(e)}")
+            return None
+
+    def _save_discovery_state(self, model: str, app_num: int, state: DiscoveryState, target: str = "frontend"):
+        try:
+            self.results_manager.save_results(
+                model=model,
+                app_num=app_num,
+                results=asdict(state),
+                file_name=self._discovery_file(target),
+                maintain_legacy=False
+            )
+        except Exception as e:
+            logger.warning(f"Could not save discovery state for {model}/app{app_num}: {str(e)}")
+
+    def _restore_discovery(self, previous: DiscoveryState, target_url: str) -> Optional[str]:
+        """
+        Reload the previous session, or re-seed the sites tree from the stored URLs.
+
+        Returns "session" when the saved session (including its alerts) was loaded,
+        "urls" when only the URL tree could be restored, or None.
+        """
+        if previous.session_path and Path(f"{previous.session_path}.session").exists():
             try:
-                messages = self.zap.core.messages(baseurl=target_url)
-                for message in messages:
-                    url = message.get('url', '')
-                    if not url: 
-                        continue
-                        
-                    if any(url.endswith(ext) for ext in self.source_file_extensions):
-                        message_id = message.get('id')
-                        if message_id:
-                            try:
-                                full_message = self.zap.core.message(message_id)
-                                if full_message and 'responseBody' in full_message:
-                                    logger.debug(f"Collected source from URL: {url}")
-                                    collected_files[url] = full_message['responseBody']
-                            except Exception as e:
-                                logger.debug(f"Error retrieving message {message_id}: {str(e)}")
+                self.zap.core.load_session(previous.session_path)
+                logger.info(f"Loaded previous ZAP session from {previous.session_path}")
+                return "session"
             except Exception as e:
-                logger.warning(f"Error collecting source files: {str(e)}")
+                logger.warning(f"Could not load ZAP session {previous.session_path}: {str(e)}")
+        if not previous.urls:
+            return None
+        logger.info(f"Re-seeding sites tree with {len(previous.urls)} previously discovered URLs")
+        for url in previous.urls:
+            try:
+                self.zap.core.access_url(url, followredirects=False)
+            except Exception as e:
+                logger.debug(f"Could not re-seed {url}: {str(e)}")
+        return "urls"
+
+    def _endpoint_sources(self, urls: List[str]) -> Dict[str, str]:
+        """Map discovered URLs to source files relative to the app root."""
+        if not self.source_root_dir:
+            return {}
+        index = self._get_source_index()
+        sources = {}
+        for url in urls:
+            source_file = index.resolve(url)
+            if source_file:
+                sources[url] = Path(source_file).relative_to(index.root_dir).as_posix()
+        return sources
+
+    def _plan_active_scope(self, previous: DiscoveryState, current: DiscoveryState,
+                           urls: List[str]) -> Optional[List[str]]:
+        """
+        Work out which endpoints need active scanning.
+
+        Returns the new or changed URLs, or None when a changed file cannot be
+        tied to any endpoint and the whole target must be scanned.
+        """
+        changed_files = {
+            path for path in set(previous.file_hashes) | set(current.file_hashes)
+            if previous.file_hashes.get(path) != current.file_hashes.get(path)
+        }
+        endpoint_sources = self._endpoint_sources(urls)
+        mapped_files = set(endpoint_sources.values())
+        unmapped = changed_files - mapped_files
+        if unmapped:
+            logger.info(f"{len(unmapped)} changed files are not tied to an endpoint (e.g. {sorted(unmapped)[:3]}); full active scan required")
+            return None
+        known_urls = set(previous.urls)
+        scope = [
+            url for url in urls
+            if url not in known_urls or endpoint_sources.get(url) in changed_files
+        ]
+        logger.info(f"Incremental active scope: {len(scope)} of {len(urls)} endpoints new or changed")
+        return scope
+
+    def _purge_alerts_for(self, target_url: str, urls: Set[str]):
+        """Drop alerts from a reloaded session for endpoints that are about to be rescanned."""
+        removed = 0
+        for alert in list(iter_paged(
+                lambda start, count: self.zap.core.alerts(baseurl=target_url, start=start, count=count),
+                ZAPConfig.ALERT_PAGE_SIZE)):
+            if alert.get('url') in urls and alert.get('id'):
+                try:
+                    self.zap.alert.delete_alert(alert['id'])
+                    removed += 1
+                except Exception as e:
+                    logger.debug(f"Could not delete alert {alert.get('id')}: {str(e)}")
+        logger.info(f"Removed {removed} stale alerts for rescanned endpoints")
+
+    def _run_active_scan(self, url: str, recurse: bool):
+        scan_id = self.zap.ascan.scan(
+            url=url, 
+            recurse=recurse, 
+            inscopeonly=False, 
+            scanpolicyname=None, 
+            method=None, 
+            postdata=True
+        )
+        
+        if not str(scan_id).isdigit():
+            error_msg = f"Active scan did not start properly; scan id: {scan_id}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+            
+        logger.info(f"Active scan started with ID: {scan_id}")
+        self._monitor_scan_progress(self.zap.ascan.status, scan_id, "Active scan", interval=5)
+
+    def _collect_source_files(self, target_url: str,
+                              message_index: Optional[MessageIndex] = None) -> Dict[str, str]:
+        logger.info("Collecting source files for code analysis...")
+        collected_files = {}
+        message_index = message_index or MessageIndex(self.zap, target_url)
+        
+        try:
+            for url in message_index.urls():
+                if not any(url.endswith(ext) for ext in self.source_file_extensions):
+                    continue
+                for _, body in message_index.bodies_for_url(url):
+                    logger.debug(f"Collected source from URL: {url}")
+                    collected_files[url] = body
+                    break
+        except Exception as e:
+            logger.warning(f"Error collecting source files: {str(e)}")
                 
         logger.info(f"Collected {len(collected_files)} potential source files for analysis")
         return collected_files
@@ -1142,7 +2102,14 @@ class ZAPScanner:
         frontend_port = frontend_port_start + ((app_num - 1) * ZAPConfig.PORTS_PER_APP)
         return f"http://localhost:{frontend_port}"
 
-    def save_scan_results(self, model: str, app_num: int, vulnerabilities: List[ZapVulnerability], summary: Dict) -> Optional[Path]:
+    def _calculate_backend_url(self, model: str, app_num: int) -> str:
+        """Calculate the URL of an app's Flask backend; backend ports mirror the frontend layout."""
+        frontend_url = self._calculate_app_url(model, app_num)
+        frontend_port = int(frontend_url.rsplit(":", 1)[1])
+        return f"http://localhost:{frontend_port - (ZAPConfig.BASE_FRONTEND_PORT - ZAPConfig.BASE_BACKEND_PORT)}"
+
+    def save_scan_results(self, model: str, app_num: int, vulnerabilities: List[ZapVulnerability], summary: Dict,
+                          target: str = "frontend") -> Optional[Path]:
         """
         Save scan results to a JSON file using JsonResultsManager.
         
@@ -1151,27 +2118,29 @@ class ZAPScanner:
             app_num: Application number
             vulnerabilities: List of ZapVulnerability objects
             summary: Dictionary with scan summary information
+            target: Scanned target; backend results are kept in their own file
         
         Returns:
             Path where results were saved or None if there was an error
         """
         try:
-            # Prepare data for saving
-            results_dict = {
-                "alerts": [],
-                "summary": summary,
-                "scan_time": datetime.now().isoformat()
-            }
-            
-            # Convert vulnerabilities to dictionaries
+            # Group near-identical alerts so shared text is stored once
+            grouper = AlertGrouper()
             for vuln in vulnerabilities:
-                vuln_dict = asdict(vuln)
-                if vuln.affected_code:
-                    vuln_dict['affected_code'] = asdict(vuln.affected_code)
-                results_dict['alerts'].append(vuln_dict)
+                grouper.add(asdict(vuln))
+            summary["alert_groups"] = len(grouper.groups)
+            logger.info(f"Grouped {grouper.alert_count} alerts into {len(grouper.groups)} groups "
+                        f"({len(grouper.texts)} distinct rule texts, {len(grouper.codes)} code contexts)")
+            
+            # Prepare data for saving
+            results_dict = dict(
+                grouper.to_results(),
+                summary=summary,
+                scan_time=datetime.now().isoformat()
+            )
             
             # Use JsonResultsManager to save the results
-            file_name = ".zap_results.json"
+            file_name = self._results_file(target)
             results_path = self.results_manager.save_results(
                 model=model,
                 app_num=app_num,
@@ -1186,19 +2155,20 @@ class ZAPScanner:
             logger.error(f"Error saving scan results: {e}")
             return None
 
-    def load_scan_results(self, model: str, app_num: int) -> Optional[Dict[str, Any]]:
+    def load_scan_results(self, model: str, app_num: int, target: str = "frontend") -> Optional[Dict[str, Any]]:
         """
         Load scan results from a JSON file using JsonResultsManager.
         
         Args:
             model: Model name
             app_num: Application number
+            target: Scanned target ("frontend" or "backend")
         
         Returns:
             Dictionary containing scan results or None if not found
         """
         try:
-            file_name = ".zap_results.json"
+            file_name = self._results_file(target)
             data = self.results_manager.load_results(
                 model=model,
                 app_num=app_num,
@@ -1229,45 +2199,11 @@ class ZAPScanner:
         results = self.load_scan_results(model, app_num)
         vulnerabilities = []
         
-        if not results or 'alerts' not in results:
+        if not results or not ('alerts' in results or 'groups' in results):
             return vulnerabilities
             
         try:
-            for alert in results['alerts']:
-                # Create CodeContext object if present
-                affected_code = None
-                if 'affected_code' in alert and alert['affected_code']:
-                    ac_data = alert['affected_code']
-                    affected_code = CodeContext(
-                        snippet=ac_data.get('snippet', ''),
-                        line_number=ac_data.get('line_number'),
-                        file_path=ac_data.get('file_path'),
-                        start_line=ac_data.get('start_line', 0),
-                        end_line=ac_data.get('end_line', 0),
-                        vulnerable_lines=ac_data.get('vulnerable_lines', []),
-                        highlight_positions=ac_data.get('highlight_positions', [])
-                    )
-                
-                # Create ZapVulnerability object
-                vuln = ZapVulnerability(
-                    url=alert.get('url', ''),
-                    name=alert.get('name', ''),
-                    alert=alert.get('alert', ''),
-                    risk=alert.get('risk', ''),
-                    confidence=alert.get('confidence', ''),
-                    description=alert.get('description', ''),
-                    solution=alert.get('solution', ''),
-                    reference=alert.get('reference', ''),
-                    evidence=alert.get('evidence'),
-                    cwe_id=alert.get('cwe_id'),
-                    parameter=alert.get('parameter'),
-                    attack=alert.get('attack'),
-                    wascid=alert.get('wascid'),
-                    affected_code=affected_code,
-                    source_file=alert.get('source_file')
-                )
-                vulnerabilities.append(vuln)
-                
+            vulnerabilities = list(iter_result_vulnerabilities(results))
             logger.info(f"Loaded {len(vulnerabilities)} vulnerabilities for {model}/app{app_num}")
             return vulnerabilities
         except Exception as e:
@@ -1275,7 +2211,22 @@ class ZAPScanner:
             return []
 
     @log_operation("Target scan")
-    def scan_target(self, target_url: str, quick_scan: bool = False) -> Tuple[List[ZapVulnerability], Dict]:
+    def scan_target(self, target_url: str, quick_scan: bool = False,
+                    discovery: Optional[DiscoveryState] = None,
+                    previous: Optional[DiscoveryState] = None,
+                    profile: Optional[ScanProfile] = None) -> Tuple[List[ZapVulnerability], Dict]:
+        """
+        Run a ZAP scan of target_url using a scan profile.
+
+        profile defaults to the quick or comprehensive profile chosen by
+        quick_scan (see get_scan_profile).
+
+        When both discovery (the current app state) and previous (the state
+        saved by the last scan) are given the scan is incremental: the saved
+        session is reloaded, spidering is skipped if the source hash is
+        unchanged, and active scanning is limited to new or changed endpoints.
+        discovery is filled in with this scan's URLs for the next run.
+        """
         scan_start_time = datetime.now()
         vulnerabilities: List[ZapVulnerability] = []
         summary: Dict = {
@@ -1284,84 +2235,142 @@ class ZAPScanner:
             "status": "in_progress", 
             "scan_mode": "quick" if quick_scan else "comprehensive"
         }
+        profile = profile or get_scan_profile(None, quick_scan)
+        summary["profile"] = profile.name
+        self.max_children = profile.max_children
+        self.thread_per_host = profile.thread_per_host
         
-        scan_type = 'quick' if quick_scan else 'comprehensive'
-        logger.info(f"Starting {scan_type} scan of target: {target_url}")
+        logger.info(f"Starting '{profile.name}' profile scan of target: {target_url}")
+        timer = PhaseTimer(
+            on_start=lambda name: self._report_progress(phase=name, progress=self.PHASE_PROGRESS.get(name))
+        )
+        summary["phase_timings"] = timer.timings
+        
+        # Build the URL -> source file index once per scan
+        self.source_index = None
+        if self.source_root_dir:
+            with timer.phase("source_index"):
+                self._get_source_index()
         
         try:
-            # Start ZAP daemon
-            if not self._start_zap_daemon():
-                error_msg = "Failed to start ZAP daemon"
-                logger.error(error_msg)
-                return [], {"status": "failed", "error": error_msg}
+            # Lease a warm daemon from the pool, or start a dedicated one
+            with timer.phase("daemon_startup"):
+                if self.daemon_pool:
+                    self._attach_daemon(self.daemon_pool.acquire())
+                elif not self._start_zap_daemon():
+                    error_msg = "Failed to start ZAP daemon"
+                    logger.error(error_msg)
+                    return [], {"status": "failed", "error": error_msg, "phase_timings": timer.timings}
+            summary["zap_port"] = self.proxy_port
+            
+            # Incremental mode: reload what the previous scan discovered
+            restored = None
+            if discovery is not None and previous is not None:
+                with timer.phase("restore_discovery"):
+                    restored = self._restore_discovery(previous, target_url)
+            incremental = restored is not None
+            skip_spidering = incremental and previous.source_hash == discovery.source_hash
+            summary["incremental"] = {"enabled": incremental, "spidering_skipped": skip_spidering}
+            if skip_spidering:
+                logger.info("Source unchanged since last scan; reusing previous discovery")
                 
             # Configure and run passive scan
-            self._configure_passive_scanning()
-            logger.info(f"Accessing target URL: {target_url}")
-            self.zap.core.access_url(target_url, followredirects=True)
-            logger.info("Initial target access complete")
-            time.sleep(2)
-            
-            # Additional discovery
-            self._perform_extended_spidering(target_url)
-            logger.info("Checking passive scan status after initial discovery...")
-            self._wait_for_passive_scan_completion(max_wait_time=60)
-            
-            # Traditional spider scan
-            logger.info(f"Starting traditional spider scan with maxChildren={self.max_children}")
-            spider_id = self.zap.spider.scan(
-                url=target_url, 
-                maxchildren=self.max_children, 
-                recurse=self.scan_recursively
-            )
-            logger.info(f"Spider scan started with ID: {spider_id}")
-            self._monitor_scan_progress(self.zap.spider.status, spider_id, "Spider", interval=2)
+            with timer.phase("initial_discovery"):
+                self._configure_passive_scanning()
+                self.zap.spider.set_option_max_depth(profile.spider_max_depth)
+                self.zap.spider.set_option_max_children(profile.max_children)
+                logger.info(f"Accessing target URL: {target_url}")
+                self.zap.core.access_url(target_url, followredirects=True)
+                logger.info("Initial target access complete")
+                
+                # Additional discovery
+                if not skip_spidering:
+                    self._perform_extended_spidering(target_url)
+            if profile.seed_routes:
+                with timer.phase("route_seeding"):
+                    summary["seeded_routes"] = self._seed_flask_routes(target_url)
+            with timer.phase("passive_wait_initial"):
+                logger.info("Checking passive scan status after initial discovery...")
+                self._wait_for_passive_scan_completion(max_wait_time=60)
             
-            # AJAX spider for dynamic content
-            if quick_scan:
-                logger.info("Quick scan: Performing focused AJAX crawling...")
-                self._run_ajax_spider(target_url, focused=True)
-            else:
-                self._run_ajax_spider(target_url, focused=False)
+            if not skip_spidering and profile.spider:
+                # Traditional spider scan
+                with timer.phase("spider"):
+                    logger.info(f"Starting traditional spider scan with maxChildren={self.max_children}")
+                    spider_id = self.zap.spider.scan(
+                        url=target_url, 
+                        maxchildren=self.max_children, 
+                        recurse=self.scan_recursively
+                    )
+                    logger.info(f"Spider scan started with ID: {spider_id}")
+                    self._monitor_scan_progress(self.zap.spider.status, spider_id, "Spider", interval=2)
+                
+            if not skip_spidering and profile.ajax_spider:
+                # AJAX spider for dynamic content
+                with timer.phase("ajax_spider"):
+                    if profile.ajax_spider == "focused":
+                        logger.info("Performing focused AJAX crawling...")
+                        self._run_ajax_spider(target_url, focused=True)
+                    else:
+                        self._run_ajax_spider(target_url, focused=False)
                 
             # Wait for passive scan to process discovered content
-            logger.info("Waiting for passive scan to process all discovered content...")
-            passive_wait_time = 300 if quick_scan else 600
-            self._wait_for_passive_scan_completion(max_wait_time=passive_wait_time)
+            with timer.phase("passive_wait_discovery"):
+                logger.info("Waiting for passive scan to process all discovered content...")
+                self._wait_for_passive_scan_completion(max_wait_time=profile.passive_wait)
             
-            # Configure and run active scan
-            self._configure_active_scanning()
-            logger.info("Starting active scan with comprehensive settings...")
-            scan_id = self.zap.ascan.scan(
-                url=target_url, 
-                recurse=self.scan_recursively, 
-                inscopeonly=False, 
-                scanpolicyname=None, 
-                method=None, 
-                postdata=True
-            )
+            discovered_urls = list(self.zap.core.urls(baseurl=target_url)) if discovery is not None else []
+            # Only a reloaded session from an actively scanned run carries findings that let the active scope shrink
+            active_scope = None
+            if restored == "session" and previous.active_scanned:
+                active_scope = self._plan_active_scope(previous, discovery, discovered_urls)
+            elif restored == "session" and profile.active_scan:
+                logger.info("Previous scan was passive-only; full active scan required")
             
-            if not str(scan_id).isdigit():
-                error_msg = f"Active scan did not start properly; scan id: {scan_id}"
-                logger.error(error_msg)
-                raise RuntimeError(error_msg)
-                
-            logger.info(f"Active scan started with ID: {scan_id}")
-            self._monitor_scan_progress(self.zap.ascan.status, scan_id, "Active scan", interval=5)
+            # Configure and run active scan
+            if not profile.active_scan:
+                logger.info(f"Profile '{profile.name}' is passive-only; skipping active scan")
+                active_scope = []
+            with timer.phase("active_scan"):
+                if profile.active_scan:
+                    self._configure_active_scanning(profile)
+                if active_scope is None:
+                    logger.info("Starting active scan with comprehensive settings...")
+                    self._run_active_scan(target_url, recurse=self.scan_recursively)
+                elif active_scope and profile.active_scan:
+                    logger.info(f"Starting incremental active scan of {len(active_scope)} endpoints...")
+                    self._purge_alerts_for(target_url, set(active_scope))
+                    for endpoint in active_scope:
+                        self._run_active_scan(endpoint, recurse=False)
+                elif profile.active_scan:
+                    logger.info("No new or changed endpoints; skipping active scan")
+            if incremental:
+                summary["incremental"]["active_scope"] = "full" if active_scope is None else len(active_scope)
             
             # Final passive scan check
-            logger.info("Performing final passive scan check...")
-            final_wait_time = 120 if quick_scan else 300
-            self._wait_for_passive_scan_completion(max_wait_time=final_wait_time)
+            with timer.phase("passive_wait_final"):
+                logger.info("Performing final passive scan check...")
+                self._wait_for_passive_scan_completion(max_wait_time=profile.final_passive_wait)
             
-            # Collect source files for code analysis
-            source_files = self._collect_source_files(target_url)
-            logger.info(f"Collected {len(source_files)} source files for code analysis")
+            # Index recorded messages once; source collection and alert
+            # processing both resolve response bodies from this index
+            message_index = MessageIndex(self.zap, target_url)
+            with timer.phase("source_collection"):
+                message_index.load()
+                source_files = self._collect_source_files(target_url, message_index)
+                logger.info(f"Collected {len(source_files)} source files for code analysis")
             
             # Process alerts
             logger.info("Retrieving final scan alerts...")
-            alerts = self.zap.core.alerts(baseurl=target_url)
+            with timer.phase("alert_retrieval"):
+                alerts = list(iter_paged(
+                    lambda start, count: self.zap.core.alerts(baseurl=target_url, start=start, count=count),
+                    ZAPConfig.ALERT_PAGE_SIZE
+                ))
             logger.info(f"Found {len(alerts)} total alerts")
+            self._report_progress(alert_count=len(alerts))
+            timer.start("alert_processing")
+            self._register_alert_evidence(alerts)
             
             # Track statistics
             risk_counts = {"High": 0, "Medium": 0, "Low": 0, "Info": 0}
@@ -1393,7 +2402,7 @@ class ZAPScanner:
                     alert_categories[category].append(name)
                     
                     # Extract affected code
-                    affected_code = self._get_affected_code(alert)
+                    affected_code = self._get_affected_code(alert, message_index)
                     source_file = None
                     if affected_code and affected_code.file_path: 
                         source_file = affected_code.file_path
@@ -1414,7 +2423,8 @@ class ZAPScanner:
                         attack=alert.get('attack', ''), 
                         wascid=alert.get('wascid', ''), 
                         affected_code=affected_code, 
-                        source_file=source_file
+                        source_file=source_file, 
+                        plugin_id=alert.get('pluginId')
                     )
                     vulnerabilities.append(vuln)
                     
@@ -1432,6 +2442,9 @@ class ZAPScanner:
                     logger.error(f"Error processing alert #{idx}: {str(e)}")
                     continue
                     
+            timer.stop("alert_processing")
+            logger.info(f"Resolved alert and source content with {message_index.api_calls} ZAP message API calls")
+            
             # Log alert categories
             logger.info("Alert categories summary:")
             for category, alerts_list in alert_categories.items():
@@ -1444,19 +2457,34 @@ class ZAPScanner:
             scan_end_time = datetime.now()
             duration_seconds = int((scan_end_time - scan_start_time).total_seconds())
             logger.info(f"Scan completed in {duration_seconds} seconds ({duration_seconds/60:.1f} minutes)")
+            logger.info("Phase timings: " + ", ".join(f"{name}={secs:.1f}s" for name, secs in timer.timings.items()))
             logger.info(f"Risk breakdown: High={risk_counts['High']}, Medium={risk_counts['Medium']}, Low={risk_counts['Low']}, Info={risk_counts['Info']}")
             
             with_code = sum(1 for v in vulnerabilities if v.affected_code and v.affected_code.snippet)
             logger.info(f"Vulnerabilities with affected code identified: {with_code}/{len(vulnerabilities)}")
             
+            # Record discovery (and the session, if we have somewhere to put it) for the next run
+            if discovery is not None:
+                discovery.urls = discovered_urls
+                discovery.endpoint_sources = self._endpoint_sources(discovered_urls)
+                discovery.scan_time = scan_end_time.isoformat()
+                if discovery.session_path:
+                    try:
+                        Path(discovery.session_path).parent.mkdir(parents=True, exist_ok=True)
+                        self.zap.core.save_session(discovery.session_path, overwrite=True)
+                    except Exception as e:
+                        logger.warning(f"Could not save ZAP session: {str(e)}")
+                        discovery.session_path = None
+            
             summary.update({
                 "status": "success", 
                 "end_time": scan_end_time.isoformat(), 
                 "duration_seconds": duration_seconds, 
                 "total_alerts": len(vulnerabilities), 
                 "risk_counts": risk_counts, 
-                "passive_scan_enabled": True, 
-                "ajax_spider_enabled": True, 
+                "passive_scan_enabled": profile.passive_wait > 0 or profile.final_passive_wait > 0, 
+                "ajax_spider_enabled": bool(profile.ajax_spider), 
+                "active_scan_enabled": profile.active_scan, 
                 "unique_alert_types": len(alert_names), 
                 "alert_categories": {k: len(v) for k, v in alert_categories.items()}, 
                 "vulnerabilities_with_code": with_code, 
@@ -1474,80 +2502,213 @@ class ZAPScanner:
             return [], summary
         finally:
             # Always clean up resources
-            logger.info("Cleaning up ZAP resources...")
-            self._cleanup_existing_zap()
+            if self._daemon_lease:
+                logger.info("Returning ZAP daemon to pool...")
+                self._release_daemon()
+            else:
+                logger.info("Cleaning up ZAP resources...")
+                self._cleanup_existing_zap()
+
+    @staticmethod
+    def _report_group_key(vuln: ZapVulnerability) -> Tuple:
+        """Alerts for the same rule at the same code location are reported once."""
+        code = vuln.affected_code
+        if code and code.snippet and code.file_path:
+            return (vuln.name, code.file_path, code.line_number)
+        return (vuln.name, vuln.url, vuln.parameter, vuln.evidence)
+
+    def _group_report_findings(self, vulnerabilities: Iterable[ZapVulnerability]) -> Dict[str, List[List[ZapVulnerability]]]:
+        """Bucket vulnerabilities by risk, then into duplicate groups in first-seen order."""
+        groups: Dict[str, Dict[Tuple, List[ZapVulnerability]]] = {risk: {} for risk in self.REPORT_RISK_ORDER}
+        for vuln in vulnerabilities:
+            risk = "Informational" if vuln.risk == "Info" else vuln.risk
+            if risk in groups:
+                groups[risk].setdefault(self._report_group_key(vuln), []).append(vuln)
+        return {risk: list(by_key.values()) for risk, by_key in groups.items()}
+
+    def _render_report_group(self, index: int, group: List[ZapVulnerability]) -> str:
+        """Markdown for one group of duplicate findings."""
+        vuln = group[0]
+        report = [f"### {index}. {vuln.name}\n"]
+        urls = list(dict.fromkeys(v.url for v in group))
+        if len(urls) == 1:
+            report.append(f"- **URL**: {urls[0]}\n")
+        else:
+            report.append(f"- **URLs** ({len(urls)}):")
+            for url in urls[:ZAPConfig.CODE_REPORT_MAX_URLS]:
+                report.append(f"  - {url}")
+            if len(urls) > ZAPConfig.CODE_REPORT_MAX_URLS:
+                report.append(f"  - ... and {len(urls) - ZAPConfig.CODE_REPORT_MAX_URLS} more")
+            report.append("")
+        parameters = list(dict.fromkeys(v.parameter for v in group if v.parameter))
+        if parameters: 
+            report.append(f"- **Parameter**: {', '.join(parameters)}\n")
+        if len(group) > 1:
+            report.append(f"- **Occurrences**: {len(group)}\n")
+        report.append(f"- **Confidence**: {vuln.confidence}\n")
+        report.append(f"- **Description**: {vuln.description}\n")
+        report.append(f"- **Solution**: {vuln.solution}\n")
+        if vuln.cwe_id: 
+            report.append(f"- **CWE ID**: {vuln.cwe_id}\n")
+            
+        # Include affected code if available
+        if vuln.affected_code and vuln.affected_code.snippet:
+            code = vuln.affected_code
+            report.append("\n#### Affected Code\n")
+            if code.file_path: 
+                report.append(f"**File**: {code.file_path}\n")
+            if code.line_number: 
+                report.append(f"**Line**: {code.line_number}\n")
+            report.append("\n```\n")
+            
+            # Format code with line numbers if available
+            if code.start_line > 0:
+                lines = code.snippet.split('\n')
+                numbered_lines = []
+                for i_line, line_content in enumerate(lines, code.start_line):
+                    line_num_str = f"{i_line:4d} | "
+                    if i_line in code.vulnerable_lines: 
+                        numbered_lines.append(f"{line_num_str}{line_content}  <-- VULNERABILITY")
+                    else: 
+                        numbered_lines.append(f"{line_num_str}{line_content}")
+                report.append('\n'.join(numbered_lines))
+            else: 
+                report.append(code.snippet)
+            report.append("\n```\n")
+        # Include evidence if no code context is available
+        elif vuln.evidence:
+            report.append("\n#### Evidence\n")
+            report.append("\n```\n")
+            report.append(vuln.evidence)
+            report.append("\n```\n")
+            
+        report.append("\n---\n")
+        return '\n'.join(report) + '\n'
+
+    def _iter_report_chunks(self, groups: Dict[str, List[List[ZapVulnerability]]],
+                            on_group: Optional[Callable[[], None]] = None) -> Iterator[str]:
+        """Yield the report as Markdown chunks: header and summary, then one chunk per group."""
+        report = ["# Security Vulnerability Report with Affected Code\n", "## Summary\n"]
+        for risk in self.REPORT_RISK_ORDER:
+            findings = sum(len(group) for group in groups[risk])
+            if findings: 
+                report.append(f"- **{risk}**: {findings} vulnerabilities ({len(groups[risk])} unique)\n")
+        yield '\n'.join(report) + '\n'
+        
+        for risk in self.REPORT_RISK_ORDER:
+            if not groups[risk]: 
+                continue
+            yield f"\n## {risk} Risk Vulnerabilities\n\n"
+            for i, group in enumerate(groups[risk], 1):
+                yield self._render_report_group(i, group)
+                if on_group:
+                    on_group()
+
+    @log_operation("Affected code report writing")
+    def write_affected_code_report(self, vulnerabilities: Iterable[ZapVulnerability], output_file: Union[str, Path],
+                                   progress_callback: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
+        """
+        Stream the affected-code report to output_file group by group.
+
+        The file is written to a temporary path and moved into place when
+        complete, so readers never see a partial report.
+
+        Args:
+            vulnerabilities: Findings to report (any iterable, consumed once)
+            output_file: Destination Markdown file
+            progress_callback: Called with groups_written/groups_total as groups are written
+
+        Returns:
+            Dictionary with finding, group and code-match counts
+        """
+        groups = self._group_report_findings(vulnerabilities)
+        all_groups = [group for risk in self.REPORT_RISK_ORDER for group in groups[risk]]
+        stats = {
+            "findings": sum(len(group) for group in all_groups),
+            "groups": len(all_groups),
+            "vulnerabilities_with_code": sum(
+                1 for group in all_groups for vuln in group if vuln.affected_code and vuln.affected_code.snippet
+            ),
+        }
+        written = 0
+
+        def on_group():
+            nonlocal written
+            written += 1
+            if progress_callback and (written % 25 == 0 or written == stats["groups"]):
+                progress_callback(groups_written=written, groups_total=stats["groups"])
+
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for chunk in self._iter_report_chunks(groups, on_group):
+                f.write(chunk)
+        os.replace(temp_path, output_path)
+        logger.info(f"Wrote affected code report to {output_path}: {stats['findings']} findings in {stats['groups']} groups")
+        return stats
+
+    def _code_report_meta_path(self, report_file: Path) -> Path:
+        return Path(report_file).with_name(ZAPConfig.CODE_REPORT_META_FILE)
+
+    def cached_code_report(self, results_file: Union[str, Path], report_file: Union[str, Path],
+                           results_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the report metadata if report_file is current for results_file, else None."""
+        report_path = Path(report_file)
+        meta_path = self._code_report_meta_path(report_path)
+        if not report_path.is_file() or not meta_path.is_file():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            results_hash = results_hash or FileUtils.hash_file(results_file)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable code report cache {meta_path}: {str(e)}")
+            return None
+        if meta.get("version") != ZAPConfig.CODE_REPORT_VERSION or meta.get("results_hash") != results_hash:
+            return None
+        return meta
+
+    def regenerate_code_report(self, results_file: Union[str, Path], report_file: Union[str, Path],
+                               force: bool = False,
+                               progress_callback: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
+        """
+        Rebuild the affected-code report from a saved results file.
+
+        Skipped when the report was already generated from identical results
+        unless force is set.
+
+        Returns:
+            Report metadata with a "cached" flag
+        """
+        results_hash = FileUtils.hash_file(results_file)
+        if not force:
+            cached = self.cached_code_report(results_file, report_file, results_hash)
+            if cached:
+                logger.info(f"Code report {report_file} is current for {results_file}, skipping regeneration")
+                return dict(cached, cached=True)
+        
+        with open(results_file, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        stats = self.write_affected_code_report(iter_result_vulnerabilities(results), report_file, progress_callback)
+        meta = dict(
+            stats,
+            version=ZAPConfig.CODE_REPORT_VERSION,
+            results_hash=results_hash,
+            results_file=str(results_file),
+            generated_at=datetime.now().isoformat()
+        )
+        try:
+            with open(self._code_report_meta_path(Path(report_file)), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write code report cache metadata: {str(e)}")
+        return dict(meta, cached=False)
 
     @log_operation("Affected code report generation")
     def generate_affected_code_report(self, vulnerabilities: List[ZapVulnerability], output_file: str = None) -> str:
         """Generate a Markdown report of affected code from vulnerability findings."""
-        # Group vulnerabilities by risk level
-        vuln_by_risk = {"High": [], "Medium": [], "Low": [], "Informational": []}
-        for vuln in vulnerabilities:
-            risk = vuln.risk
-            if risk == "Info": 
-                risk = "Informational"
-            if risk in vuln_by_risk: 
-                vuln_by_risk[risk].append(vuln)
-                
-        # Create report
-        report = ["# Security Vulnerability Report with Affected Code\n"]
-        report.append("## Summary\n")
-        for risk, vulns in vuln_by_risk.items():
-            if vulns: 
-                report.append(f"- **{risk}**: {len(vulns)} vulnerabilities\n")
-                
-        # Add findings by risk level
-        for risk in ["High", "Medium", "Low", "Informational"]:
-            vulns = vuln_by_risk[risk]
-            if not vulns: 
-                continue
-                
-            report.append(f"\n## {risk} Risk Vulnerabilities\n")
-            for i, vuln in enumerate(vulns, 1):
-                report.append(f"### {i}. {vuln.name}\n")
-                report.append(f"- **URL**: {vuln.url}\n")
-                if vuln.parameter: 
-                    report.append(f"- **Parameter**: {vuln.parameter}\n")
-                report.append(f"- **Confidence**: {vuln.confidence}\n")
-                report.append(f"- **Description**: {vuln.description}\n")
-                report.append(f"- **Solution**: {vuln.solution}\n")
-                if vuln.cwe_id: 
-                    report.append(f"- **CWE ID**: {vuln.cwe_id}\n")
-                    
-                # Include affected code if available
-                if vuln.affected_code and vuln.affected_code.snippet:
-                    code = vuln.affected_code
-                    report.append("\n#### Affected Code\n")
-                    if code.file_path: 
-                        report.append(f"**File**: {code.file_path}\n")
-                    if code.line_number: 
-                        report.append(f"**Line**: {code.line_number}\n")
-                    report.append("\n```\n")
-                    
-                    # Format code with line numbers if available
-                    if code.start_line > 0:
-                        lines = code.snippet.split('\n')
-                        numbered_lines = []
-                        for i_line, line_content in enumerate(lines, code.start_line):
-                            line_num_str = f"{i_line:4d} | "
-                            if i_line in code.vulnerable_lines: 
-                                numbered_lines.append(f"{line_num_str}{line_content}  <-- VULNERABILITY")
-                            else: 
-                                numbered_lines.append(f"{line_num_str}{line_content}")
-                        report.append('\n'.join(numbered_lines))
-                    else: 
-                        report.append(code.snippet)
-                    report.append("\n```\n")
-                # Include evidence if no code context is available
-                elif vuln.evidence and (not vuln.affected_code or not vuln.affected_code.snippet):
-                    report.append("\n#### Evidence\n")
-                    report.append("\n```\n")
-                    report.append(vuln.evidence)
-                    report.append("\n```\n")
-                    
-                report.append("\n---\n")
-                
-        report_content = '\n'.join(report)
+        report_content = ''.join(self._iter_report_chunks(self._group_report_findings(vulnerabilities)))
         
         # Save report to file if requested
         if output_file:
@@ -1589,18 +2750,53 @@ class ZAPScanner:
         else:
             logger.warning(f"Source code root directory not found: {root_dir}")
 
+    def _record_profile_run(self, model: str, app_num: int, summary: Dict[str, Any]):
+        """Append this run's cost and yield to the shared per-profile statistics file."""
+        duration = summary.get("duration_seconds") or 0
+        total_alerts = summary.get("total_alerts", 0)
+        risk_counts = summary.get("risk_counts", {})
+        record = {
+            "profile": summary.get("profile"),
+            "model": model,
+            "app_num": app_num,
+            "status": summary.get("status"),
+            "timestamp": summary.get("end_time") or datetime.now().isoformat(),
+            "duration_seconds": duration,
+            "total_alerts": total_alerts,
+            "high_medium_alerts": risk_counts.get("High", 0) + risk_counts.get("Medium", 0),
+            "unique_alert_types": summary.get("unique_alert_types", 0),
+            "alerts_per_minute": round(total_alerts / (duration / 60), 2) if duration else 0.0,
+            "phase_timings": summary.get("phase_timings", {}),
+        }
+        stats_path = _profile_stats_path(self.base_path)
+        try:
+            with _profile_stats_lock:
+                runs = _load_profile_runs(stats_path)
+                runs.append(record)
+                runs = runs[-ZAPConfig.PROFILE_STATS_MAX_RUNS:]
+                stats_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(stats_path, "w", encoding="utf-8") as f:
+                    json.dump(runs, f, indent=2)
+        except Exception as e:
+            logger.warning(f"Could not record profile statistics: {str(e)}")
+
     @log_operation("ZAP Scan")
-    def start_scan(self, model: str, app_num: int, quick_scan: bool = False) -> bool:
-        """Start a ZAP scan for a specific app."""
+    def start_scan(self, model: str, app_num: int, quick_scan: bool = False, incremental: bool = False,
+                   profile: Optional[str] = None) -> bool:
+        """Start a ZAP scan for a specific app, optionally reusing the previous scan's discovery."""
         scan_key = f"{model}-{app_num}"
         scan_status = ScanStatus(start_time=datetime.now().isoformat())
         scan_status.status = "Starting"
+        scan_profile = get_scan_profile(profile, quick_scan)
         
         # Calculate target URL
-        target_url = self._calculate_app_url(model, app_num)
+        if scan_profile.target == "backend":
+            target_url = self._calculate_backend_url(model, app_num)
+        else:
+            target_url = self._calculate_app_url(model, app_num)
         
-        # Set source code root directory
-        app_path = self.base_path / f"{model}/app{app_num}"
+        # Set source code root directory (callers normally set it from the models directory)
+        app_path = Path(self.source_root_dir) if self.source_root_dir else self.base_path / f"{model}/app{app_num}"
         if app_path.exists() and app_path.is_dir():
             self.set_source_code_root(str(app_path))
             
@@ -1609,29 +2805,53 @@ class ZAPScanner:
             "status": scan_status, 
             "target_url": target_url, 
             "start_time": datetime.now().isoformat(), 
-            "quick_scan": quick_scan
+            "quick_scan": quick_scan, 
+            "profile": scan_profile.name
         }
         
-        scan_type = 'quick' if quick_scan else 'comprehensive'
-        logger.info(f"Starting {scan_type} scan {scan_key} for {target_url}")
+        logger.info(f"Starting '{scan_profile.name}' scan {scan_key} for {target_url}")
         
         # Save original AJAX timeout to restore later
         original_ajax_timeout = self.ajax_timeout
         
         try:
-            # Adjust timeout for quick scan
-            if quick_scan:
-                self.ajax_timeout = min(60, self.ajax_timeout)
-                logger.info(f"Quick scan enabled - AJAX timeout reduced to {self.ajax_timeout} seconds")
+            # Adjust timeout for the profile
+            if scan_profile.ajax_timeout:
+                self.ajax_timeout = min(scan_profile.ajax_timeout, self.ajax_timeout)
+                logger.info(f"Profile '{scan_profile.name}' - AJAX timeout reduced to {self.ajax_timeout} seconds")
                 
             # Update scan status
             scan_status.status = "Running"
             
+            # Snapshot the app source so the next incremental scan can detect changes
+            discovery = None
+            previous = None
+            if app_path.is_dir():
+                source_hash, file_hashes = FileUtils.hash_source_tree(app_path)
+                session_dir = self.results_manager.base_path / "results" / model / f"app{app_num}" / ZAPConfig.SESSION_DIR
+                if scan_profile.target != "frontend":
+                    session_dir = session_dir.with_name(f"{ZAPConfig.SESSION_DIR}_{scan_profile.target}")
+                discovery = DiscoveryState(
+                    source_hash=source_hash,
+                    file_hashes=file_hashes,
+                    session_path=str(session_dir / "session"),
+                    active_scanned=scan_profile.active_scan
+                )
+                if incremental:
+                    previous = self._load_discovery_state(model, app_num, scan_profile.target)
+                    if previous is None:
+                        logger.info(f"No previous discovery for {scan_key}; running a full scan")
+                
             # Run the scan
-            vulnerabilities, summary = self.scan_target(target_url, quick_scan)
+            vulnerabilities, summary = self.scan_target(
+                target_url, quick_scan, discovery=discovery, previous=previous, profile=scan_profile
+            )
             
             # Save results using JsonResultsManager
-            self.save_scan_results(model, app_num, vulnerabilities, summary)
+            self.save_scan_results(model, app_num, vulnerabilities, summary, scan_profile.target)
+            self._record_profile_run(model, app_num, summary)
+            if discovery is not None and summary.get("status") == "success":
+                self._save_discovery_state(model, app_num, discovery, scan_profile.target)
             
             # Update scan status
             scan_status.status = "Complete"
@@ -1673,6 +2893,11 @@ class ZAPScanner:
                     logger.info(f"Stopping specific scan for {scan_key}")
                     scan_info["status"].status = "Stopped"
                     scan_info["status"].end_time = datetime.now().isoformat()
+            if self._daemon_lease:
+                # The pooled daemon is reset and reused once scan_target releases it
+                self._halt_active_scans()
+                logger.info("Stopped scans on pooled ZAP daemon")
+                return True
             self._cleanup_existing_zap()
             logger.info("ZAP resources cleaned up")
             return True
@@ -1681,6 +2906,296 @@ class ZAPScanner:
             return False
 
 
+_profile_stats_lock = threading.Lock()
+
+
+def _profile_stats_path(base_path: Path) -> Path:
+    base_path = Path(base_path)
+    if "z_interface_app" in str(base_path):
+        base_path = base_path.parent
+    return base_path / "results" / ZAPConfig.PROFILE_STATS_FILE
+
+
+def _load_profile_runs(stats_path: Path) -> List[Dict[str, Any]]:
+    if not stats_path.exists():
+        return []
+    try:
+        with open(stats_path, "r", encoding="utf-8") as f:
+            runs = json.load(f)
+        return runs if isinstance(runs, list) else []
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not read profile statistics {stats_path}: {str(e)}")
+        return []
+
+
+def get_profile_statistics(base_path: Path) -> Dict[str, Any]:
+    """
+    Summarise recorded runs per scan profile.
+
+    Returns each profile's settings with run count, mean wall-clock time,
+    mean alert yield and alerts per minute of scanning.
+    """
+    with _profile_stats_lock:
+        runs = _load_profile_runs(_profile_stats_path(base_path))
+    profiles = {}
+    for name, profile in SCAN_PROFILES.items():
+        profile_runs = [r for r in runs if r.get("profile") == name and r.get("status") == "success"]
+        total_seconds = sum(r.get("duration_seconds", 0) for r in profile_runs)
+        total_alerts = sum(r.get("total_alerts", 0) for r in profile_runs)
+        count = len(profile_runs)
+        profiles[name] = {
+            "settings": profile.to_dict(),
+            "runs": count,
+            "avg_duration_seconds": round(total_seconds / count, 1) if count else None,
+            "avg_alerts": round(total_alerts / count, 1) if count else None,
+            "avg_high_medium_alerts": round(sum(r.get("high_medium_alerts", 0) for r in profile_runs) / count, 1) if count else None,
+            "avg_unique_alert_types": round(sum(r.get("unique_alert_types", 0) for r in profile_runs) / count, 1) if count else None,
+            "alerts_per_minute": round(total_alerts / (total_seconds / 60), 2) if total_seconds else None,
+        }
+    return {"profiles": profiles, "total_runs": len(runs)}
+
+
+class ZAPDaemonPool:
+    """
+    Pool of long-lived ZAP daemons handed to scans through leases.
+
+    Daemons are started lazily on ports from ZAPConfig.DEFAULT_PORT_RANGE, each with
+    its own home directory, and reset with core.new_session between scans.
+    """
+
+    def __init__(self, base_path: Path, size: int = ZAPConfig.DEFAULT_POOL_SIZE,
+                 heap_size: str = ZAPConfig.POOL_HEAP_SIZE,
+                 recycle_after: int = ZAPConfig.POOL_RECYCLE_AFTER_SCANS):
+        self.base_path = Path(base_path)
+        max_size = ZAPConfig.DEFAULT_PORT_RANGE[1] - ZAPConfig.DEFAULT_PORT_RANGE[0] + 1
+        self.size = max(1, min(size, max_size))
+        self.heap_size = heap_size
+        self.recycle_after = recycle_after
+        self._daemons: List[ZAPDaemon] = []
+        self._launching = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._launch_lock = threading.Lock()
+        logger.info(f"ZAP daemon pool created (size={self.size}, heap={self.heap_size})")
+
+    @property
+    def has_daemons(self) -> bool:
+        with self._condition:
+            return bool(self._daemons) or self._launching > 0
+
+    def _launch_daemon(self) -> ZAPDaemon:
+        """Start a new daemon on the next free port in the pool range."""
+        # Launches are serialized so port and callback-port discovery cannot race
+        with self._launch_lock:
+            port = NetworkUtils.find_free_port(*ZAPConfig.DEFAULT_PORT_RANGE)
+            launcher = ZAPScanner(self.base_path, proxy_port=port)
+            launcher.heap_size = self.heap_size
+            launcher.zap_home_dir = FileUtils.ensure_directory(self.base_path / "zap_home" / f"pool_{port}")
+            launcher._start_zap_daemon(kill_strays=False)
+            daemon = ZAPDaemon(
+                port=port,
+                zap=launcher.zap,
+                process=launcher.daemon_process,
+                log_path=launcher.zap_log,
+                home_dir=launcher.zap_home_dir,
+                firefox_binary_path=launcher.firefox_binary_path,
+                oast_configured=launcher.oast_service_configured
+            )
+        daemon.default_options = self._snapshot_options(daemon.zap)
+        logger.info(f"Pooled ZAP daemon ready on port {port}")
+        return daemon
+
+    # (getter, setter) names of spider options that scans change and new_session keeps
+    RESETTABLE_OPTIONS = {
+        "ajax_number_of_browsers": ("ajaxSpider", "option_number_of_browsers", "set_option_number_of_browsers"),
+        "ajax_max_crawl_depth": ("ajaxSpider", "option_max_crawl_depth", "set_option_max_crawl_depth"),
+        "ajax_browser_id": ("ajaxSpider", "option_browser_id", "set_option_browser_id"),
+        "spider_max_depth": ("spider", "option_max_depth", "set_option_max_depth"),
+        "spider_max_children": ("spider", "option_max_children", "set_option_max_children"),
+    }
+
+    def _snapshot_options(self, zap: ZAPv2) -> Dict[str, str]:
+        """Record a fresh daemon's spider options so later leases can be put back to them."""
+        options = {}
+        for key, (component, getter, _) in self.RESETTABLE_OPTIONS.items():
+            try:
+                options[key] = getattr(getattr(zap, component), getter)
+            except Exception as e:
+                logger.debug(f"Could not read ZAP option {key}: {str(e)}")
+        return options
+
+    def _restore_options(self, daemon: ZAPDaemon):
+        """
+        Undo per-scan configuration that survives core.new_session: spider and AJAX
+        spider options, and active scan policies narrowed or re-weighted by a profile.
+        """
+        zap = daemon.zap
+        for key, value in daemon.default_options.items():
+            component, _, setter = self.RESETTABLE_OPTIONS[key]
+            try:
+                getattr(getattr(zap, component), setter)(value)
+            except Exception as e:
+                logger.debug(f"Could not restore ZAP option {key} on port {daemon.port}: {str(e)}")
+        try:
+            zap.ascan.enable_all_scanners()
+            for policy_id in range(0, 5):
+                zap.ascan.set_policy_attack_strength(id=policy_id, attackstrength="DEFAULT")
+                zap.ascan.set_policy_alert_threshold(id=policy_id, alertthreshold="DEFAULT")
+        except Exception as e:
+            logger.debug(f"Could not reset active scan policies on port {daemon.port}: {str(e)}")
+
+    def _is_healthy(self, daemon: ZAPDaemon) -> bool:
+        if daemon.process and daemon.process.poll() is not None:
+            return False
+        try:
+            return bool(daemon.zap.core.version)
+        except Exception as e:
+            logger.warning(f"Pooled ZAP daemon on port {daemon.port} is unresponsive: {str(e)}")
+            return False
+
+    def _reset_daemon(self, daemon: ZAPDaemon):
+        """Discard all scan state so the next lease starts from a clean session."""
+        zap = daemon.zap
+        for action in (zap.ajaxSpider.stop, zap.spider.stop_all_scans, zap.ascan.stop_all_scans,
+                       zap.spider.remove_all_scans, zap.ascan.remove_all_scans):
+            try:
+                action()
+            except Exception as e:
+                logger.debug(f"Error during daemon reset on port {daemon.port}: {str(e)}")
+        zap.core.new_session(overwrite=True)
+        self._restore_options(daemon)
+        logger.debug(f"Reset session and options on pooled ZAP daemon {daemon.port}")
+
+    def _terminate_daemon(self, daemon: ZAPDaemon):
+        try:
+            daemon.zap.core.shutdown()
+        except Exception as e:
+            logger.debug(f"API shutdown of ZAP daemon {daemon.port} failed: {str(e)}")
+        if daemon.process and daemon.process.poll() is None:
+            try:
+                daemon.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                daemon.process.kill()
+                daemon.process.wait()
+        logger.info(f"Terminated pooled ZAP daemon on port {daemon.port}")
+
+    def _discard(self, daemon: ZAPDaemon):
+        self._terminate_daemon(daemon)
+        with self._condition:
+            if daemon in self._daemons:
+                self._daemons.remove(daemon)
+            self._condition.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> ZAPDaemon:
+        """
+        Lease a daemon, starting one if the pool is below capacity.
+
+        Args:
+            timeout: Seconds to wait for a free daemon (default POOL_LEASE_TIMEOUT)
+
+        Returns:
+            A leased ZAPDaemon; callers must hand it back with release()
+        """
+        wait_budget = ZAPConfig.POOL_LEASE_TIMEOUT if timeout is None else timeout
+        deadline = time.time() + wait_budget
+        while True:
+            daemon = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("ZAP daemon pool has been shut down")
+                    daemon = next((d for d in self._daemons if not d.leased), None)
+                    if daemon:
+                        daemon.leased = True
+                        break
+                    if len(self._daemons) + self._launching < self.size:
+                        self._launching += 1
+                        break
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No ZAP daemon became available within {wait_budget}s")
+                    self._condition.wait(remaining)
+
+            if daemon is None:
+                try:
+                    daemon = self._launch_daemon()
+                finally:
+                    with self._condition:
+                        self._launching -= 1
+                        self._condition.notify_all()
+                with self._condition:
+                    daemon.leased = True
+                    self._daemons.append(daemon)
+                return daemon
+
+            if self._is_healthy(daemon):
+                logger.info(f"Leased pooled ZAP daemon on port {daemon.port}")
+                return daemon
+            self._discard(daemon)
+
+    def release(self, daemon: ZAPDaemon):
+        """Return a leased daemon, resetting its session or recycling it if worn out."""
+        daemon.scans_served += 1
+        recycle = daemon.scans_served >= self.recycle_after
+        if not recycle:
+            try:
+                self._reset_daemon(daemon)
+            except Exception as e:
+                logger.warning(f"Failed to reset ZAP daemon {daemon.port}, recycling it: {str(e)}")
+                recycle = True
+        if recycle or self._closed:
+            self._discard(daemon)
+            return
+        with self._condition:
+            daemon.leased = False
+            self._condition.notify_all()
+        logger.info(f"Released pooled ZAP daemon on port {daemon.port}")
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager wrapper around acquire()/release()."""
+        daemon = self.acquire(timeout)
+        try:
+            yield daemon
+        finally:
+            self.release(daemon)
+
+    def status(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "size": self.size,
+                "launching": self._launching,
+                "daemons": [d.to_dict() for d in self._daemons],
+            }
+
+    def shutdown(self):
+        """Terminate every daemon; leased daemons are terminated when released."""
+        with self._condition:
+            self._closed = True
+            idle = [d for d in self._daemons if not d.leased]
+        for daemon in idle:
+            self._discard(daemon)
+
+
+_daemon_pool: Optional[ZAPDaemonPool] = None
+_daemon_pool_lock = threading.Lock()
+
+
+def get_daemon_pool(base_path: Path) -> ZAPDaemonPool:
+    """Return the process-wide ZAP daemon pool, creating it on first use."""
+    global _daemon_pool
+    with _daemon_pool_lock:
+        if _daemon_pool is None:
+            _daemon_pool = ZAPDaemonPool(base_path)
+            atexit.register(_daemon_pool.shutdown)
+        return _daemon_pool
+
+
+def _pool_has_daemons() -> bool:
+    pool = _daemon_pool
+    return pool is not None and pool.has_daemons
+
+
 def create_scanner(base_path: Path) -> ZAPScanner:
     """Factory function to create and initialize a ZAP scanner."""
     logger.info("Creating comprehensive ZAP scanner instance...")
@@ -1696,6 +3211,8 @@ def create_scanner(base_path: Path) -> ZAPScanner:
     
     # Create the scanner
     scanner = ZAPScanner(base_path)
+    if ZAPConfig.USE_DAEMON_POOL:
+        scanner.daemon_pool = get_daemon_pool(scanner.base_path)
     logger.info(f"Comprehensive ZAP scanner created with base path: {base_path}")
     return scanner
 